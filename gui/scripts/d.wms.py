@@ -106,6 +106,21 @@
 #% guisection: Request
 #%end
 
+#%option
+#% key: maxconn
+#% type: integer
+#% description: Maximum number of concurrent connections to the server
+#% answer: 2
+#% guisection: Request
+#%end
+
+#%option G_OPT_M_DIR
+#% key: cache
+#% required: no
+#% description: Directory where the downloaded tiles are cached
+#% guisection: Request
+#%end
+
 #%option
 #% key: urlparams
 #% type:string
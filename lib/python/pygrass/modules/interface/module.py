@@ -2,12 +2,16 @@
 from __future__ import (nested_scopes, generators, division, absolute_import,
                         with_statement, print_function, unicode_literals)
 import sys
+from copy import deepcopy
 from multiprocessing import cpu_count, Process, Queue
+from threading import Thread
 import time
 from xml.etree.ElementTree import fromstring
 
-from grass.exceptions import CalledModuleError, GrassError, ParameterError
+from grass.exceptions import (CalledModuleError, GrassError, ParameterError,
+                              ScriptError)
 from grass.script.core import Popen, PIPE, use_temp_region, del_temp_region
+from grass.script.task import get_interface_description, interface_cache_key
 from grass.script.utils import encode, decode
 from .docstring import docstring_property
 from .parameter import Parameter
@@ -18,8 +22,10 @@ from .env import G_debug
 
 if sys.version_info[0] == 2:
     from itertools import izip_longest as zip_longest
+    from Queue import Queue as ThreadQueue
 else:
     from itertools import zip_longest
+    from queue import Queue as ThreadQueue
     unicode = str
 
 
@@ -27,6 +33,76 @@ def _get_bash(self, *args, **kargs):
     return self.get_bash()
 
 
+# Parsed interfaces of the modules, used as templates by the Module class
+_INTERFACE_TEMPLATES = {}
+
+
+def _parse_interface(name):
+    """Return a dictionary with the attributes of a Module object parsed
+    from the XML interface description of the GRASS module"""
+    try:
+        xml = get_interface_description(name)
+    except ScriptError as e:
+        raise GrassError(e.value)
+    # transform and parse the xml into an Element class:
+    # http://docs.python.org/library/xml.etree.elementtree.html
+    tree = fromstring(xml)
+
+    interface = dict(xml=xml)
+    for e in tree:
+        if e.tag not in ('parameter', 'flag'):
+            interface[e.tag] = GETFROMTAG[e.tag](e)
+
+    #
+    # extract parameters from the xml
+    #
+    params_list = [Parameter(p) for p in tree.findall("parameter")]
+    inputs = TypeDict(Parameter)
+    outputs = TypeDict(Parameter)
+    required = []
+
+    # Insert parameters into input/output and required
+    for par in params_list:
+        if par.input:
+            inputs[par.name] = par
+        else:
+            outputs[par.name] = par
+        if par.required:
+            required.append(par.name)
+
+    #
+    # extract flags from the xml
+    #
+    flags = TypeDict(Flag)
+    for flag in tree.findall("flag"):
+        flag = Flag(flag)
+        flags[flag.name] = flag
+
+    interface.update(params_list=params_list, inputs=inputs,
+                     outputs=outputs, required=required, flags=flags)
+    return interface
+
+
+def get_interface(name):
+    """Return a new copy of the parsed interface of a GRASS module.
+
+    The interface is parsed once per process and module version and
+    then cloned, the XML description is cached by
+    grass.script.task.get_interface_description.
+
+    :param str name: the name of the GRASS module
+    """
+    key = interface_cache_key(name)
+    interface = _INTERFACE_TEMPLATES.get(key) if key else None
+    if interface is None:
+        interface = _parse_interface(name)
+        if key:
+            _INTERFACE_TEMPLATES[key] = interface
+    # copy everything at once to keep the parameters shared between
+    # params_list and inputs/outputs
+    return deepcopy(interface)
+
+
 class ParallelModuleQueue(object):
     """This class is designed to run an arbitrary number of pygrass Module or MultiModule
     processes in parallel.
@@ -48,6 +124,14 @@ class ParallelModuleQueue(object):
     will not raise a GrassError in case of failure. This must be manually checked
     by accessing finished modules by calling get_finished_modules().
 
+    If the queue is created with pool=True it works as a pool of workers:
+    put() returns as soon as a slot is free and every finished process is
+    replaced by the next one, so a single slow process does not stall the
+    other slots. With fail_fast=False the errors of the processes are
+    collected and can be accessed with get_errors() instead of being
+    raised. A callback can be set to report the progress, the wall time
+    of each process is available with get_run_times().
+
     Usage:
 
     Check with a queue size of 3 and 5 processes
@@ -212,20 +296,63 @@ class ParallelModuleQueue(object):
     0
     0
 
+    Check the pool mode with a queue size of 3 and 4 processes
+
+    >>> def progress(module, num_finished, num_put):
+    ...     pass
+    >>> queue = ParallelModuleQueue(nprocs=3, pool=True, callback=progress)
+    >>> for i in range(4):
+    ...     new_mapcalc = copy.deepcopy(mapcalc)
+    ...     m = new_mapcalc(expression="test_pygrass_%i = %i"%(i, i))
+    ...     queue.put(m)
+    >>> queue.get_num_run_procs() <= 3
+    True
+    >>> queue.wait()
+    >>> queue.get_num_run_procs()
+    0
+    >>> len(queue.get_finished_modules())
+    4
+    >>> len(queue.get_run_times())
+    4
+    >>> queue.get_errors()
+    []
+
     """
-    def __init__(self, nprocs=1):
+    def __init__(self, nprocs=1, pool=False, fail_fast=True, callback=None):
         """Constructor
 
         :param nprocs: The maximum number of Module processes that
                        can be run in parallel, default is 1, if None
                        then use all the available CPUs.
         :type nprocs: int
+        :param pool: If True a finished process is replaced immediately by
+                     the next one, otherwise the queue waits until all the
+                     processes of the batch are finished
+        :type pool: bool
+        :param fail_fast: If True the error of a failed process is raised,
+                          otherwise it is stored and the remaining
+                          processes are run
+        :type fail_fast: bool
+        :param callback: A function called with the finished Module or
+                         MultiModule object, the number of finished and the
+                         number of processes put in the queue
+        :type callback: function
         """
         nprocs = int(nprocs) if nprocs else cpu_count()
         self._num_procs = nprocs
         self._list = nprocs * [None]
         self._proc_count = 0
         self._finished_modules = []  # Store all processed modules in a list
+        self._pool = pool
+        self._fail_fast = fail_fast
+        self._callback = callback
+        self._errors = []
+        self._run_times = []
+        self._start_times = {}
+        self._num_put = 0
+        self._num_finished = 0
+        # Finished processes of the pool mode, filled by the waiting threads
+        self._done = ThreadQueue()
 
     def put(self, module):
         """Put the next Module or MultiModule object in the queue
@@ -237,16 +364,69 @@ class ParallelModuleQueue(object):
                        with run\_ and finish\_ set to False,
         :type module: Module or MultiModule object
         """
-        self._list[self._proc_count] = module
+        if self._pool:
+            # wait until a slot is free
+            while self._proc_count == self._num_procs:
+                self._collect()
+            slot = self._list.index(None)
+        else:
+            slot = self._proc_count
+        self._list[slot] = module
         # Force that finish is False, otherwise the execution
         # will not be parallel
-        self._list[self._proc_count].finish_ = False
-        self._list[self._proc_count].run()
+        self._list[slot].finish_ = False
+        self._start_times[id(module)] = time.time()
+        self._list[slot].run()
         self._proc_count += 1
+        self._num_put += 1
 
-        if self._proc_count == self._num_procs:
+        if self._pool:
+            thread = Thread(target=self._wait_process, args=(slot, module))
+            thread.daemon = True
+            thread.start()
+        elif self._proc_count == self._num_procs:
             self.wait()
 
+    def _wait_process(self, slot, module):
+        """Wait for a process in a thread and notify the queue, used by the
+        pool mode, the end time is taken here and not when the process
+        is collected"""
+        try:
+            finished, error = self._wait_module(module), None
+        except Exception as exc:
+            finished, error = [module, ], exc
+        self._done.put((slot, module, finished, error, time.time()))
+
+    @staticmethod
+    def _wait_module(module):
+        """Wait for a Module or MultiModule and return the finished modules"""
+        if isinstance(module, Module):
+            return [module.wait(), ]
+        return module.wait() or []
+
+    def _collect(self):
+        """Wait for the next process of the pool to finish and release its
+        slot"""
+        slot, module, finished, error, end = self._done.get()
+        self._list[slot] = None
+        self._proc_count -= 1
+        self._finish(module, finished, error, end)
+
+    def _finish(self, module, finished, error, end):
+        """Store the finished modules, the run time and the error of a
+        process that finished at the time end"""
+        self._finished_modules.extend(finished)
+        start = self._start_times.pop(id(module), None)
+        if start is not None:
+            self._run_times.append((module, end - start))
+        self._num_finished += 1
+        if error is not None:
+            self._errors.append((module, error))
+        if self._callback:
+            self._callback(module, self._num_finished, self._num_put)
+        if error is not None and self._fail_fast:
+            raise error
+
     def get(self, num):
         """Get a Module object or list of Module objects from the queue
 
@@ -291,21 +471,42 @@ class ParallelModuleQueue(object):
         """
         return self._finished_modules
 
+    def get_errors(self):
+        """Return the errors of the processes that failed, errors are only
+        collected if the queue was created with fail_fast=False
+
+        :return: A list of (Module or MultiModule object, exception) tuples
+        """
+        return self._errors
+
+    def get_run_times(self):
+        """Return the wall time of the finished processes, in the batch
+        mode the time is measured when the batch is collected
+
+        :return: A list of (Module or MultiModule object, seconds) tuples
+        """
+        return self._run_times
+
     def wait(self):
         """Wait for all Module processes that are in the list to finish
         and set the modules stdout and stderr output options
 
         :return: A list of modules that were run
         """
-        for proc in self._list:
-            if proc:
-                if isinstance(proc, Module):
-                    self._finished_modules.extend([proc.wait(),])
-                else:
-                    self._finished_modules.extend(proc.wait())
+        if self._pool:
+            while self._proc_count > 0:
+                self._collect()
+            return
 
+        procs = [proc for proc in self._list if proc]
         self._list = self._num_procs * [None]
         self._proc_count = 0
+        for proc in procs:
+            try:
+                finished, error = self._wait_module(proc), None
+            except CalledModuleError as exc:
+                finished, error = [proc, ], exc
+            self._finish(proc, finished, error, time.time())
 
 
 
@@ -522,47 +723,10 @@ class Module(object):
             self.name = cmd
         else:
             raise GrassError("Problem initializing the module {s}".format(s=cmd))
-        try:
-            # call the command with --interface-description
-            get_cmd_xml = Popen([cmd, "--interface-description"], stdout=PIPE)
-        except OSError as e:
-            print("OSError error({0}): {1}".format(e.errno, e.strerror))
-            str_err = "Error running: `%s --interface-description`."
-            raise GrassError(str_err % self.name)
-        # get the xml of the module
-        self.xml = get_cmd_xml.communicate()[0]
-        # transform and parse the xml into an Element class:
-        # http://docs.python.org/library/xml.etree.elementtree.html
-        tree = fromstring(self.xml)
-
-        for e in tree:
-            if e.tag not in ('parameter', 'flag'):
-                self.__setattr__(e.tag, GETFROMTAG[e.tag](e))
-
-        #
-        # extract parameters from the xml
-        #
-        self.params_list = [Parameter(p) for p in tree.findall("parameter")]
-        self.inputs = TypeDict(Parameter)
-        self.outputs = TypeDict(Parameter)
-        self.required = []
-
-        # Insert parameters into input/output and required
-        for par in self.params_list:
-            if par.input:
-                self.inputs[par.name] = par
-            else:
-                self.outputs[par.name] = par
-            if par.required:
-                self.required.append(par.name)
-
-        #
-        # extract flags from the xml
-        #
-        flags_list = [Flag(f) for f in tree.findall("flag")]
-        self.flags = TypeDict(Flag)
-        for flag in flags_list:
-            self.flags[flag.name] = flag
+        # set xml, params_list, inputs, outputs, required, flags and the
+        # module description attributes from the cached interface
+        for key, value in get_interface(self.name).items():
+            self.__setattr__(key, value)
 
         #
         # Add new attributes to the class
@@ -79,5 +79,18 @@ class TestModulesCheck(TestCase):
         self.assertIsNone(gextension.check())
 
 
+class TestModulesInterfaceCache(TestCase):
+    def test_independent_instances(self):
+        """Test if Module instances created from the cache are independent"""
+        first = Module('r.neighbors')
+        first.inputs.input = 'mapA'
+        first.flags.c = True
+        second = Module('r.neighbors')
+        self.assertIsNone(second.inputs.input)
+        self.assertFalse(second.flags.c)
+        self.assertIs(second.params_list[0], second.inputs['input'])
+        self.assertEqual(first.xml, second.xml)
+
+
 if __name__ == '__main__':
     test()
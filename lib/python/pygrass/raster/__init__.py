@@ -137,6 +137,7 @@ class RasterRow(RasterAbstractBase):
     """
     def __init__(self, name, mapset='', *args, **kargs):
         super(RasterRow, self).__init__(name, mapset, *args, **kargs)
+        self._next_row = 0
 
     # mode = "r", method = "row",
     @must_be_open
@@ -170,6 +171,46 @@ class RasterRow(RasterAbstractBase):
         :type row: Buffer object
         """
         libraster.Rast_put_row(self._fd, row.p, self._gtype)
+        self._next_row += 1
+
+    @must_be_open
+    def write_window(self, array, row_off=None, col_off=0):
+        """Write a 2D numpy array to the map, rows are written sequentially
+        so the window must span all the columns and start at the next row
+        to be written, use RasterSegment for random window access.
+
+        :param array: the values to be written with shape (nrows, cols)
+        :type array: numpy.ndarray
+        :param int row_off: the first row of the window, default is the
+                            next row to be written
+        :param int col_off: the first column of the window, must be 0
+
+        >>> elev = RasterRow(test_raster_name + "_window")
+        >>> elev.open('w', mtype='CELL', overwrite=True)
+        >>> elev.write_window(np.arange(8).reshape(2, 4))
+        >>> elev.write_window(np.arange(8, 16).reshape(2, 4), row_off=2)
+        >>> elev.close()
+        >>> elev.open('r')
+        >>> elev.read_window(0, 0, 4, 4)
+        array([[ 0,  1,  2,  3],
+               [ 4,  5,  6,  7],
+               [ 8,  9, 10, 11],
+               [12, 13, 14, 15]], dtype=int32)
+        >>> elev.close()
+
+        """
+        if row_off is None:
+            row_off = self._next_row
+        nrows, ncols = array.shape
+        self._check_window(row_off, col_off, nrows, ncols)
+        if col_off != 0 or ncols != self._cols or row_off != self._next_row:
+            str_err = _("RasterRow can only write full rows sequentially, "
+                        "the next row to be written is {0}")
+            raise IndexError(str_err.format(self._next_row))
+        row_buffer = Buffer((self._cols,), self.mtype)
+        for row in array:
+            row_buffer[:] = row
+            self.put_row(row_buffer)
 
     def open(self, mode=None, mtype=None, overwrite=None):
         """Open the raster if exist or created a new one.
@@ -223,6 +264,8 @@ class RasterRow(RasterAbstractBase):
         # read rows and cols from the active region
         self._rows = libraster.Rast_window_rows()
         self._cols = libraster.Rast_window_cols()
+        # the next row to be written sequentially in 'w' mode
+        self._next_row = 0
 
 
 class RasterRowIO(RasterRow):
@@ -427,6 +470,43 @@ class RasterSegment(RasterAbstractBase):
         """
         self.segment.put_row(row, row_buffer)
 
+    @must_be_open
+    def write_window(self, array, row_off, col_off):
+        """Write a 2D numpy array in a window of the map, the values
+        outside the window are preserved.
+
+        :param array: the values to be written with shape (nrows, ncols)
+        :type array: numpy.ndarray
+        :param int row_off: the first row of the window
+        :param int col_off: the first column of the window
+
+            >>> map_a = RasterSegment(test_raster_name)
+            >>> map_b = RasterSegment(test_raster_name + "_segment")
+            >>> map_a.open('r')
+            >>> map_b.open('w', mtype="CELL", overwrite=True)
+            >>> map_b.write_window(map_a.read_window(0, 0, 4, 4), 0, 0)
+            >>> map_b.write_window(np.zeros((2, 2)), 1, 1)
+            >>> map_a.close()
+            >>> map_b.close()
+
+            >>> map_b = RasterSegment(test_raster_name + "_segment")
+            >>> map_b.open("r")
+            >>> map_b.read_window(0, 0, 4, 4)
+            array([[11, 21, 31, 41],
+                   [12,  0,  0, 42],
+                   [13,  0,  0, 43],
+                   [14, 24, 34, 44]], dtype=int32)
+            >>> map_b.close()
+
+        """
+        nrows, ncols = array.shape
+        self._check_window(row_off, col_off, nrows, ncols)
+        row_buffer = Buffer((self._cols,), self.mtype)
+        for irow in range(nrows):
+            self.get_row(row_off + irow, row_buffer)
+            row_buffer[col_off:col_off + ncols] = array[irow]
+            self.put_row(row_off + irow, row_buffer)
+
     @must_be_open
     def get(self, row, col):
         """Return the map value using the `segment.get` method
@@ -617,7 +697,7 @@ def raster2numpy(rastname, mapset=''):
     :parar str mapset: the name of mapset containig raster map
     """
     with RasterRow(rastname, mapset=mapset, mode='r') as rast:
-        return np.array(rast)
+        return rast.read_window(0, 0, rast._rows, rast._cols)
 
 
 def raster2numpy_img(rastname, region, color="ARGB", array=None):
@@ -700,10 +780,7 @@ def numpy2raster(array, mtype, rastname, overwrite=False):
         msg = "Region and array are different: %r != %r"
         raise TypeError(msg % ((reg.rows, reg.cols), array.shape))
     with RasterRow(rastname, mode='w', mtype=mtype, overwrite=overwrite) as new:
-        newrow = Buffer((array.shape[1],), mtype=mtype)
-        for row in array:
-            newrow[:] = row[:]
-            new.put_row(newrow)
+        new.write_window(array)
 
 if __name__ == "__main__":
 
@@ -747,3 +824,8 @@ if __name__ == "__main__":
     if mset:
         Module("g.remove", flags='f', type='raster',
                name=test_raster_name + "_segment")
+    mset = utils.get_mapset_raster(test_raster_name + "_window",
+                                   mapset='')
+    if mset:
+        Module("g.remove", flags='f', type='raster',
+               name=test_raster_name + "_window")
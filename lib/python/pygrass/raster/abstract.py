@@ -7,6 +7,7 @@ Created on Fri Aug 17 16:05:25 2012
 from __future__ import (nested_scopes, generators, division, absolute_import,
                         with_statement, print_function, unicode_literals)
 import ctypes
+import numpy as np
 
 #
 # import GRASS modules
@@ -28,6 +29,7 @@ from grass.pygrass.shell.show import raw_figure
 # import raster classes
 #
 from grass.pygrass.raster.raster_type import TYPE as RTYPE, RTYPE_STR
+from grass.pygrass.raster.buffer import Buffer
 from grass.pygrass.raster.category import Category
 from grass.pygrass.raster.history import History
 
@@ -45,6 +47,33 @@ proj: {proj}
 """
 
 
+# Offsets of the neighbouring cells used by the sampling methods
+SAMPLING_OFFSETS = {'nearest': (0, ),
+                    'bilinear': (0, 1),
+                    'bicubic': (-1, 0, 1, 2)}
+
+
+def _bilinear_weights(u):
+    return np.column_stack((1. - u, u))
+
+
+def _bicubic_weights(u):
+    """Return the weights of the cubic convolution used by Rast_interp_cubic"""
+    u2 = u * u
+    u3 = u2 * u
+    return np.column_stack(((-u3 + 2. * u2 - u) / 2.,
+                            (3. * u3 - 5. * u2 + 2.) / 2.,
+                            (-3. * u3 + 4. * u2 + u) / 2.,
+                            (u3 - u2) / 2.))
+
+
+SAMPLING_WEIGHTS = {'bilinear': _bilinear_weights,
+                    'bicubic': _bicubic_weights}
+
+# Null value of CELL maps
+CELL_NULL = np.iinfo(np.int32).min
+
+
 class Info(object):
     def __init__(self, name, mapset=''):
         """Read the information for a raster map. ::
@@ -402,6 +431,75 @@ class RasterAbstractBase(object):
     def _repr_png_(self):
         return raw_figure(utils.r_export(self))
 
+    def _check_window(self, row_off, col_off, nrows, ncols):
+        """Raise an IndexError if the window is not inside the active region"""
+        if (row_off < 0 or col_off < 0 or nrows < 0 or ncols < 0 or
+                row_off + nrows > self._rows or col_off + ncols > self._cols):
+            str_err = _("The window ({0}, {1}, {2}, {3}) is out of range "
+                        "[0, {4}) x [0, {5})")
+            raise IndexError(str_err.format(row_off, col_off, nrows, ncols,
+                                            self._rows, self._cols))
+
+    @must_be_open
+    def read_window(self, row_off, col_off, nrows, ncols, out=None):
+        """Read a rectangular window of the map into a 2D numpy array,
+        only one row buffer is allocated for the whole window.
+
+        :param int row_off: the first row of the window
+        :param int col_off: the first column of the window
+        :param int nrows: the number of rows of the window
+        :param int ncols: the number of columns of the window
+        :param out: optional array of shape (nrows, ncols) to be filled
+        :type out: numpy.ndarray
+        :return: the array with the values of the window
+
+        >>> from grass.pygrass.raster import RasterRow
+        >>> ele = RasterRow(test_raster_name)
+        >>> ele.open('r')
+        >>> ele.read_window(1, 2, 2, 2)
+        array([[32, 42],
+               [33, 43]], dtype=int32)
+        >>> ele.close()
+
+        """
+        self._check_window(row_off, col_off, nrows, ncols)
+        if out is None:
+            out = np.empty((nrows, ncols), dtype=RTYPE[self.mtype]['numpy'])
+        elif out.shape != (nrows, ncols):
+            str_err = _("The output array shape {0} does not match the "
+                        "window shape {1}")
+            raise ValueError(str_err.format(out.shape, (nrows, ncols)))
+        row_buffer = Buffer((self._cols,), self.mtype)
+        for irow in range(nrows):
+            self.get_row(row_off + irow, row_buffer)
+            out[irow] = row_buffer[col_off:col_off + ncols]
+        return out
+
+    @must_be_open
+    def iter_blocks(self, block_rows):
+        """Return a generator of (row offset, array) tuples with blocks of
+        `block_rows` full rows, the last block may be smaller. It allows to
+        process maps larger than the memory block by block.
+
+        :param int block_rows: the number of rows of each block
+
+        >>> from grass.pygrass.raster import RasterRow
+        >>> ele = RasterRow(test_raster_name)
+        >>> ele.open('r')
+        >>> for row_off, block in ele.iter_blocks(3):
+        ...     row_off, block.shape
+        (0, (3, 4))
+        (3, (1, 4))
+        >>> ele.close()
+
+        """
+        if block_rows < 1:
+            raise ValueError(_("The number of rows of a block must be "
+                               "greater than 0"))
+        for row_off in range(0, self._rows, block_rows):
+            nrows = min(block_rows, self._rows - row_off)
+            yield row_off, self.read_window(row_off, 0, nrows, self._cols)
+
     def exist(self):
         """Return True if the map already exist, and
         set the mapset if were not set.
@@ -538,6 +636,92 @@ class RasterAbstractBase(object):
         line = self.get_row(int(row))
         return line[int(col)]
 
+    @must_be_open
+    def get_values(self, points, region=None, method='nearest'):
+        """Return the pixel values of many pairs of coordinates at once.
+
+        The points are sorted by row, so every row of the map needed by
+        the sampling is read only once and the values are gathered with
+        numpy indexing.
+
+        :param points: sequence or array of shape (n, 2) with the
+                       (east, north) coordinates
+        :param region: the region to work with, if not set the current
+                       computational region will be used
+        :param str method: the sampling method: 'nearest', 'bilinear' or
+                           'bicubic'
+        :return: a numpy array of float with the values, NaN is used for
+                 null cells and points outside the region
+
+        >>> from grass.pygrass.raster import RasterRow
+        >>> ele = RasterRow(test_raster_name)
+        >>> ele.open('r')
+        >>> ele.get_values([(5, 35), (15, 25), (55, 5)])
+        array([11., 22., nan])
+        >>> ele.get_values([(10, 30)], method='bilinear')
+        array([16.5])
+        >>> ele.close()
+
+        """
+        if method not in SAMPLING_OFFSETS:
+            str_err = _("Sampling method: {0} not supported ({1})")
+            raise ValueError(str_err.format(method,
+                                            ', '.join(SAMPLING_OFFSETS)))
+        if not region:
+            region = Region()
+        offsets = np.array(SAMPLING_OFFSETS[method])
+        coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        prow = (region.north - coords[:, 1]) / region.nsres
+        pcol = (coords[:, 0] - region.west) / region.ewres
+        if method != 'nearest':
+            # interpolate between the cell centers
+            prow -= 0.5
+            pcol -= 0.5
+        base_row = np.floor(prow)
+        base_col = np.floor(pcol)
+        frac_row = prow - base_row
+        frac_col = pcol - base_col
+        valid = np.isfinite(base_row) & np.isfinite(base_col)
+        base_row = np.where(valid, base_row, -len(offsets) - 1).astype(int)
+        base_col = np.where(valid, base_col, -len(offsets) - 1).astype(int)
+
+        # pad the rows with nulls, so columns outside the region are NaN
+        pad = len(offsets)
+        cols = np.clip(base_col[:, np.newaxis] + offsets + pad,
+                       0, region.cols + 2 * pad - 1)
+        window = np.empty((len(coords), len(offsets), len(offsets)))
+        padded = np.empty(region.cols + 2 * pad)
+        padded.fill(np.nan)
+        row_buffer = Buffer((region.cols,), self.mtype)
+        rows_cache = {}
+
+        order = np.argsort(base_row, kind='mergesort')
+        sorted_rows = base_row[order]
+        starts = np.flatnonzero(np.r_[True, sorted_rows[1:] != sorted_rows[:-1]])
+        for start, stop in zip(starts, np.r_[starts[1:], len(order)]):
+            row = sorted_rows[start]
+            idx = order[start:stop]
+            for irow, offset in enumerate(offsets):
+                values = rows_cache.get(row + offset)
+                if values is None:
+                    padded[pad:-pad] = np.nan
+                    if 0 <= row + offset < region.rows:
+                        self.get_row(row + offset, row_buffer)
+                        padded[pad:-pad] = row_buffer
+                        if self.mtype == 'CELL':
+                            padded[pad:-pad][row_buffer == CELL_NULL] = np.nan
+                    values = rows_cache[row + offset] = padded.copy()
+                window[idx, irow, :] = values[cols[idx]]
+            # rows are visited in increasing order, drop the ones not needed
+            for cached in [r for r in rows_cache if r < row + offsets[0] + 1]:
+                del rows_cache[cached]
+
+        if method == 'nearest':
+            return window[:, 0, 0]
+        weight = SAMPLING_WEIGHTS[method]
+        return np.einsum('ni,nj,nij->n', weight(frac_row), weight(frac_col),
+                         window)
+
     @must_be_open
     def has_cats(self):
         """Return True if the raster map has categories"""
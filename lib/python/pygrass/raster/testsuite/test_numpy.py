@@ -53,5 +53,19 @@ class NumpyTestCase(TestCase):
         numpy2raster(ran, 'FCELL', self.name, True)
         self.assertTrue(check_raster(self.name))
 
+    def test_read_window(self):
+        with RasterRow(self.name, mode='r') as rast:
+            window = rast.read_window(5, 10, 3, 4)
+            self.assertEqual(window.shape, (3, 4))
+            self.assertEqual(window[0, 0], rast[5][10])
+            self.assertEqual(window[2, 3], rast[7][13])
+
+    def test_iter_blocks(self):
+        with RasterRow(self.name, mode='r') as rast:
+            blocks = list(rast.iter_blocks(16))
+        self.assertEqual([off for off, block in blocks], [0, 16, 32])
+        self.assertEqual([block.shape for off, block in blocks],
+                         [(16, 60), (16, 60), (8, 60)])
+
 if __name__ == '__main__':
     test()
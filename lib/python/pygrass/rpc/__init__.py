@@ -11,17 +11,19 @@ for details.
 :authors: Soeren Gebbert
 """
 
+import os
 import time
 import threading
 import sys
 from multiprocessing import Process, Lock, Pipe
 from ctypes import *
+import numpy as np
 
 from grass.exceptions import FatalError
 from grass.pygrass.vector import *
 from grass.pygrass.raster import *
 import grass.lib.gis as libgis
-from .base import RPCServerBase
+from .base import RPCServerBase, SharedBuffer, SharedBufferPool, resource_tracker
 from grass.pygrass.gis.region import Region
 import grass.pygrass.utils as utils
 import logging
@@ -32,26 +34,68 @@ import logging
 class RPCDefs(object):
     # Function identifier and index
     STOP = 0
-    GET_VECTOR_TABLE_AS_DICT = 1
+    GET_VECTOR_TABLE_AS_ARRAYS = 1
+    # old name of GET_VECTOR_TABLE_AS_ARRAYS
+    GET_VECTOR_TABLE_AS_DICT = GET_VECTOR_TABLE_AS_ARRAYS
     GET_VECTOR_FEATURES_AS_WKB = 2
     GET_RASTER_IMAGE_AS_NP = 3
     G_FATAL_ERROR = 14
 
 
+# Shared buffers created by the server, they are kept open until the next
+# request, so that the client is able to open them
+_created_buffers = []
+
+
+def _open_shared_buffer(name, size, nbytes, create=True):
+    """Open the shared buffer offered by the client or create a new one,
+       in case the offered buffer is too small
+
+       :param name: The name of the offered buffer or None
+       :param size: The size of the offered buffer
+       :param nbytes: The number of bytes that must be stored
+       :param create: Create a new buffer if the offered one is too small
+       :return: The shared buffer or None
+    """
+    if name is not None and size >= nbytes:
+        return SharedBuffer(size=size, name=name)
+    if not create:
+        return None
+    buffer = SharedBuffer(size=nbytes)
+    _created_buffers.append(buffer)
+    return buffer
+
+
+def _close_created_buffers():
+    """Close the shared buffers created in the previous request"""
+    while _created_buffers:
+        _created_buffers.pop().close()
+
+
 def _get_raster_image_as_np(lock, conn, data):
-    """Convert a raster map into an image and return
-       a numpy array with RGB or Gray values.
+    """Convert a raster map into an image and store it
+       in a shared buffer with RGB or Gray values.
+
+       The descriptor (buffer name, buffer size, number of bytes) of the
+       image is sent to the client, the buffer name is None in case
+       the image does not fit into the buffer provided by the caller.
 
        :param lock: A multiprocessing.Lock instance
        :param conn: A multiprocessing.Pipe instance used to send True or False
-       :param data: The list of data entries [function_id, raster_name, extent, color]
+       :param data: The list of data entries [function_id, raster_name,
+                                              mapset, extent, color,
+                                              buffer_name, buffer_size,
+                                              create_buffer]
     """
-    array = None
+    ret = None
     try:
         name = data[1]
         mapset = data[2]
         extent = data[3]
         color = data[4]
+        buffer_name = data[5]
+        buffer_size = data[6]
+        create_buffer = data[7]
 
         mapset = utils.get_mapset_raster(name, mapset)
 
@@ -80,14 +124,30 @@ def _get_raster_image_as_np(lock, conn, data):
                     reg.cols =  extent["cols"]
                 reg.adjust()
 
-            array = raster2numpy_img(name, reg, color)
+            scale = 1
+            if color.upper() in ("ARGB", "RGB"):
+                scale = 4
+            nbytes = reg.rows * reg.cols * scale
+
+            buffer = _open_shared_buffer(buffer_name, buffer_size, nbytes,
+                                         create_buffer)
+            if buffer is None:
+                ret = (None, 0, nbytes)
+            else:
+                array = np.frombuffer(buffer.buf, np.uint8, count=nbytes)
+                raster2numpy_img(name, reg, color, array)
+                del array
+                ret = (buffer.name, buffer.size, nbytes)
+                if buffer not in _created_buffers:
+                    buffer.close()
     except:
         raise
     finally:
-        conn.send(array)
+        conn.send(ret)
 
-def _get_vector_table_as_dict(lock, conn, data):
-    """Get the table of a vector map layer as dictionary
+def _get_vector_table_as_arrays(lock, conn, data):
+    """Get the table of a vector map layer as numpy masked arrays,
+       see Table.to_arrays
 
        :param lock: A multiprocessing.Lock instance
        :param conn: A multiprocessing.Pipe instance used to send True or False
@@ -113,7 +173,7 @@ def _get_vector_table_as_dict(lock, conn, data):
             table = None
             if layer.table is not None:
                 columns = layer.table.columns
-                table = layer.table_to_dict(where=where)
+                table = layer.table.to_arrays(where=where)
             layer.close()
 
             ret = {}
@@ -130,12 +190,18 @@ def _get_vector_features_as_wkb_list(lock, conn, data):
        supported feature types:
        point, centroid, line, boundary, area
 
+       The wkb of all features is stored in a shared buffer, the
+       descriptor (buffer name, buffer size, [(id, cat, offset, length), ...])
+       is sent to the client.
+
        :param lock: A multiprocessing.Lock instance
        :param conn: A multiprocessing.Pipe instance used to send True or False
        :param data: The list of data entries [function_id,name,mapset,extent,
-                                              feature_type, field]
+                                              feature_type, field,
+                                              buffer_name, buffer_size]
 
     """
+    ret = None
     wkb_list = None
     try:
         name = data[1]
@@ -143,6 +209,8 @@ def _get_vector_features_as_wkb_list(lock, conn, data):
         extent = data[3]
         feature_type = data[4]
         field = data[5]
+        buffer_name = data[6]
+        buffer_size = data[7]
         bbox = None
 
         mapset = utils.get_mapset_vector(name, mapset)
@@ -167,10 +235,23 @@ def _get_vector_features_as_wkb_list(lock, conn, data):
                                                       feature_type=feature_type,
                                                       field=field)
             layer.close()
+
+        if wkb_list is not None:
+            nbytes = sum(len(wkb) for f_id, cat, wkb in wkb_list)
+            buffer = _open_shared_buffer(buffer_name, buffer_size, nbytes)
+            entries = []
+            offset = 0
+            for f_id, cat, wkb in wkb_list:
+                buffer.buf[offset:offset + len(wkb)] = bytes(wkb)
+                entries.append((f_id, cat, offset, len(wkb)))
+                offset += len(wkb)
+            ret = (buffer.name, buffer.size, entries)
+            if buffer not in _created_buffers:
+                buffer.close()
     except:
         raise
     finally:
-        conn.send(wkb_list)
+        conn.send(ret)
 
 ###############################################################################
 
@@ -216,7 +297,7 @@ def data_provider_server(lock, conn):
 
     # Crerate the function array
     functions = [0]*15
-    functions[RPCDefs.GET_VECTOR_TABLE_AS_DICT] = _get_vector_table_as_dict
+    functions[RPCDefs.GET_VECTOR_TABLE_AS_ARRAYS] = _get_vector_table_as_arrays
     functions[RPCDefs.GET_VECTOR_FEATURES_AS_WKB] = _get_vector_features_as_wkb_list
     functions[RPCDefs.GET_RASTER_IMAGE_AS_NP] = _get_raster_image_as_np
     functions[RPCDefs.STOP] = _stop
@@ -227,6 +308,7 @@ def data_provider_server(lock, conn):
         conn.poll(None)
         data = conn.recv()
         lock.acquire()
+        _close_created_buffers()
         functions[data[0]](lock, conn, data)
         lock.release()
 
@@ -236,13 +318,24 @@ test_raster_name="data_provider_raster_map"
 class DataProvider(RPCServerBase):
     """Fast and exit-safe interface to PyGRASS data delivery functions
 
+       Raster images and vector features are transferred from the
+       server process through shared buffers, only a small descriptor
+       is sent through the pipe. The buffers are reused as soon as the
+       returned arrays are garbage collected.
     """
     def __init__(self):
+        self.buffers = SharedBufferPool()
         RPCServerBase.__init__(self)
 
     def start_server(self):
         """This function must be re-implemented in the subclasses
         """
+        if resource_tracker is not None and os.name == "posix":
+            # the server must share the resource tracker of this process,
+            # otherwise its own tracker would remove the shared buffers
+            # when the server exits
+            resource_tracker.ensure_running()
+
         self.client_conn, self.server_conn = Pipe(True)
         self.lock = Lock()
         self.server = Process(target=data_provider_server, args=(self.lock,
@@ -250,11 +343,32 @@ class DataProvider(RPCServerBase):
         self.server.daemon = True
         self.server.start()
 
-    def get_raster_image_as_np(self, name, mapset=None, extent=None, color="RGB"):
-        """Return the attribute table of a vector map as dictionary.
+    def stop(self):
+        """Stop the libgis server and remove the shared buffers"""
+        RPCServerBase.stop(self)
+        self.buffers.clear()
+
+    def _result_buffer(self, offered, name, size):
+        """Return the shared buffer the server stored the result in,
+           it is the offered buffer or a new buffer created by the server
+        """
+        if offered is not None and offered.name == name:
+            return offered
+        return SharedBuffer(size=size, name=name)
+
+    def get_raster_image_as_np(self, name, mapset=None, extent=None,
+                               color="RGB", buffer=None):
+        """Return a raster map as image in a numpy array.
 
            See documentation of: pygrass.raster.raster2numpy_img
 
+           The returned array is a view into a shared buffer, the buffer
+           is reused when the array was garbage collected.
+
+           :param buffer: A SharedBuffer the image is rendered into, a
+                          ValueError is raised if the image does not fit
+                          into the buffer
+
            Usage:
 
            .. code-block:: python
@@ -293,18 +407,102 @@ class DataProvider(RPCServerBase):
             >>> len(ret)
             12
 
+            The buffer of an image is reused as soon as the image
+            was deleted
+
+            >>> len(provider.buffers.free_buffers())
+            0
+            >>> del ret
+            >>> len(provider.buffers.free_buffers())
+            1
+
+            Render the image into a shared buffer of the caller
+
+            >>> from grass.pygrass.rpc.base import SharedBuffer
+            >>> buffer = SharedBuffer(size=64)
+            >>> ret = provider.get_raster_image_as_np(name=test_raster_name,
+            ...                                       buffer=buffer)
+            >>> len(ret)
+            64
+            >>> bytearray(buffer.buf[:64]) == bytearray(ret.tobytes())
+            True
+            >>> del ret
+            >>> buffer.close()
+            >>> buffer.unlink()
+            >>> buffer = SharedBuffer(size=32)
+            >>> provider.get_raster_image_as_np(name=test_raster_name,
+            ...                                 buffer=buffer)
+            Traceback (most recent call last):
+            ...
+            ValueError: The shared buffer is too small, 64 bytes are required
+            >>> buffer.close()
+            >>> buffer.unlink()
+            >>> provider.stop()
 
             ..
         """
         self.check_server()
+        offered = buffer
+        if offered is None:
+            offered = self.buffers.acquire()
+        if offered is None:
+            buffer_name, buffer_size = None, 0
+        else:
+            buffer_name, buffer_size = offered.name, offered.size
         self.client_conn.send([RPCDefs.GET_RASTER_IMAGE_AS_NP,
-                               name, mapset, extent, color])
-        return self.safe_receive("get_raster_image_as_np")
+                               name, mapset, extent, color,
+                               buffer_name, buffer_size, buffer is None])
+        ret = self.safe_receive("get_raster_image_as_np")
+        if ret is None:
+            return None
+
+        buffer_name, buffer_size, nbytes = ret
+        if buffer_name is None:
+            raise ValueError("The shared buffer is too small, "
+                             "%i bytes are required" % nbytes)
+
+        result_buffer = self._result_buffer(offered, buffer_name, buffer_size)
+        array = np.frombuffer(result_buffer.buf, np.uint8, count=nbytes)
+        if buffer is None:
+            self.buffers.add(result_buffer, array)
+        return array
+
+    def get_vector_table_as_arrays(self, name, mapset=None, where=None):
+        """Return the attribute table of a vector map as numpy masked
+           arrays, one for each column, NULL values are masked.
+
+           See documentation of: pygrass.vector.table.Table::to_arrays
+
+           Usage:
+
+           .. code-block:: python
+
+            >>> from grass.pygrass.rpc import DataProvider
+            >>> provider = DataProvider()
+            >>> ret = provider.get_vector_table_as_arrays(name=test_vector_name,
+            ...                                           where="value > 1")
+            >>> list(ret["table"].keys())
+            ['cat', 'name', 'value']
+            >>> ret["table"]["value"].tolist()
+            [2.0, 3.0]
+            >>> ret["columns"]
+            Columns([('cat', 'INTEGER'), ('name', 'varchar(50)'), ('value', 'double precision')])
+            >>> provider.get_vector_table_as_arrays(name="no_map")
+            >>> provider.stop()
+
+            ..
+        """
+        self.check_server()
+        self.client_conn.send([RPCDefs.GET_VECTOR_TABLE_AS_ARRAYS,
+                               name, mapset, where])
+        return self.safe_receive("get_vector_table_as_arrays")
 
     def get_vector_table_as_dict(self, name, mapset=None, where=None):
         """Return the attribute table of a vector map as dictionary.
 
-           See documentation of: pygrass.vector.VectorTopo::table_to_dict
+           The table is transferred as arrays, see get_vector_table_as_arrays,
+           and converted into the dictionary of
+           pygrass.vector.VectorTopo::table_to_dict
 
            Usage:
 
@@ -329,10 +527,14 @@ class DataProvider(RPCServerBase):
 
             ..
         """
-        self.check_server()
-        self.client_conn.send([RPCDefs.GET_VECTOR_TABLE_AS_DICT,
-                               name, mapset, where])
-        return self.safe_receive("get_vector_table_as_dict")
+        ret = self.get_vector_table_as_arrays(name, mapset, where)
+        if ret is not None and ret["table"] is not None:
+            arrays = ret["table"]
+            key = list(arrays.keys()).index(ret["columns"].key)
+            # tolist() returns None for the masked NULL values
+            rows = zip(*[array.tolist() for array in arrays.values()])
+            ret["table"] = dict((row[key], list(row)) for row in rows)
+        return ret
 
     def get_vector_features_as_wkb_list(self, name, mapset=None, extent=None,
                                         feature_type="point", field=1):
@@ -427,9 +629,24 @@ class DataProvider(RPCServerBase):
             ..
         """
         self.check_server()
+        offered = self.buffers.acquire()
+        if offered is None:
+            buffer_name, buffer_size = None, 0
+        else:
+            buffer_name, buffer_size = offered.name, offered.size
         self.client_conn.send([RPCDefs.GET_VECTOR_FEATURES_AS_WKB,
-                               name, mapset, extent, feature_type, field])
-        return self.safe_receive("get_vector_features_as_wkb_list")
+                               name, mapset, extent, feature_type, field,
+                               buffer_name, buffer_size])
+        ret = self.safe_receive("get_vector_features_as_wkb_list")
+        if ret is None:
+            return None
+
+        buffer_name, buffer_size, entries = ret
+        result_buffer = self._result_buffer(offered, buffer_name, buffer_size)
+        wkb_list = [(f_id, cat, bytearray(result_buffer.buf[offset:offset + length]))
+                    for f_id, cat, offset, length in entries]
+        self.buffers.add(result_buffer)
+        return wkb_list
 
 
 if __name__ == "__main__":
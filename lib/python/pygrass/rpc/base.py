@@ -15,9 +15,186 @@ from grass.exceptions import FatalError
 import time
 import threading
 import sys
+import os
+import mmap
+import tempfile
+import weakref
 from multiprocessing import Process, Lock, Pipe
 import logging
 
+try:
+    from multiprocessing import shared_memory, resource_tracker
+except ImportError:
+    # Python < 3.8, memory mapped temporary files are used instead
+    shared_memory = None
+    resource_tracker = None
+
+###############################################################################
+
+class SharedBuffer(object):
+    """A block of memory that is shared between the client and the server
+       process
+
+       The block is a multiprocessing.shared_memory segment or a memory
+       mapped temporary file, in case shared memory is not available.
+       Only the name and the size of the block must be sent through the
+       pipe to open the block in the other process.
+
+        >>> from grass.pygrass.rpc.base import SharedBuffer
+        >>> buffer = SharedBuffer(size=5)
+        >>> buffer.buf[:5] = b"GRASS"
+        >>> other = SharedBuffer(size=buffer.size, name=buffer.name)
+        >>> bytearray(other.buf[:5]) == bytearray(b"GRASS")
+        True
+        >>> other.close()
+        >>> buffer.close()
+        >>> buffer.unlink()
+
+    """
+    def __init__(self, size=0, name=None):
+        """Create a new shared buffer or open an existing one
+
+           :param size: The size of the buffer in bytes
+           :param name: The name of an existing buffer to open
+        """
+        self.size = size
+        self._shm = None
+        self._mmap = None
+
+        if shared_memory is not None:
+            if name is None:
+                self._shm = shared_memory.SharedMemory(create=True,
+                                                       size=max(size, 1))
+            else:
+                self._shm = shared_memory.SharedMemory(name=name)
+            self.name = self._shm.name
+            self.buf = self._shm.buf
+        else:
+            if name is None:
+                fd, name = tempfile.mkstemp(prefix="pygrass_rpc_")
+                os.ftruncate(fd, max(size, 1))
+            else:
+                fd = os.open(name, os.O_RDWR)
+            try:
+                self._mmap = mmap.mmap(fd, max(size, 1))
+            finally:
+                os.close(fd)
+            self.name = name
+            self.buf = self._mmap
+
+    def close(self):
+        """Close the buffer in this process
+
+           A BufferError is raised in case arrays still use the buffer
+        """
+        if self._shm is not None:
+            self._shm.close()
+        if self._mmap is not None:
+            self._mmap.close()
+        self.buf = None
+
+    def unlink(self):
+        """Remove the buffer, it is freed as soon as all processes closed it
+        """
+        try:
+            if self._shm is not None:
+                self._shm.unlink()
+            else:
+                os.remove(self.name)
+        except OSError:
+            pass
+
+
+class SharedBufferPool(object):
+    """A pool of shared buffers owned by the client process
+
+       A buffer is bound to the object that is returned to the caller and
+       is free for reuse as soon as the object was garbage collected.
+
+        >>> from grass.pygrass.rpc.base import SharedBuffer, SharedBufferPool
+        >>> pool = SharedBufferPool()
+        >>> pool.acquire()
+        >>> pool.add(SharedBuffer(size=16))
+        >>> buffer = pool.acquire()
+        >>> buffer.size
+        16
+        >>> class User(object):
+        ...     pass
+        >>> user = User()
+        >>> pool.bind(buffer, user)
+        >>> pool.acquire()
+        >>> del user
+        >>> pool.acquire().size
+        16
+        >>> pool.clear()
+
+    """
+    def __init__(self, max_free=4):
+        """Constructor
+
+           :param max_free: The maximum number of free buffers to keep
+        """
+        self.max_free = max_free
+        self.buffers = {}
+        self.users = {}
+
+    def _is_free(self, name):
+        user = self.users.get(name)
+        return user is None or user() is None
+
+    def free_buffers(self):
+        """Return the list of buffers that are not used"""
+        return [buffer for name, buffer in self.buffers.items()
+                if self._is_free(name)]
+
+    def acquire(self):
+        """Return the largest free buffer or None"""
+        free = self.free_buffers()
+        if not free:
+            return None
+        return max(free, key=lambda buffer: buffer.size)
+
+    def get(self, name):
+        """Return the buffer of the pool with the provided name or None"""
+        return self.buffers.get(name)
+
+    def add(self, buffer, user=None):
+        """Add a buffer to the pool, the smallest free buffers
+           are removed in case the pool holds more than max_free free
+           buffers
+
+           :param buffer: The shared buffer
+           :param user: The object that uses the buffer or None
+        """
+        self.buffers[buffer.name] = buffer
+        self.users.pop(buffer.name, None)
+        if user is not None:
+            self.bind(buffer, user)
+        free = sorted(self.free_buffers(), key=lambda buffer: buffer.size)
+        for buffer in free[:max(0, len(free) - self.max_free)]:
+            self.remove(buffer)
+
+    def bind(self, buffer, user):
+        """Bind the buffer to the object that uses it"""
+        self.users[buffer.name] = weakref.ref(user)
+
+    def remove(self, buffer):
+        """Remove the buffer from the pool and unlink it"""
+        self.buffers.pop(buffer.name, None)
+        self.users.pop(buffer.name, None)
+        try:
+            buffer.close()
+        except BufferError:
+            # the buffer is still used by an array, the memory is freed
+            # when the array is garbage collected
+            pass
+        buffer.unlink()
+
+    def clear(self):
+        """Remove all buffers of the pool"""
+        for buffer in list(self.buffers.values()):
+            self.remove(buffer)
+
 ###############################################################################
 
 def dummy_server(lock, conn):
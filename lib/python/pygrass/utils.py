@@ -212,9 +212,13 @@ def pixel2coor(pixel, region):
             libraster.Rast_col_to_easting(col, region.byref()))
 
 
-def get_raster_for_points(poi_vector, raster, column=None, region=None):
+def get_raster_for_points(poi_vector, raster, column=None, region=None,
+                          method='nearest'):
     """Query a raster map for each point feature of a vector
 
+    All the points are sampled at once with the `get_values` method of
+    the raster and the column is updated with a single transaction.
+
     Example
 
     >>> from grass.pygrass.raster import RasterRow
@@ -274,13 +278,13 @@ def get_raster_for_points(poi_vector, raster, column=None, region=None):
     :param str column: column name to update in the attrinute table,
                        if set to None a list of sampled values will be returned
     :param region: The region to work with, if not set the current computational region will be used
+    :param str method: The sampling method: 'nearest', 'bilinear' or 'bicubic'
 
     :return: True in case of success and a specified column for update,
              if column name for update was not set a list of (id, x, y, value) is returned
     """
     from math import isnan
-    if not column:
-        result = []
+    from grass.pygrass.vector import sql
     if region is None:
         from grass.pygrass.gis.region import Region
         region = Region()
@@ -291,21 +295,26 @@ def get_raster_for_points(poi_vector, raster, column=None, region=None):
     if poi_vector.num_primitive_of('point') == 0:
         raise GrassError(_("Vector doesn't contain points"))
 
-    for poi in poi_vector.viter('points'):
-        val = raster.get_value(poi, region)
-        if column:
-            if val is not None and not isnan(val):
-                poi.attrs[column] = val
-        else:
-            if val is not None and not isnan(val):
-                result.append((poi.id, poi.x, poi.y, val))
-            else:
-                result.append((poi.id, poi.x, poi.y, None))
+    pois = [(poi.id, poi.cat, poi.x, poi.y)
+            for poi in poi_vector.viter('points')]
+    values = raster.get_values([(x, y) for _id, _cat, x, y in pois],
+                               region, method=method).tolist()
     if not column:
-        return result
-    else:
-        poi.attrs.commit()
-        return True
+        return [(pid, x, y, None if isnan(val) else val)
+                for (pid, _cat, x, y), val in zip(pois, values)]
+
+    table = poi_vector.table
+    if column not in table.columns:
+        raise KeyError('Column: %s not in table' % column)
+    sqlcode = sql.UPDATE_WHERE.format(tname=table.name,
+                                      values='%s=?' % column,
+                                      condition='%s=?' % table.key)
+    updates = [(val, cat) for (_id, cat, _x, _y), val in zip(pois, values)
+               if cat is not None and not isnan(val)]
+    if updates:
+        table.execute(sqlcode, many=True, values=updates)
+    table.conn.commit()
+    return True
 
 
 def r_export(rast, output='', fmt='png', **kargs):
@@ -2,10 +2,17 @@
 from __future__ import print_function
 
 from os.path import join, exists
+from itertools import repeat
+try:
+    from itertools import izip as zip
+except ImportError:
+    # python3
+    pass
 import grass.lib.gis as libgis
 libgis.G_gisinit('')
 import grass.lib.vector as libvect
 import ctypes
+import numpy as np
 
 #
 # import pygrass modules
@@ -16,7 +23,9 @@ from grass.pygrass.gis import Location
 
 from grass.pygrass.vector.geometry import GEOOBJ as _GEOOBJ
 from grass.pygrass.vector.geometry import read_line, read_next_line
+from grass.pygrass.vector.geometry import points_to_array
 from grass.pygrass.vector.geometry import Area as _Area
+from grass.pygrass.vector import sql
 from grass.pygrass.vector.abstract import Info
 from grass.pygrass.vector.basic import Bbox, Cats, Ilist
 
@@ -36,9 +45,145 @@ _NUMOF = {"areas": libvect.Vect_get_num_areas,
           "updated_nodes": libvect.Vect_get_num_updated_nodes,
           "volumes": libvect.Vect_get_num_volumes}
 
+# Number of features whose attributes are read with a single query,
+# SQLite supports up to 999 parameters in a query
+ATTRS_CHUNKSIZE = 999
+
 # For test purposes
 test_vector_name = "vector_doctest_map"
 
+
+class BulkWriter(object):
+    """Write many features and their attributes to an open vector map.
+
+    The attributes are inserted with executemany in chunks and committed
+    in a single transaction when the writer is closed. Points written
+    from coordinates reuse the same line_pnts and line_cats structures.
+    Use it as context manager, see Vector.bulk_writer, in case of an
+    exception the attributes are rolled back, the features already
+    written to the map are kept.
+    """
+    def __init__(self, vector, chunksize=10000):
+        """Constructor
+
+        :param vector: the open vector map
+        :type vector: Vector object
+        :param chunksize: the number of attribute rows that are inserted
+                          with a single executemany
+        :type chunksize: int
+        """
+        self.vector = vector
+        self.chunksize = chunksize
+        self.rows = []
+        # the new categories, they are released by rollback
+        self.cats = []
+        self.last_cat = vector._last_cat
+        self.c_points = libvect.Vect_new_line_struct()
+        self.c_cats = libvect.Vect_new_cats_struct()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.rollback()
+
+    def _set_cat(self, c_cats, cat, attrs):
+        """Set the category and collect the attributes of a new category"""
+        vect = self.vector
+        cat, row = vect._new_cat(cat, attrs)
+        if cat is None:
+            return
+        if row is not None:
+            self.cats.append(cat)
+            self.rows.append(row)
+            if len(self.rows) >= self.chunksize:
+                self.flush()
+        libvect.Vect_reset_cats(c_cats)
+        libvect.Vect_cat_set(c_cats, vect.layer, cat)
+
+    def _write_line(self, gtype, c_points, c_cats):
+        vect = self.vector
+        vect.n_lines += 1
+        result = libvect.Vect_write_line(vect.c_mapinfo, gtype,
+                                         c_points, c_cats)
+        if result == -1:
+            raise GrassError("Not able to write the vector feature.")
+        return result
+
+    def write(self, geo_obj, cat=None, attrs=None):
+        """Write a geometry feature, see Vector.write
+
+        :param geo_obj: a geometry grass object define in
+                        grass.pygrass.vector.geometry
+        :type geo_obj: geometry GRASS object
+        :param cat: the category of the geometry feature, otherwise the
+                    c_cats attribute of the geometry object will be used
+        :type cat: integer
+        :param attrs: the values that will be insert in the attribute table
+        :type attrs: list
+        """
+        self._set_cat(geo_obj.c_cats, cat, attrs)
+        result = self._write_line(geo_obj.gtype, geo_obj.c_points,
+                                  geo_obj.c_cats)
+        if self.vector._topo_level == 2:
+            geo_obj.id = result
+        else:
+            geo_obj.offset = result
+
+    def write_point(self, x, y, z=0., cat=None, attrs=None):
+        """Write a point without creating a Point object
+
+        :param cat: the category of the point
+        :type cat: integer
+        :param attrs: the values that will be insert in the attribute table
+        :type attrs: list
+        :return: the feature id on level 2 or the offset on level 1
+        """
+        libvect.Vect_reset_line(self.c_points)
+        libvect.Vect_append_point(self.c_points, x, y, z)
+        libvect.Vect_reset_cats(self.c_cats)
+        self._set_cat(self.c_cats, cat, attrs)
+        return self._write_line(libvect.GV_POINT, self.c_points, self.c_cats)
+
+    def flush(self):
+        """Insert the collected attributes"""
+        if self.rows:
+            self.vector.table.insert(self.rows, many=True)
+            self.rows = []
+
+    def close(self):
+        """Insert the collected attributes, commit the transaction and
+        free the reused structures"""
+        if self.c_points is None:
+            return
+        self.flush()
+        if self.vector.table is not None:
+            self.vector.table.conn.commit()
+        self._free()
+
+    def rollback(self):
+        """Discard the collected attributes, roll back the transaction and
+        free the reused structures"""
+        if self.c_points is None:
+            return
+        self.rows = []
+        vect = self.vector
+        if vect.table is not None:
+            vect.table.conn.rollback()
+        vect._cats.difference_update(self.cats)
+        vect._last_cat = self.last_cat
+        self._free()
+
+    def _free(self):
+        libvect.Vect_destroy_line_struct(self.c_points)
+        libvect.Vect_destroy_cats_struct(self.c_cats)
+        self.c_points = None
+        self.c_cats = None
+
+
 #=============================================
 # VECTOR
 #=============================================
@@ -64,7 +209,8 @@ class Vector(Info):
         self._topo_level = 1
         self._class_name = 'Vector'
         self.overwrite = False
-        self._cats = []
+        self._cats = set()
+        self._last_cat = 0
 
     def __repr__(self):
         if self.exist():
@@ -194,19 +340,11 @@ class Vector(Info):
             # try to accommodate
             attrs = cat
             cat = None
-        if attrs and cat is None:
-            # TODO: this does not work as expected when there are
-            # already features in the map when we opened it
-            cat = (self._cats[-1] if self._cats else 0) + 1
-
-        if cat is not None and cat not in self._cats:
-            self._cats.append(cat)
-            if self.table is not None and attrs is not None:
-                attr = [cat, ]
-                attr.extend(attrs)
-                cur = self.table.conn.cursor()
-                cur.execute(self.table.columns.insert_str, attr)
-                cur.close()
+        cat, attr = self._new_cat(cat, attrs)
+        if attr is not None:
+            cur = self.table.conn.cursor()
+            cur.execute(self.table.columns.insert_str, attr)
+            cur.close()
 
         if cat is not None:
             cats = Cats(geo_obj.c_cats)
@@ -226,6 +364,112 @@ class Vector(Info):
             # return offset into file where the feature starts (on level 1)
             geo_obj.offset = result
 
+    def _new_cat(self, cat, attrs):
+        """Return the category of a feature that is written and the row of
+        attributes that must be inserted, or None if the category is known
+        or has no attributes"""
+        if attrs and cat is None:
+            # TODO: this does not work as expected when there are
+            # already features in the map when we opened it
+            cat = self._last_cat + 1
+
+        if cat is not None and cat not in self._cats:
+            self._cats.add(cat)
+            self._last_cat = cat
+            if self.table is not None and attrs is not None:
+                attr = [cat, ]
+                attr.extend(attrs)
+                return cat, attr
+        return cat, None
+
+    @must_be_open
+    def bulk_writer(self, chunksize=10000):
+        """Return a BulkWriter to write many features in a single
+        transaction, the attributes are committed when it is closed
+
+        :param chunksize: the number of attribute rows that are inserted
+                          with a single executemany
+        :type chunksize: int
+
+            >>> cols = [(u'cat',       'INTEGER PRIMARY KEY'),
+            ...         (u'name',      'TEXT')]
+            >>> new = VectorTopo('newvect_bulk')
+            >>> new.open('w', tab_name='newvect_bulk', tab_cols=cols,
+            ...          overwrite=True)
+            >>> from grass.pygrass.vector.geometry import Line
+            >>> with new.bulk_writer() as writer:
+            ...     writer.write(Line([(0, 0), (1, 1)]), cat=1,
+            ...                  attrs=('diagonal',))
+            ...     for i in range(3):
+            ...         writer.write_point(i, 0, attrs=('point %d' % i,))
+            >>> new.table.execute().fetchall()
+            [(1, 'diagonal'), (2, 'point 0'), (3, 'point 1'), (4, 'point 2')]
+
+        the attributes are rolled back in case of an exception ::
+
+            >>> with new.bulk_writer() as writer:
+            ...     writer.write_point(5, 5, attrs=('lost',))
+            ...     raise ValueError("stop")
+            Traceback (most recent call last):
+            ...
+            ValueError: stop
+            >>> new.table.execute().fetchall()
+            [(1, 'diagonal'), (2, 'point 0'), (3, 'point 1'), (4, 'point 2')]
+            >>> new.close()
+            >>> new.open('r')
+            >>> new.read(4)
+            Point(2.000000, 0.000000)
+            >>> new.close()
+            >>> new.remove()
+        """
+        return BulkWriter(self, chunksize)
+
+    @must_be_open
+    def write_many(self, geo_objs, cats=None, attrs=None):
+        """Write many geometry features and their attributes in a single
+        transaction, see Vector.write.
+
+        :param geo_objs: geometry grass objects or a numpy array of point
+                         coordinates with two or three columns
+        :type geo_objs: iterable or numpy.ndarray
+        :param cats: the categories of the features, by default the
+                     categories are numbered consecutively if attributes
+                     are given
+        :type cats: iterable of integers
+        :param attrs: the values that will be insert in the attribute
+                      table for each feature
+        :type attrs: iterable of lists
+
+            >>> import numpy as np
+            >>> cols = [(u'cat',       'INTEGER PRIMARY KEY'),
+            ...         (u'value',     'DOUBLE PRECISION')]
+            >>> new = VectorTopo('newvect_many')
+            >>> new.open('w', tab_name='newvect_many', tab_cols=cols,
+            ...          overwrite=True)
+            >>> coords = np.array([(0., 0.), (1., 1.), (2., 4.)])
+            >>> new.write_many(coords, cats=[10, 11, 12],
+            ...                attrs=[(y,) for x, y in coords])
+            >>> new.table.execute().fetchall()
+            [(10, 0.0), (11, 1.0), (12, 4.0)]
+            >>> new.close()
+            >>> new.open('r')
+            >>> new.read(3)
+            Point(2.000000, 4.000000)
+            >>> new.read(3).cat
+            12
+            >>> new.close()
+            >>> new.remove()
+        """
+        cats = repeat(None) if cats is None else cats
+        attrs = repeat(None) if attrs is None else attrs
+        with self.bulk_writer() as writer:
+            if isinstance(geo_objs, np.ndarray):
+                for coords, cat, attr in zip(geo_objs.tolist(), cats, attrs):
+                    writer.write_point(*coords, cat=cat, attrs=attr)
+            else:
+                for geo_obj, cat, attr in zip(geo_objs, cats, attrs):
+                    writer.write(geo_obj, cat=cat, attrs=attr)
+
     @must_be_open
     def has_color_table(self):
         """Return if vector has color table associated in file system;
@@ -396,7 +640,7 @@ class VectorTopo(Vector):
         return output
 
     @must_be_open
-    def viter(self, vtype, idonly=False):
+    def viter(self, vtype, idonly=False, attrs=None):
         """Return an iterator of vector features
 
         :param vtype: the name of type to query; the supported values are:
@@ -407,6 +651,10 @@ class VectorTopo(Vector):
         :param idonly: variable to return only the id of features instead of
                        full features
         :type idonly: bool
+        :param attrs: the columns of the attribute table to read in advance,
+                      with a single query for each chunk of features instead
+                      of a query for each feature
+        :type attrs: list of str
 
             >>> test_vect = VectorTopo(test_vector_name, mode='r')
             >>> test_vect.open(mode='r')
@@ -433,6 +681,15 @@ class VectorTopo(Vector):
             3
             3
 
+        read the attributes of all features in advance: ::
+
+            >>> for area in test_vect.viter('areas', attrs=['name', 'value']):
+            ...     print(area.attrs.cat, area.attrs['name', 'value'])
+            3 ('centroid', 3.0)
+            3 ('centroid', 3.0)
+            3 ('centroid', 3.0)
+            3 ('centroid', 3.0)
+
             >>> test_vect.close()
         """
         if vtype in _GEOOBJ.keys():
@@ -440,14 +697,162 @@ class VectorTopo(Vector):
                 ids = (indx for indx in range(1, self.number_of(vtype) + 1))
                 if idonly:
                     return ids
-                return (_GEOOBJ[vtype](v_id=indx, c_mapinfo=self.c_mapinfo,
-                                       table=self.table,
-                                       writeable=self.writeable)
-                        for indx in ids)
+                features = (_GEOOBJ[vtype](v_id=indx,
+                                           c_mapinfo=self.c_mapinfo,
+                                           table=self.table,
+                                           writeable=self.writeable)
+                            for indx in ids)
+                if attrs and self.table is not None:
+                    return self._prefetch_attrs(features, attrs)
+                return features
         else:
             keys = "', '".join(sorted(_GEOOBJ.keys()))
             raise ValueError("vtype not supported, use one of: '%s'" % keys)
 
+    def _select_attrs(self, columns, condition, values):
+        """Return a dictionary with the category as keys and a dictionary
+        of the column values as values"""
+        sqlcode = sql.SELECT_WHERE.format(cols=', '.join([self.table.key] +
+                                                         list(columns)),
+                                          tname=self.table.name,
+                                          condition=condition)
+        cur = self.table.execute(sqlcode, values=values)
+        return dict((row[0], dict(zip(columns, row[1:])))
+                    for row in cur.fetchall())
+
+    def _prefetch_attrs(self, features, columns, chunksize=ATTRS_CHUNKSIZE):
+        """Read the attributes of the features in chunks and yield the
+        features"""
+        chunk = []
+        for feature in features:
+            chunk.append(feature)
+            if len(chunk) == chunksize:
+                for feature in self._attach_attrs(chunk, columns):
+                    yield feature
+                chunk = []
+        for feature in self._attach_attrs(chunk, columns):
+            yield feature
+
+    def _attach_attrs(self, features, columns):
+        """Read the attributes of a chunk of features with a single query"""
+        cats = sorted(set(feature.attrs.cat for feature in features
+                          if feature.attrs is not None))
+        if cats:
+            # prepare the string using as paramstyle: qmark
+            condition = '%s IN (%s)' % (self.table.key,
+                                        ','.join(['?', ] * len(cats)))
+            rows = self._select_attrs(columns, condition, cats)
+            for feature in features:
+                if feature.attrs is not None:
+                    feature.attrs.cache = dict(rows.get(feature.attrs.cat, {}))
+        return features
+
+    @must_be_open
+    def features_with_attrs(self, feature_type="point", attrs=None,
+                            layer=None, chunksize=ATTRS_CHUNKSIZE):
+        """Return an iterator of the features ordered by category with
+        their attributes read in advance.
+
+        The features are read from the category index, the attributes are
+        read with a single query for each chunk of categories. A feature
+        with more categories is returned once for each category.
+
+        :param feature_type: the type of features: *point*, *line*,
+                             *boundary*, *centroid* or *area*
+        :type feature_type: str
+        :param attrs: the columns to read, all columns by default
+        :type attrs: list of str
+        :param layer: the layer number that will be used
+        :type layer: int
+        :param chunksize: the number of features whose attributes are read
+                          with a single query
+        :type chunksize: int
+
+            >>> test_vect = VectorTopo(test_vector_name)
+            >>> test_vect.open(mode='r')
+            >>> for line in test_vect.features_with_attrs('line',
+            ...                                           attrs=['name']):
+            ...     print(line.id, line.attrs.cat, line.attrs['name'])
+            4 2 line
+            5 2 line
+            6 2 line
+            >>> for area in test_vect.features_with_attrs('area'):
+            ...     print(area.id, area.attrs['cat', 'value'])
+            1 (3, 3.0)
+            2 (3, 3.0)
+            3 (3, 3.0)
+            4 (3, 3.0)
+            >>> test_vect.close()
+
+        ..
+        """
+        if feature_type not in ('point', 'line', 'boundary', 'centroid',
+                                'area'):
+            raise ValueError("Unsupported feature type <%s>" % feature_type)
+        gtype = VTYPE[feature_type]
+
+        field_index = libvect.Vect_cidx_get_field_index(self.c_mapinfo,
+                                                        layer if layer
+                                                        else self.layer)
+        if field_index < 0:
+            return
+
+        columns = None
+        if self.table is not None:
+            columns = attrs if attrs else self.table.columns.names()
+
+        chunk = []
+        for entry in self._cidx_entries(field_index, gtype):
+            chunk.append(entry)
+            if len(chunk) == chunksize:
+                for feature in self._read_chunk(chunk, gtype, columns):
+                    yield feature
+                chunk = []
+        for feature in self._read_chunk(chunk, gtype, columns):
+            yield feature
+
+    def _cidx_entries(self, field_index, gtype):
+        """Yield the category and the id of the features of a type from the
+        category index, ordered by category"""
+        cat = ctypes.c_int()
+        ftype = ctypes.c_int()
+        f_id = ctypes.c_int()
+        num_cats = libvect.Vect_cidx_get_num_cats_by_index(self.c_mapinfo,
+                                                           field_index)
+        for index in range(num_cats):
+            libvect.Vect_cidx_get_cat_by_index(self.c_mapinfo, field_index,
+                                               index, ctypes.byref(cat),
+                                               ctypes.byref(ftype),
+                                               ctypes.byref(f_id))
+            if ftype.value == gtype:
+                yield cat.value, f_id.value
+
+    def _read_chunk(self, chunk, gtype, columns):
+        """Read the features of a chunk of (category, id) pairs ordered by
+        category, the attributes are read with a single query"""
+        if not chunk:
+            return []
+        rows = {}
+        if columns:
+            condition = '%s BETWEEN ? AND ?' % self.table.key
+            rows = self._select_attrs(columns, condition,
+                                      (chunk[0][0], chunk[-1][0]))
+        is2D = not self.is_3D()
+        features = []
+        for cat_id, feature_id in chunk:
+            if gtype == libvect.GV_AREA:
+                feature = _Area(v_id=feature_id, c_mapinfo=self.c_mapinfo,
+                                table=self.table, writeable=self.writeable,
+                                is2D=is2D)
+            else:
+                feature = read_line(feature_id, self.c_mapinfo, self.table,
+                                    self.writeable, is2D=is2D)
+            if feature.attrs is not None:
+                feature.attrs.cat = cat_id
+                feature.attrs.cache = dict(rows.get(cat_id, {}))
+            features.append(feature)
+        return features
+
     @must_be_open
     def rewind(self):
         """Rewind vector map to cause reads to start at beginning. ::
@@ -697,6 +1102,105 @@ class VectorTopo(Vector):
 
         return None
 
+    @must_be_open
+    def coords_array(self, feature_type="point", field=1):
+        """Return the ids, the categories and the coordinates of all
+           features of type point, line, boundary or centroid as
+           contiguous numpy arrays, reading the vector map in one pass.
+
+           :param feature_type: The type of the features: 'point', 'line',
+                                'boundary' or 'centroid'
+           :type feature_type: string
+
+           :param field: The category field
+           :type field: integer
+
+           :return: A tuple (ids, cats, coords, offsets), the coordinates
+                    of the i-th feature are coords[offsets[i]:offsets[i + 1]],
+                    the coordinates have three columns for 3D vector maps,
+                    features without category in field have the cat -1
+
+            Examples:
+
+            >>> from grass.pygrass.vector import VectorTopo
+            >>> test_vect = VectorTopo(test_vector_name)
+            >>> test_vect.open('r')
+            >>> ids, cats, coords, offsets = test_vect.coords_array("point")
+            >>> ids
+            array([1, 2, 3], dtype=int32)
+            >>> cats
+            array([1, 1, 1], dtype=int32)
+            >>> coords
+            array([[10.,  6.],
+                   [12.,  6.],
+                   [14.,  6.]])
+
+            >>> ids, cats, coords, offsets = test_vect.coords_array("line")
+            >>> ids
+            array([4, 5, 6], dtype=int32)
+            >>> offsets
+            array([0, 3, 6, 9])
+            >>> coords[offsets[1]:offsets[2]]
+            array([[12.,  4.],
+                   [12.,  2.],
+                   [12.,  0.]])
+
+            >>> test_vect.coords_array("area")
+            Traceback (most recent call last):
+            ...
+            grass.exceptions.GrassError: Unsupported feature type <area>, supported are <point,line,boundary,centroid>
+
+            >>> test_vect.close()
+
+        """
+        supported = ['point', 'line', 'boundary', 'centroid']
+
+        if feature_type.lower() not in supported:
+            raise GrassError("Unsupported feature type <%s>, "\
+                             "supported are <%s>"%(feature_type,
+                                                   ",".join(supported)))
+
+        gtype = VTYPE[feature_type.lower()]
+        is2D = not self.is_3D()
+        num = libvect.Vect_get_num_primitives(self.c_mapinfo, gtype)
+        ids = np.empty(num, dtype=np.int32)
+        cats = np.empty(num, dtype=np.int32)
+        offsets = np.zeros(num + 1, dtype=np.int64)
+        # enough rows for points and centroids, grown for lines
+        coords = np.empty((num, 2 if is2D else 3))
+
+        c_points = libvect.Vect_new_line_struct()
+        c_cats = libvect.Vect_new_cats_struct()
+        cat = ctypes.c_int()
+        indx = 0
+        pos = 0
+        try:
+            for f_id in range(1, libvect.Vect_get_num_lines(self.c_mapinfo) + 1):
+                if libvect.Vect_get_line_type(self.c_mapinfo, f_id) != gtype:
+                    continue
+                if libvect.Vect_read_line(self.c_mapinfo, c_points, c_cats,
+                                          f_id) < 0:
+                    raise GrassError(_("Unable to read line of feature %i")
+                                     % f_id)
+                n_points = c_points.contents.n_points
+                if pos + n_points > len(coords):
+                    grow = max(n_points, len(coords))
+                    coords = np.concatenate((coords,
+                                             np.empty((grow, coords.shape[1]))))
+                points_to_array(c_points, is2D,
+                                out=coords[pos:pos + n_points])
+                libvect.Vect_cat_get(c_cats, field, ctypes.byref(cat))
+                ids[indx] = f_id
+                cats[indx] = cat.value
+                pos += n_points
+                indx += 1
+                offsets[indx] = pos
+        finally:
+            libvect.Vect_destroy_line_struct(c_points)
+            libvect.Vect_destroy_cats_struct(c_cats)
+
+        return ids[:indx], cats[:indx], coords[:pos], offsets[:indx + 1]
+
     @must_be_open
     def features_to_wkb_list(self, bbox=None, feature_type="point", field=1):
         """Return all features of type point, line, boundary or centroid
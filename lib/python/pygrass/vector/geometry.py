@@ -101,6 +101,69 @@ def intersects(lineA, lineB, with_z=False):
 #=============================================
 
 
+def points_to_array(c_points, is2D=True, out=None):
+    """Copy the coordinates of a line_pnts structure into a numpy array,
+    the x, y and z arrays of the structure are copied column wise without
+    creating Point objects.
+
+    :param c_points: a pointer to a libvect.line_pnts structure
+    :param is2D: if True only the x and y coordinates are copied
+    :type is2D: bool
+    :param out: an array with two or three columns and n_points rows
+                that is filled with the coordinates
+    :type out: numpy.ndarray
+    :return: the array of coordinates
+
+        >>> line = Line([(0, 0, 1), (1, 1, 2)])
+        >>> points_to_array(line.c_points, is2D=False)
+        array([[0., 0., 1.],
+               [1., 1., 2.]])
+
+    ..
+    """
+    pnts = c_points.contents
+    num = pnts.n_points
+    if out is None:
+        out = np.empty((num, 2 if is2D else 3))
+    if num:
+        out[:, 0] = np.ctypeslib.as_array(pnts.x, shape=(num,))
+        out[:, 1] = np.ctypeslib.as_array(pnts.y, shape=(num,))
+        if not is2D:
+            out[:, 2] = np.ctypeslib.as_array(pnts.z, shape=(num,))
+    return out
+
+
+def array_to_points(array, c_points):
+    """Replace the coordinates of a line_pnts structure with the rows of
+    an array with two or three columns, using the ``Vect_copy_xyz_to_pnts``
+    C function.
+
+    :param array: the coordinates
+    :type array: numpy.ndarray
+    :param c_points: a pointer to a libvect.line_pnts structure
+
+        >>> line = Line()
+        >>> array_to_points(np.array([(0, 0), (1, 1)]), line.c_points)
+        >>> line
+        Line([Point(0.000000, 0.000000), Point(1.000000, 1.000000)])
+
+    ..
+    """
+    array = np.asarray(array, dtype=np.float64)
+    if array.ndim != 2 or array.shape[1] not in (2, 3):
+        raise ValueError("The coordinates must be an array with two or "
+                         "three columns, not of shape %r" % (array.shape, ))
+    # the columns of the transposed array are contiguous x, y, z arrays
+    xyz = np.ascontiguousarray(array.T)
+    c_double_p = ctypes.POINTER(ctypes.c_double)
+    z = xyz[2].ctypes.data_as(c_double_p) if len(xyz) == 3 else None
+    if libvect.Vect_copy_xyz_to_pnts(c_points,
+                                     xyz[0].ctypes.data_as(c_double_p),
+                                     xyz[1].ctypes.data_as(c_double_p),
+                                     z, len(array)) < 0:
+        raise GrassError("Vect_copy_xyz_to_pnts raise an error.")
+
+
 def get_xyz(pnt):
     """Return a tuple with: x, y, z.
 
@@ -139,6 +202,8 @@ class Attrs(object):
     def __init__(self, cat, table, writeable=False):
         self._cat = None
         self.cond = ''
+        # column values read in advance, see VectorTopo.viter
+        self.cache = {}
         self.table = table
         self.cat = cat
         self.writeable = writeable
@@ -148,6 +213,7 @@ class Attrs(object):
 
     def _set_cat(self, value):
         self._cat = value
+        self.cache = {}
         if value:
             # update condition
             self.cond = "%s=%d" % (self.table.key, value)
@@ -169,6 +235,13 @@ class Attrs(object):
         >>> test_vect.close()
 
         """
+        if self.cache:
+            try:
+                if np.isscalar(keys):
+                    return self.cache[keys]
+                return tuple(self.cache[key] for key in keys)
+            except KeyError:
+                pass
         sqlcode = sql.SELECT_WHERE.format(cols=(keys if np.isscalar(keys)
                                                 else ', '.join(keys)),
                                           tname=self.table.name,
@@ -199,6 +272,21 @@ class Attrs(object):
         >>> v1.attrs.table.conn.commit()
         >>> test_vect.close()
 
+        While a batch of the table is active the values are collected and
+        written with executemany
+
+        >>> test_vect.open('r')
+        >>> v1 = test_vect[1]
+        >>> with v1.attrs.table.batch_update():
+        ...     v1.attrs['name'] = "new_point"
+        ...     len(v1.attrs.table.batch)
+        1
+        >>> v1.attrs['name']
+        'new_point'
+        >>> v1.attrs['name'] = "point"
+        >>> v1.attrs.table.conn.commit()
+        >>> test_vect.close()
+
         """
         if self.writeable:
             if np.isscalar(keys):
@@ -207,14 +295,21 @@ class Attrs(object):
             for key in keys:
                 if key not in self.table.columns:
                     raise KeyError('Column: %s not in table' % key)
-            # prepare the string using as paramstyle: qmark
-            vals = ','.join(['%s=?' % k for k in keys])
-            # "UPDATE {tname} SET {values} WHERE {condition};"
-            sqlcode = sql.UPDATE_WHERE.format(tname=self.table.name,
-                                              values=vals,
-                                              condition=self.cond)
-            self.table.execute(sqlcode, values=values)
-            #self.table.conn.commit()
+            if self.table.batch is not None:
+                self.table.batch.add(self.cat, keys, values, self)
+            else:
+                # prepare the string using as paramstyle: qmark
+                vals = ','.join(['%s=?' % k for k in keys])
+                # "UPDATE {tname} SET {values} WHERE {condition};"
+                sqlcode = sql.UPDATE_WHERE.format(tname=self.table.name,
+                                                  values=vals,
+                                                  condition=self.cond)
+                self.table.execute(sqlcode, values=values)
+                #self.table.conn.commit()
+            # keep the values read in advance up to date
+            for key, value in zip(keys, values):
+                if key in self.cache:
+                    self.cache[key] = value
         else:
             str_err = "You can only read the attributes if the map is in another mapset"
             raise GrassError(str_err)
@@ -611,7 +706,8 @@ class Point(Geo):
 
 
 class Line(Geo):
-    """Instantiate a new Line with a list of tuple, or with a list of Point. ::
+    """Instantiate a new Line with a list of tuple, with a list of Point or
+    with an array of coordinates. ::
 
         >>> line = Line([(0, 0), (1, 1), (2, 0), (1, -1)])
         >>> line                               #doctest: +NORMALIZE_WHITESPACE
@@ -619,6 +715,8 @@ class Line(Geo):
               Point(1.000000, 1.000000),
               Point(2.000000, 0.000000),
               Point(1.000000, -1.000000)])
+        >>> Line(np.array([(0, 0), (1, 1)]))
+        Line([Point(0.000000, 0.000000), Point(1.000000, 1.000000)])
 
     ..
     """
@@ -627,7 +725,9 @@ class Line(Geo):
 
     def __init__(self, points=None, **kargs):
         super(Line, self).__init__(**kargs)
-        if points is not None:
+        if isinstance(points, np.ndarray):
+            self.from_array(points)
+        elif points is not None:
             for pnt in points:
                 self.append(pnt)
 
@@ -798,6 +898,9 @@ class Line(Geo):
         # check if is a Line object
         if isinstance(line, Line):
             c_points = line.c_points
+        elif isinstance(line, np.ndarray):
+            lin = Line(line)
+            c_points = lin.c_points
         else:
             # instantiate a Line object
             lin = Line()
@@ -1071,7 +1174,23 @@ class Line(Geo):
 
         ..
         """
-        return np.array(self.to_list())
+        return points_to_array(self.c_points, self.is2D)
+
+    def from_array(self, array):
+        """Replace the points of the line with an array of coordinates
+        with two or three columns, the coordinates are copied at once
+        with the ``Vect_copy_xyz_to_pnts`` C function. ::
+
+            >>> line = Line([(5, 5)])
+            >>> line.from_array(np.array([(0, 0, 1), (1, 1, 2)]))
+            >>> line.to_array()
+            array([[0., 0., 1.],
+                   [1., 1., 2.]])
+
+        ..
+        """
+        array_to_points(array, self.c_points)
+        self.is2D = np.shape(array)[1] == 2
 
     def to_wkt_p(self):
         """Return a Well Known Text string of the line. ::
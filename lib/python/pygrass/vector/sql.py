@@ -35,6 +35,8 @@ INSERT = "INSERT INTO {tname} VALUES ({values})"
 SELECT = "SELECT {cols} FROM {tname};"
 SELECT_WHERE = "SELECT {cols} FROM {tname} WHERE {condition};"
 SELECT_ORDERBY = "SELECT {cols} FROM {tname} ORDER BY {orderby};"
+SELECT_WHERE_ORDERBY = ("SELECT {cols} FROM {tname} WHERE {condition} "
+                        "ORDER BY {orderby};")
 
 #UPDATE
 UPDATE = "UPDATE {tname} SET {new_col} = {old_col};"
@@ -16,6 +16,8 @@ if sys.version_info.major == 3:
     unicode = str
 
 import ctypes
+import numbers
+from decimal import Decimal
 import numpy as np
 from sqlite3 import OperationalError
 
@@ -39,6 +41,17 @@ test_vector_name = "table_doctest_map"
 
 DRIVERS = ('sqlite', 'pg')
 
+# SQL column types and the matching numpy dtypes, the size of the type
+# is ignored, all other types are stored as Python objects
+SQL2DTYPE = dict([(name, np.int64) for name in
+                  ('integer', 'int', 'int2', 'int4', 'int8', 'tinyint',
+                   'smallint', 'mediumint', 'bigint', 'unsigned big int',
+                   'serial', 'smallserial', 'bigserial')] +
+                 [(name, np.float64) for name in
+                  ('real', 'double', 'double precision', 'float', 'float4',
+                   'float8', 'numeric', 'decimal')] +
+                 [(name, np.bool_) for name in ('bool', 'boolean')])
+
 
 def get_path(path, vect_name=None):
     """Return the full path to the database; replacing environment variable
@@ -950,6 +963,158 @@ class DBlinks(object):
         return libvect.Vect_get_field_number(self.c_mapinfo, name)
 
 
+def column_dtype(col_type):
+    """Return the numpy dtype of a SQL column type, types without a
+    numerical dtype are stored as Python objects.
+
+    >>> column_dtype('INTEGER')
+    <class 'numpy.int64'>
+    >>> column_dtype('double precision')
+    <class 'numpy.float64'>
+    >>> column_dtype('varchar(50)')
+    <class 'object'>
+    >>> column_dtype('NUMERIC(10, 2)')
+    <class 'numpy.float64'>
+    >>> column_dtype('point')
+    <class 'object'>
+    >>> column_dtype('interval')
+    <class 'object'>
+    """
+    col_type = col_type.split('(')[0].strip().lower()
+    return SQL2DTYPE.get(' '.join(col_type.split()), object)
+
+
+def _column_chunk(values, dtype):
+    """Return the values of a column and the mask of the NULL values"""
+    mask = np.fromiter((value is None for value in values), dtype=bool,
+                       count=len(values))
+    # SQLite stores values of any type in any column, numpy would
+    # truncate the REAL values of an INTEGER column
+    valid = [value for value in values if value is not None]
+    if dtype is np.int64 and not all(isinstance(value, numbers.Integral)
+                                     for value in valid):
+        dtype = np.float64
+    if dtype is np.float64 and not all(isinstance(value, (numbers.Real,
+                                                          Decimal))
+                                       for value in valid):
+        dtype = object
+    if dtype is not object and mask.any():
+        values = [0 if value is None else value for value in values]
+    try:
+        return np.array(values, dtype=dtype), mask
+    except (TypeError, ValueError):
+        # SQLite stores values of any type in any column
+        return np.array(values, dtype=object), mask
+
+
+class UpdateBatch(object):
+    """Collect the updates of table rows and execute them in batches with
+    executemany, one UPDATE statement for each set of updated columns.
+    The batch is used as context manager, while it is active the
+    attributes of the vector features are updated through the batch,
+    see Table.batch_update. In case of an exception the updates are
+    rolled back.
+
+    >>> import sqlite3
+    >>> path = '$GISDBASE/$LOCATION_NAME/$MAPSET/sqlite/sqlite.db'
+    >>> tab_sqlite = Table(name=test_vector_name,
+    ...                    connection=sqlite3.connect(get_path(path)))
+    >>> batch = UpdateBatch(tab_sqlite, size=3)
+    >>> batch.add(1, ('name', ), ('one', ))
+    >>> batch.add(2, ('name', 'value'), ('two', 20.))
+    >>> len(batch)
+    2
+    >>> batch.add(3, ('name', ), ('three', ))
+    >>> len(batch)
+    0
+    >>> cur = tab_sqlite.execute('SELECT cat, name, value FROM %s;'
+    ...                          % test_vector_name)
+    >>> cur.fetchall()
+    [(1, 'one', 1.0), (2, 'two', 20.0), (3, 'three', 3.0)]
+    >>> tab_sqlite.conn.rollback()
+
+    """
+    def __init__(self, table, size=10000):
+        """Constructor
+
+        :param table: the table to update
+        :type table: Table object
+        :param size: the number of updates that are collected before they
+                     are executed
+        :type size: int
+        """
+        self.table = table
+        self.size = size
+        self.rows = {}
+        self.count = 0
+        # the attributes with values read in advance that were updated
+        self.attrs = []
+
+    def __len__(self):
+        """Return the number of updates not yet executed"""
+        return self.count
+
+    def __enter__(self):
+        self.table.batch = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.table.batch = None
+        if exc_type is None:
+            self.flush()
+            self.table.conn.commit()
+        else:
+            self.rollback()
+
+    def add(self, key, columns, values, attrs=None):
+        """Add the update of a table row
+
+        :param key: the value of the key column of the row
+        :type key: int
+        :param columns: the names of the columns to update
+        :type columns: tuple of str
+        :param values: the new values of the columns
+        :type values: tuple
+        :param attrs: the attributes of the feature, the values read in
+                      advance are cleared by rollback
+        :type attrs: Attrs object
+        """
+        if attrs is not None and attrs.cache:
+            self.attrs.append(attrs)
+        self.rows.setdefault(tuple(columns), []).append(list(values) + [key, ])
+        self.count += 1
+        if self.count >= self.size:
+            self.flush()
+
+    def flush(self, cursor=None):
+        """Execute the collected updates
+
+        :param cursor: the cursor to connect, if None it use the cursor
+                       of connection table object
+        :type cursor: Cursor object
+        """
+        cur = cursor if cursor else self.table.conn.cursor()
+        for columns, rows in self.rows.items():
+            # prepare the string using as paramstyle: qmark
+            vals = ','.join(['%s=?' % col for col in columns])
+            sqlcode = sql.UPDATE_WHERE.format(tname=self.table.name,
+                                              values=vals,
+                                              condition='%s=?' % self.table.key)
+            self.table.execute(sqlcode, cursor=cur, many=True, values=rows)
+        self.rows = {}
+        self.count = 0
+
+    def rollback(self):
+        """Discard the collected updates, roll back the updates already
+        executed and clear the values read in advance"""
+        self.rows = {}
+        self.count = 0
+        self.table.conn.rollback()
+        for attrs in self.attrs:
+            attrs.cache = {}
+        self.attrs = []
+
+
 class Table(object):
     """
 
@@ -995,6 +1160,7 @@ class Table(object):
                                self.conn,
                                self.key)
         self.filters = Filters(self.name)
+        self.batch = None
 
     def __repr__(self):
         """
@@ -1138,6 +1304,103 @@ class Table(object):
         vals = list(values) + [key, ]
         return cur.execute(self.columns.update_str, vals)
 
+    def batch_update(self, size=10000):
+        """Return an UpdateBatch, while it is used as context manager the
+        values set to the attributes of the vector features are collected
+        and written with executemany, the changes are committed at the end
+
+        :param size: the number of updates that are collected before they
+                     are executed
+        :type size: int
+
+        >>> import sqlite3
+        >>> path = '$GISDBASE/$LOCATION_NAME/$MAPSET/sqlite/sqlite.db'
+        >>> tab_sqlite = Table(name=test_vector_name,
+        ...                    connection=sqlite3.connect(get_path(path)))
+        >>> with tab_sqlite.batch_update() as batch:
+        ...     batch.add(3, ('name', ), ('third', ))
+        ...     tab_sqlite.batch is batch
+        True
+        >>> tab_sqlite.batch
+        >>> cur = tab_sqlite.execute('SELECT name FROM %s WHERE cat=3;'
+        ...                          % test_vector_name)
+        >>> cur.fetchone()
+        ('third',)
+        >>> cur = tab_sqlite.update(3, ('centroid', 3.))
+        >>> tab_sqlite.conn.commit()
+
+        """
+        return UpdateBatch(self, size)
+
+    def to_arrays(self, columns=None, where=None, chunksize=10000):
+        """Return the columns of the table as numpy masked arrays, the
+        rows are fetched in chunks, NULL values are masked.
+
+        :param columns: the names of the columns, by default all columns
+        :type columns: list of str
+        :param where: the condition of the rows, e.g. "value > 1"
+        :type where: str
+        :param chunksize: the number of rows fetched at once
+        :type chunksize: int
+        :return: an OrderedDict with the column names as keys and the
+                 masked arrays as values, the rows are ordered by key, the
+                 dtype of the arrays is derived from the column types, see
+                 column_dtype()
+
+        >>> import sqlite3
+        >>> path = '$GISDBASE/$LOCATION_NAME/$MAPSET/sqlite/sqlite.db'
+        >>> tab_sqlite = Table(name=test_vector_name,
+        ...                    connection=sqlite3.connect(get_path(path)))
+        >>> arrays = tab_sqlite.to_arrays()
+        >>> list(arrays.keys())
+        ['cat', 'name', 'value']
+        >>> arrays['value'].dtype
+        dtype('float64')
+        >>> arrays['name'].tolist()
+        ['point', 'line', 'centroid']
+        >>> arrays = tab_sqlite.to_arrays(['cat', 'value'], where='value > 1',
+        ...                               chunksize=1)
+        >>> arrays['cat'].tolist(), arrays['value'].tolist()
+        ([2, 3], [2.0, 3.0])
+
+        """
+        names = self.columns.names() if columns is None else list(columns)
+        dtypes = [column_dtype(self.columns[name]) for name in names]
+        cols = ', '.join(names)
+        if where:
+            sqlc = sql.SELECT_WHERE_ORDERBY.format(cols=cols, tname=self.name,
+                                                   condition=where,
+                                                   orderby=self.key)
+        else:
+            sqlc = sql.SELECT_ORDERBY.format(cols=cols, tname=self.name,
+                                             orderby=self.key)
+        # a named cursor keeps the result on the PostgreSQL server
+        cur = (self.conn.cursor('to_arrays_%s' % self.name)
+               if self.columns.is_pg() else self.conn.cursor())
+        chunks = [[] for name in names]
+        try:
+            self.execute(sqlc, cursor=cur)
+            while True:
+                rows = cur.fetchmany(chunksize)
+                if not rows:
+                    break
+                for indx, dtype in enumerate(dtypes):
+                    chunks[indx].append(
+                        _column_chunk([row[indx] for row in rows], dtype))
+        finally:
+            cur.close()
+
+        arrays = OrderedDict()
+        for name, dtype, chunk in zip(names, dtypes, chunks):
+            if not chunk:
+                arrays[name] = np.ma.array(np.empty(0, dtype=dtype),
+                                           mask=np.empty(0, dtype=bool))
+                continue
+            values, masks = zip(*chunk)
+            arrays[name] = np.ma.array(np.concatenate(values),
+                                       mask=np.concatenate(masks))
+        return arrays
+
     def create(self, cols, name=None, overwrite=False, cursor=None):
         """Create a new table
 
@@ -70,6 +70,53 @@ class GeometryAttrsTestCase(TestCase):
         self.attrs.__setitem__(('name', 'value'), newpairs)
         self.assertEqual(self.attrs['name', 'value'], newpairs)
 
+    def test_prefetch(self):
+        """Test the attributes read in advance by viter"""
+        points = list(self.vect.viter('points', attrs=['name', 'value']))
+        for point in points:
+            self.assertEqual(point.attrs.cache, {'name': point.attrs['name'],
+                                                 'value': point.attrs['value']})
+        lines = list(self.vect.features_with_attrs('line', attrs=['value']))
+        self.assertEqual([line.id for line in lines], [4, 5, 6])
+        for line in lines:
+            self.assertEqual(line.attrs['value'], 2.0)
+            # columns not read in advance are selected
+            self.assertEqual(line.attrs['name'], u'line')
+
+    def test_batch_update(self):
+        """Test the attributes written in a batch"""
+        table = self.vect.table
+        lines = list(self.vect.features_with_attrs('line', attrs=['value']))
+        with table.batch_update(size=2) as batch:
+            for line in lines:
+                line.attrs['value'] = 20.0
+                self.assertEqual(line.attrs['value'], 20.0)
+            self.assertEqual(len(batch), 1)
+        self.assertIsNone(table.batch)
+        self.assertEqual(self.vect.read(4).attrs['value'], 20.0)
+        for line in lines:
+            line.attrs['value'] = 2.0
+        table.conn.commit()
+
+    def test_batch_update_rollback(self):
+        """Test the attributes of a batch rolled back on an exception"""
+        table = self.vect.table
+        lines = list(self.vect.features_with_attrs('line', attrs=['value']))
+        values = [line.attrs['value'] for line in lines]
+        with self.assertRaises(ValueError):
+            with table.batch_update(size=2) as batch:
+                for line in lines:
+                    line.attrs['value'] = 30.0
+                # the updates of the first two lines are executed
+                self.assertEqual(len(batch), 1)
+                raise ValueError("stop")
+        self.assertIsNone(table.batch)
+        for line, value in zip(lines, values):
+            cur = table.execute("SELECT value FROM %s WHERE %s"
+                                % (table.name, line.attrs.cond))
+            self.assertEqual(cur.fetchone()[0], value)
+            self.assertEqual(line.attrs['value'], value)
+
 
 if __name__ == '__main__':
     test()
@@ -213,5 +213,47 @@ class TableUpdateTestCase(DBconnection, TestCase):
         self.assertTupleEqual(vals, cur.fetchone())
 
 
+class TableToArraysTestCase(DBconnection, TestCase):
+
+    def test_to_arrays(self):
+        """Test Table.to_arrays method"""
+        cur = self.connection.cursor()
+        cur.execute("SELECT cat, cint, creal, ctxt FROM %s ORDER BY cat"
+                    % self.tname)
+        rows = cur.fetchall()
+        arrays = self.table.to_arrays(chunksize=3)
+        self.assertListEqual(list(arrays.keys()),
+                             ['cat', 'cint', 'creal', 'ctxt'])
+        self.assertEqual(arrays['cint'].dtype, np.int64)
+        self.assertEqual(arrays['creal'].dtype, np.float64)
+        self.assertEqual(arrays['ctxt'].dtype, object)
+        self.assertListEqual(rows, list(zip(*[array.tolist()
+                                              for array in arrays.values()])))
+
+    def test_to_arrays_null(self):
+        """Test that Table.to_arrays masks the NULL values"""
+        cur = self.connection.cursor()
+        cur.execute("UPDATE %s SET cint=NULL, creal=NULL, ctxt=NULL "
+                    "WHERE cat=2" % self.tname)
+        self.connection.commit()
+        arrays = self.table.to_arrays(['cat', 'cint', 'creal', 'ctxt'],
+                                      where='cat < 4')
+        self.assertListEqual(arrays['cat'].tolist(), [1, 2, 3])
+        for name in ('cint', 'creal', 'ctxt'):
+            self.assertListEqual(arrays[name].mask.tolist(),
+                                 [False, True, False])
+            self.assertIsNone(arrays[name].tolist()[1])
+
+    def test_to_arrays_real_in_integer(self):
+        """Test that Table.to_arrays keeps REAL values of INTEGER columns"""
+        cur = self.connection.cursor()
+        cur.execute("UPDATE %s SET cint=1.5 WHERE cat=2" % self.tname)
+        self.connection.commit()
+        arrays = self.table.to_arrays(['cat', 'cint'], where='cat < 4')
+        self.assertEqual(arrays['cat'].dtype, np.int64)
+        self.assertEqual(arrays['cint'].dtype, np.float64)
+        self.assertEqual(arrays['cint'].tolist()[1], 1.5)
+
+
 if __name__ == '__main__':
     test()
@@ -118,7 +118,7 @@ import numpy
 
 from .utils import try_remove
 from . import core as gcore
-from grass.exceptions import CalledModuleError
+from grass.exceptions import CalledModuleError, OpenError
 
 
 ###############################################################################
@@ -132,18 +132,181 @@ class _tempfile(object):
 
 ###############################################################################
 
+BACKENDS = ('bin', 'lib')
+
+
+def _check_backend(backend):
+    if backend not in BACKENDS:
+        raise ValueError(_('Invalid backend <%s>') % backend)
+
+
+def _null_value(null, default=0.0):
+    """Convert the null parameter of the array methods into a float"""
+    if null is None:
+        return default
+    if isinstance(null, str) and null.lower() == 'nan':
+        return numpy.nan
+    return float(null)
+
+
+def _set_raster_window():
+    """Set the raster window of this process to the current region
+
+    The region is re-read so that changes made by g.region or by
+    use_temp_region() after the process started are taken into account.
+    """
+    from grass.pygrass.gis.region import Region
+    Region().set_raster_region()
+
+
+def _read_raster_lib(arr, mapname, null=None):
+    """Read a raster map row by row into the 2D array *arr*
+
+    The rows are read as DCELL, so nulls are NaN and can be replaced
+    in place by the *null* value (like r.out.bin does, default is 0).
+    """
+    import ctypes
+    import grass.lib.raster as libraster
+    from grass.pygrass.raster import RasterRow
+
+    null_val = _null_value(null)
+    if arr.dtype.kind != 'f' and numpy.isnan(null_val):
+        raise ValueError(_('Invalid null value <%s> for integer arrays')
+                         % null)
+    direct = arr.dtype == numpy.double and arr.flags.c_contiguous
+    row_buf = numpy.empty(arr.shape[1], dtype=numpy.double)
+    c_double_p = ctypes.POINTER(ctypes.c_double)
+
+    name, _sep, mapset = mapname.partition('@')
+    _set_raster_window()
+    with RasterRow(name, mapset, mode='r') as rast:
+        for row in range(arr.shape[0]):
+            buf = arr[row] if direct else row_buf
+            libraster.Rast_get_row(rast._fd, buf.ctypes.data_as(c_double_p),
+                                   row, libraster.DCELL_TYPE)
+            nulls = numpy.isnan(buf)
+            if not numpy.isnan(null_val):
+                buf[nulls] = null_val
+            if not direct:
+                arr[row] = buf
+
+
+def _write_raster_lib(arr, mapname, title=None, null=None, overwrite=None):
+    """Write the 2D array *arr* row by row into a new raster map
+
+    The map type follows r.in.bin: integer arrays are written as CELL,
+    4 byte floats as FCELL and 8 byte floats as DCELL maps. Cells equal
+    to *null* are written as nulls, NaN is always null for floats.
+    """
+    import ctypes
+    import grass.lib.raster as libraster
+    from grass.pygrass.raster import RasterRow
+    from grass.pygrass.raster.raster_type import TYPE as RTYPE
+
+    kind = arr.dtype.kind
+    if kind == 'f':
+        mtype = 'FCELL' if arr.dtype.itemsize == 4 else 'DCELL'
+    else:
+        mtype = 'CELL'
+    rtype = RTYPE[mtype]
+    if overwrite is None:
+        overwrite = gcore.overwrite()
+    null_val = None if null is None else _null_value(null)
+
+    row_buf = numpy.empty(arr.shape[1], dtype=rtype['numpy'])
+    pointer_type = ctypes.POINTER(rtype['ctypes'])
+
+    _set_raster_window()
+    with RasterRow(mapname, mode='w', mtype=mtype,
+                   overwrite=bool(overwrite)) as rast:
+        for row in arr:
+            row_buf[:] = row
+            if null_val is not None and not numpy.isnan(null_val):
+                nulls = row == null_val
+                if mtype == 'CELL':
+                    row_buf[nulls] = numpy.iinfo(numpy.int32).min
+                else:
+                    row_buf[nulls] = numpy.nan
+            libraster.Rast_put_row(rast._fd,
+                                   row_buf.ctypes.data_as(pointer_type),
+                                   rtype['grass type'])
+    if title:
+        libraster.Rast_put_cell_title(mapname, title)
+
+
+def _read_raster3d_lib(arr, mapname, null=None):
+    """Read a 3D raster map depth by depth into the 3D array *arr*"""
+    import ctypes
+    import grass.lib.gis as libgis
+    import grass.lib.raster as libraster
+    import grass.lib.raster3d as libraster3d
+    # the import of pygrass initializes the GRASS libraries
+    import grass.pygrass.raster  # noqa: F401
+
+    null_val = _null_value(null)
+    if arr.dtype.kind != 'f' and numpy.isnan(null_val):
+        raise ValueError(_('Invalid null value <%s> for integer arrays')
+                         % null)
+
+    name = mapname.split('@')[0]
+    mapset = libgis.G_find_raster3d(mapname, '')
+    if not mapset:
+        raise OpenError(_('3D raster map <%s> not found') % mapname)
+
+    libraster3d.Rast3d_init_defaults()
+    region = libraster3d.RASTER3D_Region()
+    libraster3d.Rast3d_get_window(ctypes.byref(region))
+    map3d = libraster3d.Rast3d_open_cell_old(
+        name, mapset, ctypes.byref(region),
+        libraster3d.RASTER3D_TILE_SAME_AS_FILE,
+        libraster3d.RASTER3D_USE_CACHE_DEFAULT)
+    if not map3d:
+        raise OpenError(_('Unable to open 3D raster map <%s>') % mapname)
+
+    depths, rows, cols = arr.shape
+    direct = arr.dtype == numpy.double and arr.flags.c_contiguous
+    slab_buf = numpy.empty((rows, cols), dtype=numpy.double)
+    try:
+        for depth in range(depths):
+            buf = arr[depth] if direct else slab_buf
+            libraster3d.Rast3d_get_block(map3d, 0, 0, depth, cols, rows, 1,
+                                         buf.ctypes.data_as(ctypes.c_void_p),
+                                         libraster.DCELL_TYPE)
+            if not numpy.isnan(null_val):
+                buf[numpy.isnan(buf)] = null_val
+            if not direct:
+                arr[depth] = buf
+    finally:
+        libraster3d.Rast3d_close(map3d)
+
+###############################################################################
+
 class array(numpy.memmap):
-    def __new__(cls, mapname=None, null=None, dtype=numpy.double):
+    def __new__(cls, mapname=None, null=None, dtype=numpy.double,
+                backend='bin'):
         """Define new numpy array
 
         :param cls:
         :param dtype: data type (default: numpy.double)
+        :param str backend: 'bin' to exchange data through r.out.bin and
+                            r.in.bin, 'lib' to read and write the rows in
+                            the current process through the raster library
         """
+        _check_backend(backend)
         reg = gcore.region()
         r = reg['rows']
         c = reg['cols']
         shape = (r, c)
 
+        if backend == 'lib':
+            self = numpy.ndarray.__new__(cls, shape=shape, dtype=dtype)
+            self.fill(0)
+            self.backend = backend
+            self.tempfile = None
+            if mapname:
+                _read_raster_lib(self, mapname, null)
+            return self
+
         tempfile = _tempfile()
         if mapname:
             kind = numpy.dtype(dtype).kind
@@ -176,10 +339,15 @@ class array(numpy.memmap):
             mode='r+',
             shape=shape)
 
+        self.backend = backend
         self.tempfile = tempfile
         self.filename = tempfile.filename
         return self
 
+    def __array_finalize__(self, obj):
+        numpy.memmap.__array_finalize__(self, obj)
+        self.backend = getattr(obj, 'backend', 'bin')
+
     def read(self, mapname, null=None):
         """Read raster map into array
 
@@ -193,6 +361,13 @@ class array(numpy.memmap):
         Instead reading the map after creating the array,
         pass the map name in the array constructor.
         """
+        if self.backend == 'lib':
+            try:
+                _read_raster_lib(self, mapname, null)
+            except OpenError:
+                return 1
+            else:
+                return 0
         if sys.platform == 'win32':
             gcore.warning(_("grass.script.array.read is deprecated and does not"
                             " work on MS Windows, pass raster name in the constructor"))
@@ -253,6 +428,15 @@ class array(numpy.memmap):
         else:
             raise ValueError(_('Invalid kind <%s>') % kind)
 
+        if self.backend == 'lib':
+            try:
+                _write_raster_lib(self, mapname, title=title, null=null,
+                                  overwrite=overwrite)
+            except OpenError:
+                return 1
+            else:
+                return 0
+
         reg = gcore.region()
 
         try:
@@ -281,18 +465,32 @@ class array(numpy.memmap):
 
 
 class array3d(numpy.memmap):
-    def __new__(cls, mapname=None, null=None, dtype=numpy.double):
+    def __new__(cls, mapname=None, null=None, dtype=numpy.double,
+                backend='bin'):
         """Define new 3d numpy array
 
         :param cls:
         :param dtype: data type (default: numpy.double)
+        :param str backend: 'bin' to exchange data through r3.out.bin and
+                            r3.in.bin, 'lib' to read the map in the current
+                            process through the raster3d library
         """
+        _check_backend(backend)
         reg = gcore.region(True)
         r = reg['rows3']
         c = reg['cols3']
         d = reg['depths']
         shape = (d, r, c)
 
+        if backend == 'lib':
+            self = numpy.ndarray.__new__(cls, shape=shape, dtype=dtype)
+            self.fill(0)
+            self.backend = backend
+            self.tempfile = None
+            if mapname:
+                _read_raster3d_lib(self, mapname, null)
+            return self
+
         tempfile = _tempfile()
         if mapname:
             kind = numpy.dtype(dtype).kind
@@ -325,11 +523,16 @@ class array3d(numpy.memmap):
             mode='r+',
             shape=shape)
 
+        self.backend = backend
         self.tempfile = tempfile
         self.filename = tempfile.filename
 
         return self
 
+    def __array_finalize__(self, obj):
+        numpy.memmap.__array_finalize__(self, obj)
+        self.backend = getattr(obj, 'backend', 'bin')
+
     def read(self, mapname, null=None):
         """Read 3D raster map into array
 
@@ -343,6 +546,13 @@ class array3d(numpy.memmap):
         Instead reading the map after creating the array,
         pass the map name in the array constructor.
         """
+        if self.backend == 'lib':
+            try:
+                _read_raster3d_lib(self, mapname, null)
+            except OpenError:
+                return 1
+            else:
+                return 0
         if sys.platform == 'win32':
             gcore.warning(_("grass.script.array3d.read is deprecated and does not"
                             " work on MS Windows, pass 3D raster name in the constructor"))
@@ -400,11 +610,19 @@ class array3d(numpy.memmap):
 
         reg = gcore.region(True)
 
+        # the raster3d library has no row or block writing function, so
+        # in memory arrays are dumped once to a file for r3.in.bin
+        filename = self.filename
+        if self.backend == 'lib' or filename is None:
+            tempfile = _tempfile()
+            filename = tempfile.filename
+            numpy.ascontiguousarray(self).tofile(filename)
+
         try:
             gcore.run_command(
                 'r3.in.bin',
                 flags=flags,
-                input=self.filename,
+                input=filename,
                 output=mapname,
                 bytes=size,
                 null=null,
@@ -20,6 +20,7 @@ for details.
 import re
 import sys
 import string
+import hashlib
 
 if sys.version_info.major == 3:
     unicode = str
@@ -36,7 +37,7 @@ if hasattr(etree, 'ParseError'):
 else:
     ETREE_EXCEPTIONS = (expat.ExpatError)
 
-from .utils import encode, decode, split
+from .utils import encode, decode, split, try_remove, get_cache_dir
 from .core import *
 
 
@@ -460,15 +461,104 @@ def convert_xml_to_utf8(xml_text):
     return xml_text_utf8
 
 
-def get_interface_description(cmd):
+# Interface descriptions already read in this process
+_interface_cache = {}
+
+
+def _grass_version():
+    """Return the content of $GISBASE/etc/VERSIONNUMBER or an empty string"""
+    try:
+        with open(os.path.join(os.getenv('GISBASE', ''), 'etc',
+                               'VERSIONNUMBER')) as version_file:
+            return version_file.read().strip()
+    except (IOError, OSError):
+        return ''
+
+
+def interface_cache_key(cmd):
+    """Return the key identifying the interface description of a command
+
+    The key is built from the path and modification time of the
+    executable, the GRASS version and the language, so it changes
+    whenever the description could change.
+
+    :param cmd: command (name of GRASS module)
+
+    :return: the key as string or None if the command was not found
+    """
+    path = shutil_which(cmd)
+    if not path and sys.platform == 'win32':
+        path = shutil_which(get_real_command(cmd))
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return '|'.join((os.path.realpath(path), repr(stat.st_mtime),
+                     str(stat.st_size), _grass_version(),
+                     os.getenv('LANG', ''), os.getenv('LANGUAGE', ''),
+                     os.getenv('LC_MESSAGES', '')))
+
+
+def get_interface_description(cmd, use_cache=True):
     """Returns the XML description for the GRASS cmd (force text encoding to
     "utf-8").
 
     The DTD must be located in $GISBASE/gui/xml/grass-interface.dtd,
     otherwise the parser will not succeed.
 
+    The descriptions are cached in memory and on disk (see
+    interface_cache_key() and the GRASS_INTERFACE_CACHE variable), so the
+    command is run with --interface-description only once.
+
     :param cmd: command (name of GRASS module)
+    :param bool use_cache: False to always run the command
     """
+    key = interface_cache_key(cmd) if use_cache else None
+    if key is None:
+        return _read_interface_description(cmd)
+
+    desc = _interface_cache.get(key)
+    if desc is not None:
+        return desc
+
+    # the GRASS_INTERFACE_CACHE variable sets the directory of the
+    # on-disk cache, an empty value disables it
+    cache_dir = get_cache_dir('interface_cache', 'GRASS_INTERFACE_CACHE')
+    cache_file = None
+    if cache_dir:
+        cache_file = os.path.join(
+            cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.xml')
+        try:
+            with open(cache_file, 'rb') as xml_file:
+                desc = xml_file.read()
+        except (IOError, OSError):
+            desc = None
+
+    if not desc:
+        desc = _read_interface_description(cmd)
+        if cache_file:
+            # write to a private file first, concurrent processes
+            # must never read a partially written description
+            tmp_file = '%s.%d' % (cache_file, os.getpid())
+            try:
+                if not os.path.isdir(cache_dir):
+                    os.makedirs(cache_dir)
+                with open(tmp_file, 'wb') as xml_file:
+                    xml_file.write(desc)
+                if sys.platform == 'win32' and os.path.exists(cache_file):
+                    os.remove(cache_file)
+                os.rename(tmp_file, cache_file)
+            except (IOError, OSError):
+                try_remove(tmp_file)
+
+    _interface_cache[key] = desc
+    return desc
+
+
+def _read_interface_description(cmd):
+    """Run the command with --interface-description and return the XML"""
     try:
         p = Popen([cmd, '--interface-description'], stdout=PIPE,
                   stderr=PIPE)
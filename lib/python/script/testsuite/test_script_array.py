@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Test of the lib backend of grass.script.array, which reads and writes
+the raster rows through the raster library
+
+@author: GRASS Development Team
+"""
+
+import numpy
+
+from grass.gunittest.case import TestCase
+from grass.gunittest.main import test
+
+import grass.script as gscript
+import grass.script.array as garray
+
+
+class TestArrayLibBackend(TestCase):
+    """Write arrays with the lib backend and read them with both backends"""
+
+    rows = 8
+    cols = 10
+    maps = {'int32': 'test_array_lib_cell',
+            'float32': 'test_array_lib_fcell',
+            'float64': 'test_array_lib_dcell'}
+    null = -9999
+
+    @classmethod
+    def setUpClass(cls):
+        cls.use_temp_region()
+        cls.runModule('g.region', n=cls.rows, s=0, e=cls.cols, w=0, res=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.runModule('g.remove', type='raster', flags='f',
+                      name=list(cls.maps.values()))
+        cls.del_temp_region()
+
+    def create_array(self, dtype):
+        """Return an array of the region filled with test values, the
+        cells of the first column are nulls"""
+        data = garray.array(dtype=dtype, backend='lib')
+        data[...] = (numpy.arange(self.rows * self.cols)
+                     .reshape(self.rows, self.cols) - 20) / 2
+        if data.dtype.kind == 'f':
+            data[:, 0] = numpy.nan
+        else:
+            data[:, 0] = self.null
+        return data
+
+    def assertRoundTrip(self, dtype, datatype):
+        """Write, check the map type and the nulls and read the map back"""
+        name = self.maps[dtype]
+        data = self.create_array(dtype)
+        expected = numpy.where(numpy.isnan(data.astype(numpy.double)),
+                               self.null, data)
+
+        self.assertEqual(data.write(name, null=self.null, overwrite=True), 0)
+        self.assertRasterExists(name)
+        info = gscript.raster_info(name)
+        self.assertEqual(info['datatype'], datatype)
+        univar = gscript.parse_command('r.univar', flags='g', map=name)
+        self.assertEqual(int(univar['null_cells']), self.rows)
+
+        for backend in garray.BACKENDS:
+            result = garray.array(name, null=self.null, dtype=dtype,
+                                  backend=backend)
+            self.assertEqual(result.dtype, numpy.dtype(dtype))
+            self.assertTrue(numpy.array_equal(result, expected),
+                            msg="Backend %s read %s instead of %s"
+                                % (backend, result, expected))
+
+    def test_cell(self):
+        """Test CELL maps written from integer arrays"""
+        self.assertRoundTrip('int32', 'CELL')
+
+    def test_fcell(self):
+        """Test FCELL maps written from 4 byte float arrays"""
+        self.assertRoundTrip('float32', 'FCELL')
+
+    def test_dcell(self):
+        """Test DCELL maps written from 8 byte float arrays"""
+        self.assertRoundTrip('float64', 'DCELL')
+
+    def test_read_nan(self):
+        """Test that the lib backend reads nulls as NaN into float arrays"""
+        name = self.maps['float64']
+        data = self.create_array('float64')
+        self.assertEqual(data.write(name, overwrite=True), 0)
+        result = garray.array(name, null='nan', backend='lib')
+        self.assertTrue(numpy.isnan(result[:, 0]).all())
+        self.assertTrue(numpy.array_equal(result[:, 1:], data[:, 1:]))
+
+
+if __name__ == '__main__':
+    test()
@@ -453,6 +453,28 @@ def set_path(modulename, dirname=None, path='.'):
 
         sys.path.insert(0, path)
 
+def get_cache_dir(name, env=None):
+    """Return the directory of an on-disk cache
+
+    The caches are located in the GRASS configuration directory, that is
+    ``~/.grass7`` or ``%APPDATA%\\GRASS7`` on MS Windows.
+
+    :param str name: name of the cache subdirectory
+    :param str env: name of an environment variable which overrides the
+                    directory, an empty value disables the cache
+
+    :return: the directory or an empty string if the cache is disabled
+    """
+    cache_dir = os.getenv(env) if env else None
+    if cache_dir is None:
+        if sys.platform == 'win32':
+            config_dir = os.path.join(os.getenv('APPDATA', ''), 'GRASS7')
+        else:
+            config_dir = os.path.join(os.path.expanduser('~'), '.grass7')
+        cache_dir = os.path.join(config_dir, name)
+    return cache_dir
+
+
 def clock():
     """
     Return time counter to measure performance for chunks of code.
@@ -7,6 +7,7 @@ from .metadata import *
 from .abstract_dataset import *
 from .abstract_map_dataset import *
 from .abstract_space_time_dataset import *
+from .map_table import *
 from .space_time_datasets import *
 from .datetime_math import *
 from .open_stds import *
@@ -391,24 +391,79 @@ class AbstractDataset(SpatialTopologyDatasetConnector,
 
         dbif, connected = init_dbif(dbif)
 
-        # Build the INSERT SQL statement
-        statement = self.base.get_insert_statement_mogrified(dbif)
-        statement += self.temporal_extent.get_insert_statement_mogrified(dbif)
-        statement += self.spatial_extent.get_insert_statement_mogrified(dbif)
-        statement += self.metadata.get_insert_statement_mogrified(dbif)
-        if self.is_stds() is False:
-            statement += self.stds_register.get_insert_statement_mogrified(dbif)
+        statements = self.get_insert_statements()
 
         if execute:
-            dbif.execute_transaction(statement)
+            dbif.executemany_transaction(statements, mapset=self.get_mapset())
             if connected:
                 dbif.close()
             return ""
 
+        # Build the INSERT SQL statement
+        statement = self._mogrify_statements(dbif, statements)
+
         if connected:
             dbif.close()
         return statement
 
+    def get_insert_statements(self):
+        """Return the INSERT statements of this dataset with arguments
+
+           The statements can be executed with
+           SQLDatabaseInterfaceConnection.executemany_transaction(), the
+           order is base, temporal extent, spatial extent, metadata and
+           the space time dataset register for maps.
+
+           :return: A list of (sql, args) tuples
+        """
+        statements = [self.base.get_insert_statement(),
+                      self.temporal_extent.get_insert_statement(),
+                      self.spatial_extent.get_insert_statement(),
+                      self.metadata.get_insert_statement()]
+        if self.is_stds() is False:
+            statements.append(self.stds_register.get_insert_statement())
+
+        return statements
+
+    def get_update_statements(self, ident=None):
+        """Return the UPDATE statements of this dataset with arguments,
+           excluding None variables
+
+           :param ident: The identifier to be updated, useful for renaming
+           :return: A list of (sql, args) tuples
+        """
+        statements = [self.base.get_update_statement(ident),
+                      self.temporal_extent.get_update_statement(ident),
+                      self.spatial_extent.get_update_statement(ident),
+                      self.metadata.get_update_statement(ident)]
+        if self.is_stds() is False:
+            statements.append(self.stds_register.get_update_statement(ident))
+
+        return statements
+
+    def get_update_all_statements(self, ident=None):
+        """Return the UPDATE statements of this dataset with arguments,
+           including None variables
+
+           :param ident: The identifier to be updated, useful for renaming
+           :return: A list of (sql, args) tuples
+        """
+        statements = [self.base.get_update_all_statement(ident),
+                      self.temporal_extent.get_update_all_statement(ident),
+                      self.spatial_extent.get_update_all_statement(ident),
+                      self.metadata.get_update_all_statement(ident)]
+        if self.is_stds() is False:
+            statements.append(
+                self.stds_register.get_update_all_statement(ident))
+
+        return statements
+
+    def _mogrify_statements(self, dbif, statements):
+        """Return a list of (sql, args) tuples as executable SQL string"""
+        return "".join(dbif.mogrify_sql_statement(statement,
+                                                  mapset=self.get_mapset())
+                       for statement in statements)
+
     def update(self, dbif=None, execute=True, ident=None):
         """Update the dataset entry in the database from the internal structure
            excluding None variables
@@ -431,23 +486,17 @@ class AbstractDataset(SpatialTopologyDatasetConnector,
 
         dbif, connected = init_dbif(dbif)
 
-        # Build the UPDATE SQL statement
-        statement = self.base.get_update_statement_mogrified(dbif, ident)
-        statement += self.temporal_extent.get_update_statement_mogrified(dbif,
-                                                                         ident)
-        statement += self.spatial_extent.get_update_statement_mogrified(dbif,
-                                                                        ident)
-        statement += self.metadata.get_update_statement_mogrified(dbif, ident)
-
-        if self.is_stds() is False:
-            statement += self.stds_register.get_update_statement_mogrified(dbif, ident)
+        statements = self.get_update_statements(ident)
 
         if execute:
-            dbif.execute_transaction(statement)
+            dbif.executemany_transaction(statements, mapset=self.get_mapset())
             if connected:
                 dbif.close()
             return ""
 
+        # Build the UPDATE SQL statement
+        statement = self._mogrify_statements(dbif, statements)
+
         if connected:
             dbif.close()
         return statement
@@ -474,24 +523,17 @@ class AbstractDataset(SpatialTopologyDatasetConnector,
 
         dbif, connected = init_dbif(dbif)
 
-        # Build the UPDATE SQL statement
-        statement = self.base.get_update_all_statement_mogrified(dbif, ident)
-        statement += self.temporal_extent.get_update_all_statement_mogrified(dbif,
-                                                                             ident)
-        statement += self.spatial_extent.get_update_all_statement_mogrified(dbif,
-                                                                            ident)
-        statement += self.metadata.get_update_all_statement_mogrified(dbif,
-                                                                      ident)
-
-        if self.is_stds() is False:
-            statement += self.stds_register.get_update_all_statement_mogrified(dbif, ident)
+        statements = self.get_update_all_statements(ident)
 
         if execute:
-            dbif.execute_transaction(statement)
+            dbif.executemany_transaction(statements, mapset=self.get_mapset())
             if connected:
                 dbif.close()
             return ""
 
+        # Build the UPDATE SQL statement
+        statement = self._mogrify_statements(dbif, statements)
+
         if connected:
             dbif.close()
         return statement
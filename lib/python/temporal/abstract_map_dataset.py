@@ -93,11 +93,15 @@ class AbstractMapDataset(AbstractDataset):
         """
 
     @abstractmethod
-    def read_timestamp_from_grass(self):
+    def read_timestamp_from_grass(self, metadata=None):
         """Read the timestamp of this map from the map metadata
            in the grass file system based spatial database and
            set the internal time stamp that should be insert/updated
            in the temporal database.
+
+           :param metadata: The map metadata as returned by
+                            read_metadata_from_grass(), if None
+                            the timestamp is read from the spatial database
         """
 
     @abstractmethod
@@ -114,9 +118,32 @@ class AbstractMapDataset(AbstractDataset):
         """
 
     @abstractmethod
-    def load(self):
+    def load(self, metadata=None):
         """Load the content of this object from the grass
-           file system based database"""
+           file system based database
+
+           :param metadata: The map metadata as returned by
+                            read_metadata_from_grass(), if None
+                            the metadata is read from the spatial database
+        """
+
+    def read_metadata_from_grass(self, timestamps=True):
+        """Read the existence, the metadata and the timestamp of this map
+           from the grass file system based database with a minimum of
+           round trips to the C-library server
+
+           Use CLibrariesInterface.read_maps_metadata() directly to read the
+           metadata of many maps at once.
+
+           :param timestamps: Set False to skip the reading of the timestamp
+           :return: The metadata dictionary as described in
+                    CLibrariesInterface.read_maps_metadata()
+        """
+        return self.ciface.read_maps_metadata(self.get_type(),
+                                              [(self.get_name(),
+                                                self.get_mapset(),
+                                                self.get_layer())],
+                                              timestamps)[0]
 
     def _convert_timestamp(self):
         """Convert the valid time into a grass datetime library
@@ -1054,7 +1081,7 @@ class AbstractMapDataset(AbstractDataset):
 
         return statement
 
-    def read_band_reference_from_grass(self):
+    def read_band_reference_from_grass(self, metadata=None):
         """Read the band identifier of this map from the map metadata
            in the GRASS file system based spatial database and
            set the internal band identifier that should be insert/updated
@@ -1062,6 +1089,9 @@ class AbstractMapDataset(AbstractDataset):
 
            Currently only implemented in RasterDataset. Otherwise
            silently pass.
+
+           :param metadata: The map metadata as returned by
+                            read_metadata_from_grass()
         """
         pass
 
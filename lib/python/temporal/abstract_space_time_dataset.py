@@ -26,6 +26,7 @@ from .spatio_temporal_relationships import count_temporal_topology_relationships
     print_spatio_temporal_topology_relationships, SpatioTemporalTopologyBuilder, \
     create_temporal_relation_sql_where_statement
 from .datetime_math import increment_datetime_by_string, string_to_datetime
+from .map_table import MapTable
 
 ###############################################################################
 
@@ -1397,31 +1398,27 @@ class AbstractSpaceTimeDataset(AbstractDataset):
 
         return obj_list
 
-    def get_registered_maps_as_objects(self, where=None, order="start_time",
-                                       dbif=None):
-        """Return all or a subset of the registered maps as ordered object
-           list for spatio-temporal topological operations that require the
-           spatio-temporal extent only
+    def get_registered_maps_as_table(self, where=None, order="start_time",
+                                     dbif=None):
+        """Return all or a subset of the registered maps as columnar
+           map table
 
-           The objects are initialized with their id's' and the spatio-temporal
-           extent (temporal type, start time, end time, west, east, south,
-           north, bottom and top).
-           In case more map information are needed, use the select()
-           method for each listed object.
+           The table stores the ids and the spatio-temporal extent of the
+           maps in flat arrays. Map objects are only created when requested
+           from the table, which keeps the memory footprint of large space
+           time datasets small.
 
            :param where: The SQL where statement to select a subset of
                          the registered maps without "WHERE"
            :param order: The SQL order statement to be used to order the
-                         objects in the list without "ORDER BY"
+                         maps in the table without "ORDER BY"
            :param dbif: The database interface to be used
-           :return: The ordered map object list,
-                   In case nothing found None is returned
+           :return: The MapTable object, it is empty in case nothing was
+                    found
         """
 
         dbif, connected = init_dbif(dbif)
 
-        obj_list = []
-
         # Older temporal databases have no bottom and top columns
         # in their views so we need a work around to set the full
         # spatial extent as well
@@ -1442,28 +1439,47 @@ class AbstractSpaceTimeDataset(AbstractDataset):
             columns = "id,start_time,end_time, west,east,south,north"
 
         rows = self.get_registered_maps(columns, where, order, dbif)
+        table = MapTable.from_rows(self, rows, has_bt_columns)
 
-        if rows is not None:
-            for row in rows:
-                map = self.get_new_map_instance(row["id"])
-                if self.is_time_absolute():
-                    map.set_absolute_time(row["start_time"], row["end_time"])
-                elif self.is_time_relative():
-                    map.set_relative_time(row["start_time"], row["end_time"],
-                                          self.get_relative_time_unit())
-                # The fast way
-                if has_bt_columns:
-                    map.set_spatial_extent_from_values(west=row["west"],
-                                                       east=row["east"],
-                                                       south=row["south"],
-                                                       top=row["top"],
-                                                       north=row["north"],
-                                                       bottom=row["bottom"])
-                # The slow work around
-                else:
-                    map.spatial_extent.select(dbif)
+        if connected:
+            dbif.close()
+
+        return table
+
+    def get_registered_maps_as_objects(self, where=None, order="start_time",
+                                       dbif=None):
+        """Return all or a subset of the registered maps as ordered object
+           list for spatio-temporal topological operations that require the
+           spatio-temporal extent only
+
+           The objects are initialized with their id's' and the spatio-temporal
+           extent (temporal type, start time, end time, west, east, south,
+           north, bottom and top).
+           In case more map information are needed, use the select()
+           method for each listed object.
+
+           Use get_registered_maps_as_table() for large space time datasets
+           to avoid the creation of all map objects.
+
+           :param where: The SQL where statement to select a subset of
+                         the registered maps without "WHERE"
+           :param order: The SQL order statement to be used to order the
+                         objects in the list without "ORDER BY"
+           :param dbif: The database interface to be used
+           :return: The ordered map object list,
+                   In case nothing found None is returned
+        """
 
-                obj_list.append(copy.copy(map))
+        dbif, connected = init_dbif(dbif)
+
+        table = self.get_registered_maps_as_table(where, order, dbif)
+        obj_list = table.to_objects()
+
+        # The slow work around for temporal databases without
+        # bottom and top columns
+        if not table.has_vertical_extent:
+            for map in obj_list:
+                map.spatial_extent.select(dbif)
 
         if connected:
             dbif.close()
@@ -2277,6 +2293,158 @@ class AbstractSpaceTimeDataset(AbstractDataset):
 
         return True
 
+    def register_maps(self, maps, dbif=None):
+        """Register a list of maps in the space time dataset in a single
+           transaction.
+
+           This is the bulk version of register_map(). The registered maps
+           are selected with a single query and the SQL statements of all
+           maps are executed as prepared statements in a single transaction.
+           Maps that are already registered are skipped with a warning.
+
+           The map objects must be inserted in the temporal database and
+           their content must be up to date, they are not selected from the
+           temporal database again. The extent of the space time dataset
+           is not updated, call update_from_registered_maps() once after
+           the registration.
+
+           This method raises a FatalError exception in case of a fatal error
+
+           :param maps: A list of AbstractMapDataset objects that should be
+                        registered
+           :param dbif: The database interface to be used
+           :return: The number of registered maps
+        """
+
+        if get_enable_mapset_check() is True and \
+           self.get_mapset() != get_current_mapset():
+            self.msgr.fatal(_("Unable to register map in dataset <%(ds)s> of "
+                              "type %(type)s. The mapset of the dataset does "
+                              "not match the current mapset") %
+                            {"ds": self.get_id(), "type": self.get_type()})
+
+        if not maps:
+            return 0
+
+        dbif, connected = init_dbif(dbif)
+
+        stds_id = self.base.get_id()
+        stds_mapset = self.base.get_mapset()
+        stds_register_table = self.get_map_register()
+        stds_ttype = self.get_temporal_type()
+
+        # Select all registered maps at once
+        registered = set()
+        if stds_register_table is not None:
+            dbif.execute("SELECT id FROM " + stds_register_table,
+                         mapset=stds_mapset)
+            rows = dbif.fetchall(mapset=stds_mapset)
+            if rows:
+                registered = set(row[0] for row in rows)
+
+        # All maps share the same statements, so that they can be executed
+        # with executemany()
+        stds_register_sql = "UPDATE " + \
+            maps[0].stds_register.get_table_name() + \
+            " SET registered_stds = ? WHERE id = ?;\n"
+        register_sql = "INSERT INTO " + stds_register_table + \
+            " (id) VALUES (?);\n"
+        if dbif.get_dbmi().paramstyle != "qmark":
+            stds_register_sql = stds_register_sql.replace("?", "%s")
+            register_sql = register_sql.replace("?", "%s")
+
+        statements = []
+        stds_register_statements = []
+        register_statements = []
+
+        for map in maps:
+            map_id = map.base.get_id()
+
+            if not map.check_for_correct_time():
+                if map.get_layer():
+                    self.msgr.fatal(_("Map <%(id)s> with layer %(l)s has "
+                                      "invalid time") % {'id': map.get_map_id(),
+                                                         'l': map.get_layer()})
+                else:
+                    self.msgr.fatal(_("Map <%s> has invalid time") %
+                                    (map.get_map_id()))
+
+            if stds_ttype != map.get_temporal_type():
+                self.msgr.fatal(_("Temporal type of space time dataset "
+                                  "<%(id)s> and map <%(map)s> are different")
+                                % {'id': self.get_id(),
+                                   'map': map.get_map_id()})
+
+            map_rel_time_unit = map.get_relative_time_unit()
+
+            # In case no map has been registered yet, set the
+            # relative time unit from the first map
+            if (self.metadata.get_number_of_maps() is None or
+                self.metadata.get_number_of_maps() == 0) and \
+               self.map_counter == 0 and not registered and \
+               self.is_time_relative():
+
+                self.set_relative_time_unit(map_rel_time_unit)
+                statements.append(
+                    self.relative_time.get_update_all_statement())
+
+                self.msgr.debug(1, _("Set temporal unit for space time %s "
+                                     "dataset <%s> to %s") % (map.get_type(),
+                                                              self.get_id(),
+                                                              map_rel_time_unit))
+
+            # Check the relative time unit
+            if self.is_time_relative() and \
+               (self.get_relative_time_unit() != map_rel_time_unit):
+                self.msgr.fatal(_("Relative time units of space time dataset "
+                                  "<%(id)s> and map <%(map)s> are different") %
+                                {'id': self.get_id(), 'map': map.get_map_id()})
+
+            if get_enable_mapset_check() is True and \
+               stds_mapset != map.base.get_mapset():
+                dbif.close()
+                self.msgr.fatal(_("Only maps from the same mapset can be "
+                                  "registered"))
+
+            if map_id in registered:
+                if map.get_layer() is not None:
+                    self.msgr.warning(_("Map <%(map)s> with layer %(l)s is "
+                                        "already registered.") % {
+                                      'map': map.get_map_id(),
+                                      'l': map.get_layer()})
+                else:
+                    self.msgr.warning(_("Map <%s> is already registered.") %
+                                      (map.get_map_id()))
+                continue
+            registered.add(map_id)
+
+            # Register the stds in the map stds register table column
+            datasets = map.stds_register.get_registered_stds()
+            if datasets:
+                datasets = datasets.split(",")
+            else:
+                datasets = []
+            if stds_id not in datasets:
+                datasets.append(stds_id)
+                map.stds_register.set_registered_stds(",".join(datasets))
+                stds_register_statements.append(
+                    (stds_register_sql, (",".join(datasets), map_id)))
+
+            register_statements.append((register_sql, (map_id,)))
+
+        statements += stds_register_statements
+        statements += register_statements
+
+        if statements:
+            dbif.executemany_transaction(statements, mapset=stds_mapset)
+
+        if connected:
+            dbif.close()
+
+        self.map_counter += len(register_statements)
+
+        return len(register_statements)
+
     def unregister_map(self, map, dbif=None, execute=True):
         """Unregister a map from the space time dataset.
 
@@ -229,7 +229,7 @@ def aggregate_by_topology(granularity_list, granularity, map_list, topo_list,
     topo_builder.build(mapsA=granularity_list, mapsB=map_list, spatial=spatial)
 
     # The module queue for parallel execution
-    process_queue = pymod.ParallelModuleQueue(int(nprocs))
+    process_queue = pymod.ParallelModuleQueue(int(nprocs), pool=True)
 
     # Dummy process object that will be deep copied
     # and be put into the process queue
@@ -37,7 +37,7 @@ class DictSQLSerializer(object):
         self.D = {}
         self.dbmi_paramstyle = get_tgis_dbmi_paramstyle()
 
-    def serialize(self, type, table, where=None):
+    def serialize(self, type, table, where=None, where_args=None):
         """Convert the internal dictionary into a string of semicolon
             separated SQL statements The keys are the column names and
             the values are the row entries
@@ -66,6 +66,8 @@ class DictSQLSerializer(object):
                 :param type: must be SELECT. INSERT, UPDATE
                 :param table: The name of the table to select, insert or update
                 :param where: The optional where statement
+                :param where_args: The optional arguments of the place holders
+                                   in the where statement
                 :return: a tuple containing the SQL string and the arguments
 
         """
@@ -168,6 +170,9 @@ class DictSQLSerializer(object):
                 sql += where
             sql += ";\n"
 
+        if where and where_args:
+            args.extend(where_args)
+
         return sql, tuple(args)
 
     def deserialize(self, row):
@@ -221,7 +226,7 @@ class SQLDatabaseInterface(DictSQLSerializer):
             >>> t.get_is_in_db_statement()
             "SELECT id FROM raster WHERE id = 'soil@PERMANENT';\\n"
             >>> t.get_select_statement()
-            ("SELECT  creation_time  , mapset  , name  , creator  FROM raster WHERE id = 'soil@PERMANENT';\\n", ())
+            ('SELECT  creation_time  , mapset  , name  , creator  FROM raster WHERE id = ?;\\n', ('soil@PERMANENT',))
             >>> t.get_select_statement_mogrified()
             "SELECT  creation_time  , mapset  , name  , creator  FROM raster WHERE id = 'soil@PERMANENT';\\n"
             >>> t.get_insert_statement()
@@ -229,11 +234,11 @@ class SQLDatabaseInterface(DictSQLSerializer):
             >>> t.get_insert_statement_mogrified()
             "INSERT INTO raster ( creation_time  ,mapset  ,name  ,creator ) VALUES ('2001-01-01 00:00:00' ,'PERMANENT' ,'soil' ,'soeren') ;\\n"
             >>> t.get_update_statement()
-            ("UPDATE raster SET  creation_time = ?  ,mapset = ?  ,name = ?  ,creator = ? WHERE id = 'soil@PERMANENT';\\n", (datetime.datetime(2001, 1, 1, 0, 0), 'PERMANENT', 'soil', 'soeren'))
+            ('UPDATE raster SET  creation_time = ?  ,mapset = ?  ,name = ?  ,creator = ? WHERE id = ?;\\n', (datetime.datetime(2001, 1, 1, 0, 0), 'PERMANENT', 'soil', 'soeren', 'soil@PERMANENT'))
             >>> t.get_update_statement_mogrified()
             "UPDATE raster SET  creation_time = '2001-01-01 00:00:00'  ,mapset = 'PERMANENT'  ,name = 'soil'  ,creator = 'soeren' WHERE id = 'soil@PERMANENT';\\n"
             >>> t.get_update_all_statement()
-            ("UPDATE raster SET  creation_time = ?  ,mapset = ?  ,name = ?  ,creator = ? WHERE id = 'soil@PERMANENT';\\n", (datetime.datetime(2001, 1, 1, 0, 0), 'PERMANENT', 'soil', 'soeren'))
+            ('UPDATE raster SET  creation_time = ?  ,mapset = ?  ,name = ?  ,creator = ? WHERE id = ?;\\n', (datetime.datetime(2001, 1, 1, 0, 0), 'PERMANENT', 'soil', 'soeren', 'soil@PERMANENT'))
             >>> t.get_update_all_statement_mogrified()
             "UPDATE raster SET  creation_time = '2001-01-01 00:00:00'  ,mapset = 'PERMANENT'  ,name = 'soil'  ,creator = 'soeren' WHERE id = 'soil@PERMANENT';\\n"
 
@@ -263,6 +268,16 @@ class SQLDatabaseInterface(DictSQLSerializer):
            """
         return self.table
 
+    def get_where_id(self):
+        """Return the WHERE statement that selects an entry by its id
+           with a DBMI specific place holder, so that statements of
+           different objects share the same SQL string
+           :return: The WHERE string
+        """
+        if self.dbmi_paramstyle == "qmark":
+            return "WHERE id = ?"
+        return "WHERE id = %s"
+
     def get_delete_statement(self):
         """Return the delete string
            :return: The DELETE string
@@ -304,15 +319,17 @@ class SQLDatabaseInterface(DictSQLSerializer):
                     False otherwise
         """
 
-        sql = self.get_is_in_db_statement()
+        sql = "SELECT id FROM " + self.get_table_name() + " " + \
+              self.get_where_id() + ";\n"
+        args = (str(self.ident),)
 
         if dbif:
-            dbif.execute(sql, mapset=self.mapset)
+            dbif.execute(sql, args, mapset=self.mapset)
             row = dbif.fetchone(mapset=self.mapset)
         else:
             dbif = SQLDatabaseInterfaceConnection()
             dbif.connect()
-            dbif.execute(sql, mapset=self.mapset)
+            dbif.execute(sql, args, mapset=self.mapset)
             row = dbif.fetchone(mapset=self.mapset)
             dbif.close()
 
@@ -328,7 +345,7 @@ class SQLDatabaseInterface(DictSQLSerializer):
            :return: The SELECT string
         """
         return self.serialize("SELECT", self.get_table_name(),
-                              "WHERE id = \'" + str(self.ident) + "\'")
+                              self.get_where_id(), (str(self.ident),))
 
     def get_select_statement_mogrified(self, dbif=None):
         """Return the select statement as mogrified string
@@ -429,10 +446,10 @@ class SQLDatabaseInterface(DictSQLSerializer):
            """
         if ident:
             return self.serialize("UPDATE", self.get_table_name(),
-                                  "WHERE id = \'" + str(ident) + "\'")
+                                  self.get_where_id(), (str(ident),))
         else:
             return self.serialize("UPDATE", self.get_table_name(),
-                                  "WHERE id = \'" + str(self.ident) + "\'")
+                                  self.get_where_id(), (str(self.ident),))
 
     def get_update_statement_mogrified(self, dbif=None, ident=None):
         """Return the update statement as mogrified string
@@ -482,10 +499,10 @@ class SQLDatabaseInterface(DictSQLSerializer):
            """
         if ident:
             return self.serialize("UPDATE ALL", self.get_table_name(),
-                                  "WHERE id = \'" + str(ident) + "\'")
+                                  self.get_where_id(), (str(ident),))
         else:
             return self.serialize("UPDATE ALL", self.get_table_name(),
-                                  "WHERE id = \'" + str(self.ident) + "\'")
+                                  self.get_where_id(), (str(self.ident),))
 
     def get_update_all_statement_mogrified(self, dbif=None, ident=None):
         """Return the update all statement as mogrified string
@@ -52,12 +52,23 @@ class RPCDefs(object):
     WRITE_BAND_REFERENCE = 15
     READ_BAND_REFERENCE = 16
     REMOVE_BAND_REFERENCE = 17
+    BATCH = 18
     G_FATAL_ERROR = 49
 
     TYPE_RASTER = 0
     TYPE_RASTER3D = 1
     TYPE_VECTOR = 2
 
+    # Requests that only read from the spatial database, they can be
+    # distributed over several server processes
+    READ_REQUESTS = (HAS_TIMESTAMP, READ_TIMESTAMP, READ_MAP_INFO,
+                     MAP_EXISTS, READ_MAP_FULL_INFO, READ_BAND_REFERENCE)
+
+    # Map the dataset type names to the type identifier
+    MAP_TYPES = {"raster": TYPE_RASTER,
+                 "raster3d": TYPE_RASTER3D,
+                 "vector": TYPE_VECTOR}
+
 ###############################################################################
 
 
@@ -1038,6 +1049,54 @@ def _stop(lock, conn, data):
 ###############################################################################
 
 
+class _BatchCollector(object):
+    """Pipe replacement that collects the results of batched requests
+
+       The server functions send their result with conn.send(), this object
+       stores the result instead of sending it, so that all results of a
+       batch can be send as a single list.
+    """
+    def __init__(self):
+        self.results = []
+
+    def send(self, data):
+        self.results.append(data)
+
+
+def _run_batch(functions, lock, conn, data):
+    """Run a list of requests and send all results in a single message
+
+       The lock is acquired once for the whole batch by the server loop.
+       Python exceptions raised by a single request are stored as result of
+       this request, so that the remaining requests are still processed.
+       A G_fatal_error() will call the error handler of the server that
+       sends a FatalError to the client, as for single requests.
+
+       :param functions: The server function array
+       :param lock: A multiprocessing.Lock instance
+       :param conn: A multiprocessing.Pipe instance used to send the results
+       :param data: The list of data entries [function_id, requests] with
+                    requests a list of request data lists
+    """
+    collector = _BatchCollector()
+    try:
+        for request in data[1]:
+            if request[0] in (RPCDefs.STOP, RPCDefs.BATCH):
+                collector.send(None)
+                continue
+            count = len(collector.results)
+            try:
+                functions[request[0]](lock, collector, request)
+            except Exception as e:
+                # Most functions send their result in a finally block,
+                # replace it with the exception
+                collector.results[count:] = [e]
+    finally:
+        conn.send(collector.results)
+
+###############################################################################
+
+
 def c_library_server(lock, conn):
     """The GRASS C-libraries server function designed to be a target for
        multiprocessing.Process
@@ -1093,7 +1152,10 @@ def c_library_server(lock, conn):
         conn.poll(None)
         data = conn.recv()
         lock.acquire()
-        functions[data[0]](lock, conn, data)
+        if data[0] == RPCDefs.BATCH:
+            _run_batch(functions, lock, conn, data)
+        else:
+            functions[data[0]](lock, conn, data)
         lock.release()
 
 class CLibrariesInterface(RPCServerBase):
@@ -1109,6 +1171,14 @@ class CLibrariesInterface(RPCServerBase):
        In this case the CLibrariesInterface object will simply start a
        new subprocess and restarts the pipeline.
 
+       Several server processes can be started with the nprocs
+       argument. Read only requests like map existence checks, map info
+       and timestamp reading are distributed over all processes, batched
+       read requests are split and processed in parallel. All requests that
+       modify the spatial database are send to the first process. Each
+       process has its own checker thread that restarts it in case
+       it was killed.
+
 
        Usage:
 
@@ -1241,6 +1311,32 @@ class CLibrariesInterface(RPCServerBase):
            >>> ciface.has_vector_timestamp("test", tgis.get_current_mapset())
            True
 
+           # Batched requests
+           >>> mapset = tgis.get_current_mapset()
+           >>> ciface.execute_batch([[tgis.RPCDefs.MAP_EXISTS,
+           ...                        tgis.RPCDefs.TYPE_RASTER, "test", mapset],
+           ...                       [tgis.RPCDefs.MAP_EXISTS,
+           ...                        tgis.RPCDefs.TYPE_RASTER, "nomap", mapset]])
+           [True, False]
+           >>> md = ciface.read_maps_metadata("vector", [("test", mapset, None),
+           ...                                           ("nomap", mapset, None)])
+           >>> md[0]["exists"], md[0]["has_timestamp"], md[1]["exists"]
+           (True, True, False)
+           >>> md[0]["info"]["points"]
+           10
+           >>> check, dates = md[0]["timestamp"]
+           >>> print str(dates[0])
+           1999-01-13 14:30:05
+
+           # Several server processes
+           >>> pool = tgis.CLibrariesInterface(nprocs=3)
+           >>> len(pool.workers)
+           3
+           >>> md = pool.read_maps_metadata("raster", [("test", mapset, None)] * 5)
+           >>> [entry["exists"] for entry in md]
+           [True, True, True, True, True]
+           >>> pool.stop()
+
            >>> ciface.get_driver_name()
            'sqlite'
            >>> ciface.get_database_name().split("/")[-1]
@@ -1275,8 +1371,29 @@ class CLibrariesInterface(RPCServerBase):
            >>> gscript.del_temp_region()
 
     """
-    def __init__(self):
+    def __init__(self, nprocs=1):
         RPCServerBase.__init__(self)
+        self.nprocs = max(1, int(nprocs))
+        # This object is the writer and the first reader, the additional
+        # readers are single process interfaces with their own checker thread
+        self.workers = [self]
+        for i in range(self.nprocs - 1):
+            self.workers.append(CLibrariesInterface())
+        self._next_reader = 0
+
+    def _get_reader(self):
+        """Return the next server interface for read only requests in round
+           robin order
+        """
+        worker = self.workers[self._next_reader]
+        self._next_reader = (self._next_reader + 1) % len(self.workers)
+        return worker
+
+    def stop(self):
+        """Stop all server processes and their checker threads"""
+        for worker in self.workers[1:]:
+            worker.stop()
+        RPCServerBase.stop(self)
 
     def start_server(self):
         self.client_conn, self.server_conn = Pipe(True)
@@ -1293,10 +1410,11 @@ class CLibrariesInterface(RPCServerBase):
            :param mapset: The mapset of the map
            :returns: True if exists, False if not
        """
-        self.check_server()
-        self.client_conn.send([RPCDefs.MAP_EXISTS, RPCDefs.TYPE_RASTER,
-                               name, mapset, None])
-        return self.safe_receive("raster_map_exists")
+        worker = self._get_reader()
+        worker.check_server()
+        worker.client_conn.send([RPCDefs.MAP_EXISTS, RPCDefs.TYPE_RASTER,
+                                 name, mapset, None])
+        return worker.safe_receive("raster_map_exists")
 
     def read_raster_info(self, name, mapset):
         """Read the raster map info from the file system and store the content
@@ -1307,10 +1425,11 @@ class CLibrariesInterface(RPCServerBase):
            :returns: The key value pairs of the map specific metadata,
                      or None in case of an error
         """
-        self.check_server()
-        self.client_conn.send([RPCDefs.READ_MAP_INFO, RPCDefs.TYPE_RASTER,
-                               name, mapset, None])
-        return self.safe_receive("read_raster_info")
+        worker = self._get_reader()
+        worker.check_server()
+        worker.client_conn.send([RPCDefs.READ_MAP_INFO, RPCDefs.TYPE_RASTER,
+                                 name, mapset, None])
+        return worker.safe_receive("read_raster_info")
 
     def read_raster_full_info(self, name, mapset):
         """Read raster info, history and cats using PyGRASS RasterRow
@@ -1322,11 +1441,12 @@ class CLibrariesInterface(RPCServerBase):
            :returns: The key value pairs of the map specific metadata,
                      or None in case of an error
         """
-        self.check_server()
-        self.client_conn.send([RPCDefs.READ_MAP_FULL_INFO,
-                               RPCDefs.TYPE_RASTER,
-                               name, mapset, None])
-        return self.safe_receive("read_raster_full_info")
+        worker = self._get_reader()
+        worker.check_server()
+        worker.client_conn.send([RPCDefs.READ_MAP_FULL_INFO,
+                                 RPCDefs.TYPE_RASTER,
+                                 name, mapset, None])
+        return worker.safe_receive("read_raster_full_info")
 
     def has_raster_timestamp(self, name, mapset):
         """Check if a file based raster timestamp exists
@@ -1335,10 +1455,11 @@ class CLibrariesInterface(RPCServerBase):
            :param mapset: The mapset of the map
            :returns: True if exists, False if not
        """
-        self.check_server()
-        self.client_conn.send([RPCDefs.HAS_TIMESTAMP, RPCDefs.TYPE_RASTER,
-                               name, mapset, None])
-        return self.safe_receive("has_raster_timestamp")
+        worker = self._get_reader()
+        worker.check_server()
+        worker.client_conn.send([RPCDefs.HAS_TIMESTAMP, RPCDefs.TYPE_RASTER,
+                                 name, mapset, None])
+        return worker.safe_receive("has_raster_timestamp")
 
     def remove_raster_timestamp(self, name, mapset):
         """Remove a file based raster timestamp
@@ -1372,10 +1493,11 @@ class CLibrariesInterface(RPCServerBase):
            :param mapset: The mapset of the map
            :returns: The return value of G_read_raster_timestamp
        """
-        self.check_server()
-        self.client_conn.send([RPCDefs.READ_TIMESTAMP, RPCDefs.TYPE_RASTER,
-                               name, mapset, None])
-        return self.safe_receive("read_raster_timestamp")
+        worker = self._get_reader()
+        worker.check_server()
+        worker.client_conn.send([RPCDefs.READ_TIMESTAMP, RPCDefs.TYPE_RASTER,
+                                 name, mapset, None])
+        return worker.safe_receive("read_raster_timestamp")
 
     def write_raster_timestamp(self, name, mapset, timestring):
         """Write a file based raster timestamp
@@ -1421,10 +1543,11 @@ class CLibrariesInterface(RPCServerBase):
            :param mapset: The mapset of the map
            :returns: The return value of Rast_read_band_reference
         """
-        self.check_server()
-        self.client_conn.send([RPCDefs.READ_BAND_REFERENCE, RPCDefs.TYPE_RASTER,
-                               name, mapset, None])
-        return self.safe_receive("read_raster_band_reference")
+        worker = self._get_reader()
+        worker.check_server()
+        worker.client_conn.send([RPCDefs.READ_BAND_REFERENCE, RPCDefs.TYPE_RASTER,
+                                 name, mapset, None])
+        return worker.safe_receive("read_raster_band_reference")
 
     def write_raster_band_reference(self, name, mapset, band_reference):
         """Write a file based raster band reference
@@ -1452,10 +1575,11 @@ class CLibrariesInterface(RPCServerBase):
            :param mapset: The mapset of the map
            :returns: True if exists, False if not
        """
-        self.check_server()
-        self.client_conn.send([RPCDefs.MAP_EXISTS, RPCDefs.TYPE_RASTER3D,
-                               name, mapset, None])
-        return self.safe_receive("raster3d_map_exists")
+        worker = self._get_reader()
+        worker.check_server()
+        worker.client_conn.send([RPCDefs.MAP_EXISTS, RPCDefs.TYPE_RASTER3D,
+                                 name, mapset, None])
+        return worker.safe_receive("raster3d_map_exists")
 
     def read_raster3d_info(self, name, mapset):
         """Read the 3D raster map info from the file system and store the content
@@ -1466,10 +1590,11 @@ class CLibrariesInterface(RPCServerBase):
            :returns: The key value pairs of the map specific metadata,
                      or None in case of an error
         """
-        self.check_server()
-        self.client_conn.send([RPCDefs.READ_MAP_INFO, RPCDefs.TYPE_RASTER3D,
-                               name, mapset, None])
-        return self.safe_receive("read_raster3d_info")
+        worker = self._get_reader()
+        worker.check_server()
+        worker.client_conn.send([RPCDefs.READ_MAP_INFO, RPCDefs.TYPE_RASTER3D,
+                                 name, mapset, None])
+        return worker.safe_receive("read_raster3d_info")
 
     def has_raster3d_timestamp(self, name, mapset):
         """Check if a file based 3D raster timestamp exists
@@ -1478,10 +1603,11 @@ class CLibrariesInterface(RPCServerBase):
            :param mapset: The mapset of the map
            :returns: True if exists, False if not
        """
-        self.check_server()
-        self.client_conn.send([RPCDefs.HAS_TIMESTAMP, RPCDefs.TYPE_RASTER3D,
-                               name, mapset, None])
-        return self.safe_receive("has_raster3d_timestamp")
+        worker = self._get_reader()
+        worker.check_server()
+        worker.client_conn.send([RPCDefs.HAS_TIMESTAMP, RPCDefs.TYPE_RASTER3D,
+                                 name, mapset, None])
+        return worker.safe_receive("has_raster3d_timestamp")
 
     def remove_raster3d_timestamp(self, name, mapset):
         """Remove a file based 3D raster timestamp
@@ -1515,10 +1641,11 @@ class CLibrariesInterface(RPCServerBase):
            :param mapset: The mapset of the map
            :returns: The return value of G_read_raster3d_timestamp
        """
-        self.check_server()
-        self.client_conn.send([RPCDefs.READ_TIMESTAMP, RPCDefs.TYPE_RASTER3D,
-                               name, mapset, None])
-        return self.safe_receive("read_raster3d_timestamp")
+        worker = self._get_reader()
+        worker.check_server()
+        worker.client_conn.send([RPCDefs.READ_TIMESTAMP, RPCDefs.TYPE_RASTER3D,
+                                 name, mapset, None])
+        return worker.safe_receive("read_raster3d_timestamp")
 
     def write_raster3d_timestamp(self, name, mapset, timestring):
         """Write a file based 3D raster timestamp
@@ -1546,10 +1673,11 @@ class CLibrariesInterface(RPCServerBase):
            :param mapset: The mapset of the map
            :returns: True if exists, False if not
        """
-        self.check_server()
-        self.client_conn.send([RPCDefs.MAP_EXISTS, RPCDefs.TYPE_VECTOR,
-                               name, mapset, None])
-        return self.safe_receive("vector_map_exists")
+        worker = self._get_reader()
+        worker.check_server()
+        worker.client_conn.send([RPCDefs.MAP_EXISTS, RPCDefs.TYPE_VECTOR,
+                                 name, mapset, None])
+        return worker.safe_receive("vector_map_exists")
 
     def read_vector_info(self, name, mapset):
         """Read the vector map info from the file system and store the content
@@ -1560,10 +1688,11 @@ class CLibrariesInterface(RPCServerBase):
            :returns: The key value pairs of the map specific metadata,
                      or None in case of an error
         """
-        self.check_server()
-        self.client_conn.send([RPCDefs.READ_MAP_INFO, RPCDefs.TYPE_VECTOR,
-                               name, mapset, None])
-        return self.safe_receive("read_vector_info")
+        worker = self._get_reader()
+        worker.check_server()
+        worker.client_conn.send([RPCDefs.READ_MAP_INFO, RPCDefs.TYPE_VECTOR,
+                                 name, mapset, None])
+        return worker.safe_receive("read_vector_info")
 
     def read_vector_full_info(self, name, mapset):
         """Read vector info using PyGRASS VectorTopo
@@ -1574,11 +1703,12 @@ class CLibrariesInterface(RPCServerBase):
            :returns: The key value pairs of the map specific metadata,
                      or None in case of an error
         """
-        self.check_server()
-        self.client_conn.send([RPCDefs.READ_MAP_FULL_INFO,
-                               RPCDefs.TYPE_VECTOR,
-                               name, mapset, None])
-        return self.safe_receive("read_vector_full_info")
+        worker = self._get_reader()
+        worker.check_server()
+        worker.client_conn.send([RPCDefs.READ_MAP_FULL_INFO,
+                                 RPCDefs.TYPE_VECTOR,
+                                 name, mapset, None])
+        return worker.safe_receive("read_vector_full_info")
 
     def has_vector_timestamp(self, name, mapset, layer=None):
         """Check if a file based vector timestamp exists
@@ -1588,10 +1718,11 @@ class CLibrariesInterface(RPCServerBase):
            :param layer: The layer of the vector map
            :returns: True if exists, False if not
        """
-        self.check_server()
-        self.client_conn.send([RPCDefs.HAS_TIMESTAMP, RPCDefs.TYPE_VECTOR,
-                               name, mapset, layer])
-        return self.safe_receive("has_vector_timestamp")
+        worker = self._get_reader()
+        worker.check_server()
+        worker.client_conn.send([RPCDefs.HAS_TIMESTAMP, RPCDefs.TYPE_VECTOR,
+                                 name, mapset, layer])
+        return worker.safe_receive("has_vector_timestamp")
 
     def remove_vector_timestamp(self, name, mapset, layer=None):
         """Remove a file based vector timestamp
@@ -1627,10 +1758,11 @@ class CLibrariesInterface(RPCServerBase):
            :param layer: The layer of the vector map
            :returns: The return value ofG_read_vector_timestamp and the timestamps
        """
-        self.check_server()
-        self.client_conn.send([RPCDefs.READ_TIMESTAMP, RPCDefs.TYPE_VECTOR,
-                               name, mapset, layer])
-        return self.safe_receive("read_vector_timestamp")
+        worker = self._get_reader()
+        worker.check_server()
+        worker.client_conn.send([RPCDefs.READ_TIMESTAMP, RPCDefs.TYPE_VECTOR,
+                                 name, mapset, layer])
+        return worker.safe_receive("read_vector_timestamp")
 
     def write_vector_timestamp(self, name, mapset, timestring, layer=None):
         """Write a file based vector timestamp
@@ -1710,6 +1842,134 @@ class CLibrariesInterface(RPCServerBase):
         self.client_conn.send([RPCDefs.G_GISDBASE, ])
         return self.safe_receive("get_gisdbase")
 
+    def execute_batch(self, requests):
+        """Send a list of requests to the server and receive all results
+           with a single round trip
+
+           Each request is a list [function_id, maptype, name, mapset, layer]
+           as used by the single request methods, missing entries are
+           filled with None. The server acquires the lock only once for the
+           whole batch. Batches of read only requests are distributed over
+           all server processes.
+
+           :param requests: A list of request lists
+           :returns: A list of results in the order of the requests
+        """
+        if not requests:
+            return []
+
+        batch = []
+        for request in requests:
+            request = list(request)
+            if len(request) < 5:
+                request += [None] * (5 - len(request))
+            batch.append(request)
+
+        read_only = all(request[0] in RPCDefs.READ_REQUESTS
+                        for request in batch)
+        if read_only and len(self.workers) > 1:
+            # Split the batch into contiguous chunks and send them to all
+            # readers before receiving, so that they are processed in
+            # parallel
+            size = -(-len(batch) // len(self.workers))
+            jobs = []
+            results = []
+            errors = []
+            try:
+                for start in range(0, len(batch), size):
+                    worker = self._get_reader()
+                    worker.check_server()
+                    worker.client_conn.send([RPCDefs.BATCH,
+                                             batch[start:start + size]])
+                    jobs.append(worker)
+            finally:
+                # Drain the pipes of all workers that received a chunk,
+                # otherwise their next request would read a stale reply
+                for worker in jobs:
+                    try:
+                        results.extend(worker.safe_receive("execute_batch"))
+                    except FatalError as e:
+                        errors.append(e)
+            if errors:
+                raise errors[0]
+        else:
+            self.check_server()
+            self.client_conn.send([RPCDefs.BATCH, batch])
+            results = self.safe_receive("execute_batch")
+
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    def read_maps_metadata(self, maptype, maps, timestamps=True):
+        """Read the existence, the metadata, the band reference and the
+           timestamps of a list of maps with at most three round trips to
+           the server
+
+           :param maptype: The type of the maps "raster", "raster3d" or
+                           "vector"
+           :param maps: A list of (name, mapset, layer) tuples, layer is only
+                        used for vector maps and can be None
+           :param timestamps: Set False to skip the reading of the
+                              timestamps, only the existence of a timestamp
+                              will be checked
+           :returns: A list of dictionaries, one for each map, with keys:
+
+                     - "exists": True if the map exists
+                     - "info": The map info as returned by read_*_info()
+                       or None
+                     - "band_reference": The return value of
+                       read_raster_band_reference() for raster maps or None
+                     - "has_timestamp": True if a timestamp exists
+                     - "timestamp": The return value of read_*_timestamp()
+                       or None
+        """
+        type_id = RPCDefs.MAP_TYPES[maptype]
+        result = []
+        for name, mapset, layer in maps:
+            result.append({"exists": False, "info": None,
+                           "band_reference": None, "has_timestamp": False,
+                           "timestamp": None})
+
+        exists = self.execute_batch([[RPCDefs.MAP_EXISTS, type_id,
+                                      name, mapset]
+                                     for name, mapset, layer in maps])
+
+        requests = []
+        for entry, check, (name, mapset, layer) in zip(result, exists, maps):
+            entry["exists"] = check
+            if not check:
+                continue
+            requests.append([RPCDefs.READ_MAP_INFO, type_id, name, mapset])
+            if type_id == RPCDefs.TYPE_RASTER:
+                requests.append([RPCDefs.READ_BAND_REFERENCE, type_id,
+                                 name, mapset])
+            requests.append([RPCDefs.HAS_TIMESTAMP, type_id, name, mapset,
+                             layer])
+        values = iter(self.execute_batch(requests))
+
+        requests = []
+        read_timestamp = []
+        for entry, (name, mapset, layer) in zip(result, maps):
+            if not entry["exists"]:
+                continue
+            entry["info"] = next(values)
+            if type_id == RPCDefs.TYPE_RASTER:
+                entry["band_reference"] = next(values)
+            entry["has_timestamp"] = next(values)
+            if timestamps and entry["has_timestamp"]:
+                # The timestamp of vector maps is read without layer
+                requests.append([RPCDefs.READ_TIMESTAMP, type_id, name,
+                                 mapset])
+                read_timestamp.append(entry)
+
+        for entry, timestamp in zip(read_timestamp,
+                                    self.execute_batch(requests)):
+            entry["timestamp"] = timestamp
+
+        return result
+
     def fatal_error(self, mapset=None):
         """Generate a fatal error in libgis.
 
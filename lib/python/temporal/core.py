@@ -53,6 +53,8 @@ except:
     pass
 
 import atexit
+import re
+import threading
 from datetime import datetime
 
 ###############################################################################
@@ -268,14 +270,21 @@ def get_tgis_message_interface():
 c_library_interface = None
 
 
-def _init_tgis_c_library_interface():
+def _init_tgis_c_library_interface(nprocs=1):
     """Set the global C-library interface variable that
        provides a fast and exit safe interface to the C-library libgis,
        libraster, libraster3d and libvector functions
+
+       :param nprocs: The number of C-library server processes, the
+                      interface is restarted if the number changes
     """
     global c_library_interface
+    if c_library_interface is not None and \
+       c_library_interface.nprocs != nprocs:
+        c_library_interface.stop()
+        c_library_interface = None
     if c_library_interface is None:
-        c_library_interface = CLibrariesInterface()
+        c_library_interface = CLibrariesInterface(nprocs=nprocs)
 
 
 def get_tgis_c_library_interface():
@@ -431,6 +440,7 @@ def stop_subprocesses():
         message_interface.stop()
     if c_library_interface:
         c_library_interface.stop()
+    close_sqlite_connections()
 
 # We register this function to be called at exit
 atexit.register(stop_subprocesses)
@@ -475,7 +485,7 @@ def get_available_temporal_mapsets():
 ###############################################################################
 
 
-def init(raise_fatal_error=False):
+def init(raise_fatal_error=False, nprocs=None):
     """This function set the correct database backend from GRASS environmental
        variables and creates the grass temporal database structure for raster,
        vector and raster3d maps as well as for the space-time datasets strds,
@@ -503,6 +513,9 @@ def init(raise_fatal_error=False):
 
         - GRASS_TGIS_PROFILE (True, False, 1, 0)
         - GRASS_TGIS_RAISE_ON_ERROR (True, False, 1, 0)
+        - GRASS_TGIS_NPROCS (number of C-library server processes)
+        - GRASS_TGIS_SQLITE_PRAGMAS (comma separated name=value pairs that
+          overwrite the sqlite connection pragmas)
 
         ..warning::
 
@@ -516,6 +529,9 @@ def init(raise_fatal_error=False):
                                   exception will be raised in case a fatal
                                   error occurs in the init process, otherwise
                                   sys.exit(1) will be called.
+        :param nprocs: The number of C-library server processes that
+                       read map metadata in parallel, overrides
+                       GRASS_TGIS_NPROCS, default is 1
     """
     # We need to set the correct database backend and several global variables
     # from the GRASS mapset specific environment variables of g.gisenv and t.connect
@@ -532,6 +548,9 @@ def init(raise_fatal_error=False):
 
     raise_on_error = raise_fatal_error
 
+    # The temporal database may have changed, open new sqlite connections
+    close_sqlite_connections()
+
     # We must run t.connect at first to create the temporal database and to
     # get the environmental variables
     gscript.run_command("t.connect", flags="c")
@@ -554,8 +573,15 @@ def init(raise_fatal_error=False):
 
     # Start the GRASS message interface server
     _init_tgis_message_interface(raise_on_error)
+    # Check environment variable GRASS_TGIS_NPROCS
+    if nprocs is None:
+        try:
+            nprocs = int(os.getenv("GRASS_TGIS_NPROCS", 1))
+        except ValueError:
+            nprocs = 1
+
     # Start the C-library interface server
-    _init_tgis_c_library_interface()
+    _init_tgis_c_library_interface(max(1, nprocs))
     msgr = get_tgis_message_interface()
     msgr.debug(1, "Initiate the temporal database")
                   #"\n  traceback:%s"%(str("  \n".join(traceback.format_stack()))))
@@ -866,6 +892,67 @@ def _create_tgis_metadata_table(content, dbif=None):
 
 ###############################################################################
 
+# The default pragmas of the sqlite temporal database connections. The WAL
+# journal allows concurrent readers while another process writes, the
+# busy timeout (milliseconds) makes writers wait for each other instead of
+# failing with "database is locked".
+sqlite_pragmas = [("journal_mode", "WAL"),
+                  ("synchronous", "NORMAL"),
+                  ("cache_size", "-65536"),
+                  ("mmap_size", "268435456"),
+                  ("temp_store", "MEMORY"),
+                  ("busy_timeout", "60000")]
+
+# The long-lived sqlite connections, the key is the tuple
+# (database string, process id, thread id)
+sqlite_connections = {}
+
+
+def get_sqlite_pragmas():
+    """Return the pragmas that are set for each new sqlite connection
+
+       The defaults can be overwritten with the environment variable
+       GRASS_TGIS_SQLITE_PRAGMAS, a comma separated list of name=value
+       pairs, for example "journal_mode=DELETE,synchronous=FULL" for
+       databases located on network file systems that do not support WAL.
+
+       :return: A list of (name, value) tuples
+    """
+    pragmas = list(sqlite_pragmas)
+    overrides = os.getenv("GRASS_TGIS_SQLITE_PRAGMAS")
+    if not overrides:
+        return pragmas
+
+    for entry in overrides.split(","):
+        if not entry.strip():
+            continue
+        name, sep, value = entry.partition("=")
+        name = name.strip().lower()
+        value = value.strip()
+        if not re.match(r"^[a-z_]+$", name) or \
+           not re.match(r"^-?[\w.]+$", value):
+            get_tgis_message_interface().warning(
+                _("Ignoring invalid sqlite pragma <%s>") % entry)
+            continue
+        pragmas = [(n, v) for n, v in pragmas if n != name]
+        pragmas.append((name, value))
+
+    return pragmas
+
+
+def close_sqlite_connections():
+    """Close all long-lived sqlite connections of this process"""
+    pid = os.getpid()
+    for key in list(sqlite_connections.keys()):
+        if key[1] == pid:
+            try:
+                sqlite_connections[key].close()
+            except Exception:
+                pass
+        del sqlite_connections[key]
+
+###############################################################################
+
 
 class SQLDatabaseInterfaceConnection(object):
     def __init__(self):
@@ -1032,6 +1119,26 @@ class SQLDatabaseInterfaceConnection(object):
 
         return self.connections[mapset].execute_transaction(statement)
 
+    def executemany_transaction(self, statements, mapset=None):
+        """Execute a list of SQL statements with arguments in a single
+           transaction using prepared statements
+
+           :param statements: A list of (sql, args) tuples with DBMI specific
+                              place holders in the SQL statement
+           :param mapset: The mapset of the abstract dataset or temporal
+                          database location, if None the current mapset
+                          will be used
+        """
+        if mapset is None:
+            mapset = self.current_mapset
+
+        mapset = decode(mapset)
+        if mapset not in self.tgis_mapsets.keys():
+            self.msgr.fatal(_("Unable to execute transaction. " +
+                              self._create_mapset_error_message(mapset)))
+
+        return self.connections[mapset].executemany_transaction(statements)
+
     def _create_mapset_error_message(self, mapset):
 
           return("You have no permission to "
@@ -1119,14 +1226,24 @@ class DBConnection(object):
 
         try:
             if self.dbmi.__name__ == "sqlite3":
-                self.connection = self.dbmi.connect(dbstring,
-                        detect_types=self.dbmi.PARSE_DECLTYPES | self.dbmi.PARSE_COLNAMES)
-                self.connection.row_factory = self.dbmi.Row
-                self.connection.isolation_level = None
-                self.connection.text_factory = str
+                # Reuse the connection of this process and thread to the
+                # database, opening a sqlite database and setting the
+                # pragmas is expensive
+                key = (dbstring, os.getpid(),
+                       threading.current_thread().ident)
+                if key not in sqlite_connections:
+                    connection = self.dbmi.connect(dbstring,
+                            detect_types=self.dbmi.PARSE_DECLTYPES | self.dbmi.PARSE_COLNAMES)
+                    connection.row_factory = self.dbmi.Row
+                    connection.isolation_level = None
+                    connection.text_factory = str
+                    cursor = connection.cursor()
+                    for name, value in get_sqlite_pragmas():
+                        cursor.execute("PRAGMA %s = %s" % (name, value))
+                    cursor.close()
+                    sqlite_connections[key] = connection
+                self.connection = sqlite_connections[key]
                 self.cursor = self.connection.cursor()
-                self.cursor.execute("PRAGMA synchronous = OFF")
-                self.cursor.execute("PRAGMA journal_mode = MEMORY")
             elif self.dbmi.__name__ == "psycopg2":
                 self.connection = self.dbmi.connect(dbstring)
                 #self.connection.set_isolation_level(dbmi.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
@@ -1143,6 +1260,11 @@ class DBConnection(object):
 
     def close(self):
         """Close the DBMI connection
+
+           The sqlite connection itself stays open and is reused by the
+           next connect() of this process and thread, it is closed by
+           close_sqlite_connections().
+
            TODO:
            There may be several temporal databases in a location, hence
            close all temporal databases that have been opened. Use a dictionary
@@ -1175,6 +1297,9 @@ class DBConnection(object):
                >>> dbif.mogrify_sql_statement(["SELECT ctime FROM raster_base WHERE id = ?",
                ... ["soil@PERMANENT",]])
                "SELECT ctime FROM raster_base WHERE id = 'soil@PERMANENT'"
+               >>> dbif.mogrify_sql_statement(["SELECT id FROM raster_base WHERE name = ? AND mapset = ?",
+               ... ["it's", "PERMANENT"]])
+               "SELECT id FROM raster_base WHERE name = 'it''s' AND mapset = 'PERMANENT'"
 
         """
         sql = content[0]
@@ -1200,43 +1325,38 @@ class DBConnection(object):
             if len(args) == 0:
                 return sql
             else:
-                # Unfortunately as sqlite does not support
-                # the transformation of sql strings and qmarked or
-                # named arguments we must make our hands dirty
-                # and do it by ourself. :(
-                # Doors are open for SQL injection because of the
-                # limited python sqlite3 implementation!!!
-                pos = 0
-                count = 0
-                maxcount = 100
-                statement = sql
-
-                while count < maxcount:
-                    pos = statement.find("?", pos + 1)
-                    if pos == -1:
-                        break
-
-                    if args[count] is None:
-                        statement = "%sNULL%s" % (statement[0:pos],
-                                                  statement[pos + 1:])
-                    elif isinstance(args[count], (int, long)):
-                        statement = "%s%d%s" % (statement[0:pos], args[count],
-                                                statement[pos + 1:])
-                    elif isinstance(args[count], float):
-                        statement = "%s%f%s" % (statement[0:pos], args[count],
-                                                statement[pos + 1:])
-                    elif isinstance(args[count], datetime):
-                        statement = "%s\'%s\'%s" % (statement[0:pos], str(args[count]),
-                                                statement[pos + 1:])
+                # Python sqlite3 does not support the transformation of
+                # sql strings and qmarked arguments, hence the string is
+                # assembled here. Use execute(), executemany_transaction()
+                # or the statement tuples directly whenever possible.
+                parts = sql.split("?")
+                statement = [parts[0]]
+                for count, part in enumerate(parts[1:]):
+                    if count < len(args):
+                        statement.append(self._sqlite_literal(args[count]))
                     else:
-                        # Default is a string, this works for datetime
-                        # objects too
-                        statement = "%s\'%s\'%s" % (statement[0:pos],
-                                                    str(args[count]),
-                                                    statement[pos + 1:])
-                    count += 1
+                        statement.append("?")
+                    statement.append(part)
+
+                return "".join(statement)
+
+    @staticmethod
+    def _sqlite_literal(value):
+        """Return the SQL literal of a value for sqlite
 
-                return statement
+           Strings are quoted and embedded single quotes are escaped.
+
+           :param value: The value to convert
+           :return: The SQL literal as string
+        """
+        if value is None:
+            return "NULL"
+        elif isinstance(value, (int, long)):
+            return "%d" % value
+        elif isinstance(value, float):
+            return "%f" % value
+        # Default is a string, this works for datetime objects too
+        return "\'%s\'" % str(value).replace("\'", "\'\'")
 
     def check_table(self, table_name):
         """Check if a table exists in the temporal database
@@ -1345,6 +1465,47 @@ class DBConnection(object):
         if connected:
             self.close()
 
+    def executemany_transaction(self, statements):
+        """Execute a list of SQL statements with arguments in a single
+           transaction using prepared statements
+
+           Consecutive statements with the same SQL string are executed
+           with a single executemany() call, so that the database can reuse
+           the compiled statement. The order of the statements is kept.
+
+           :param statements: A list of (sql, args) tuples with DBMI specific
+                              place holders in the SQL statement
+        """
+        connected = False
+        if not self.connected:
+            self.connect()
+            connected = True
+
+        # Group consecutive statements with the same SQL string
+        groups = []
+        for sql, args in statements:
+            if groups and groups[-1][0] == sql:
+                groups[-1][1].append(args)
+            else:
+                groups.append((sql, [args]))
+
+        try:
+            if self.dbmi.__name__ == "sqlite3":
+                self.cursor.execute("BEGIN TRANSACTION")
+            for sql, args_list in groups:
+                self.cursor.executemany(sql, args_list)
+            self.connection.commit()
+        except:
+            self.connection.rollback()
+            if connected:
+                self.close()
+            self.msgr.error(_("Unable to execute transaction:\n %(sql)s" %
+                            {"sql": "".join(sql for sql, args in groups)}))
+            raise
+
+        if connected:
+            self.close()
+
 ###############################################################################
 
 
@@ -23,6 +23,7 @@ from .datetime_math import time_delta_to_relative_time
 from .space_time_datasets import RasterDataset
 from .factory import dataset_factory
 from .open_stds import open_old_stds
+from .map_table import MapTable
 import grass.script as gscript
 
 ###############################################################################
@@ -172,9 +173,10 @@ def list_maps_of_stds(type, input, columns, order, where, separator,
             maps = sp.get_registered_maps_as_objects_with_gaps(where=where,
                                                                dbif=dbif)
         elif method == "delta":
-            maps = sp.get_registered_maps_as_objects(where=where,
-                                                     order="start_time",
-                                                     dbif=dbif)
+            # The columnar map table avoids the creation of map objects
+            maps = sp.get_registered_maps_as_table(where=where,
+                                                   order="start_time",
+                                                   dbif=dbif)
         elif method == "gran":
             if gran is not None and gran != "":
                 maps = sp.get_registered_maps_as_objects_by_granularity(gran=gran,
@@ -198,7 +200,39 @@ def list_maps_of_stds(type, input, columns, order, where, separator,
             else:
                 print(string)
 
-        if maps and len(maps) > 0:
+        if isinstance(maps, MapTable):
+            if len(maps) > 0:
+                first_time = maps.get_start_time(0)
+
+            for index in range(len(maps)):
+                start, end = maps.get_temporal_extent_as_tuple(index)
+                if end:
+                    delta = end - start
+                else:
+                    delta = None
+                delta_first = start - first_time
+
+                if maps.temporal_type == "absolute":
+                    if end:
+                        delta = time_delta_to_relative_time(delta)
+                    delta_first = time_delta_to_relative_time(delta_first)
+
+                string = ""
+                string += "%s%s" % (maps.get_id(index), separator)
+                string += "%s%s" % (maps.get_name(index), separator)
+                if type == "stvds":
+                    string += "%s%s" % (maps.get_layer(index), separator)
+                string += "%s%s" % (maps.get_mapset(index), separator)
+                string += "%s%s" % (start, separator)
+                string += "%s%s" % (end, separator)
+                string += "%s%s" % (delta, separator)
+                string += "%s" % (delta_first)
+                if outpath:
+                    outfile.write('{st}\n'.format(st=string))
+                else:
+                    print(string)
+
+        elif maps and len(maps) > 0:
 
             if isinstance(maps[0], list):
                 if len(maps[0]) > 0:
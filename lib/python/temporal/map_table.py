@@ -0,0 +1,317 @@
+"""
+Compact columnar representation of the maps registered in a space time
+dataset
+
+Usage:
+
+.. code-block:: python
+
+    import grass.temporal as tgis
+
+    strds = tgis.open_old_stds("precipitation", "strds")
+    table = strds.get_registered_maps_as_table(order="start_time")
+    for i in range(len(table)):
+        print(table.get_id(i), table.get_temporal_extent_as_tuple(i))
+
+(C) 2020 by the GRASS Development Team
+This program is free software under the GNU General Public
+License (>=v2). Read the file COPYING that comes with GRASS
+for details.
+
+:authors: GRASS Development Team
+"""
+from __future__ import print_function
+from array import array
+from datetime import datetime, timedelta
+
+try:
+    array("q")
+    _INT64 = "q"
+except ValueError:
+    # Python 2 has no long long arrays, long is 64 bit on LP64 systems
+    _INT64 = "l"
+
+_EPOCH = datetime(1970, 1, 1)
+
+###############################################################################
+
+
+class MapTable(object):
+    """Columnar list of the maps of a space time dataset
+
+       The map ids, the start and end times and the spatial extents are
+       stored in flat arrays instead of map objects. Absolute times are
+       stored as microseconds since 1970-01-01, relative times as integer
+       values. Map objects are created on demand, when accessed by index
+       or iteration, so that large space time datasets can be listed,
+       filtered, sorted and sliced without materializing all of them.
+
+       .. code-block:: python
+
+           >>> import grass.temporal as tgis
+           >>> from datetime import datetime
+           >>> tgis.init()
+           >>> strds = tgis.SpaceTimeRasterDataset("test@PERMANENT")
+           >>> table = tgis.MapTable(strds, temporal_type="absolute")
+           >>> table.append("b@PERMANENT", datetime(2001, 2, 1),
+           ...              datetime(2001, 3, 1), 80, 0, 120, 0, 10, 0)
+           >>> table.append("a@PERMANENT", datetime(2001, 1, 1),
+           ...              datetime(2001, 2, 1), 80, 0, 120, 0, 10, 0)
+           >>> table.append("c@PERMANENT", datetime(2001, 3, 1))
+           >>> len(table)
+           3
+           >>> table = table.sort()
+           >>> table.ids
+           ['a@PERMANENT', 'b@PERMANENT', 'c@PERMANENT']
+           >>> table.get_temporal_extent_as_tuple(2)
+           (datetime.datetime(2001, 3, 1, 0, 0), None)
+           >>> table.get_spatial_extent_as_tuple(0)
+           (80.0, 0.0, 120.0, 0.0, 10.0, 0.0)
+           >>> sub = table.filter(lambda ident, start, end: end is not None)
+           >>> sub.ids
+           ['a@PERMANENT', 'b@PERMANENT']
+           >>> table[1:].ids
+           ['b@PERMANENT', 'c@PERMANENT']
+           >>> map = table[1]
+           >>> map.get_id()
+           'b@PERMANENT'
+           >>> map.get_temporal_extent_as_tuple()
+           (datetime.datetime(2001, 2, 1, 0, 0), datetime.datetime(2001, 3, 1, 0, 0))
+           >>> [map.get_id() for map in table]
+           ['a@PERMANENT', 'b@PERMANENT', 'c@PERMANENT']
+
+    """
+
+    def __init__(self, stds, temporal_type=None, unit=None,
+                 has_vertical_extent=True):
+        """Constructor
+
+           :param stds: The space time dataset that is used to create the
+                        map objects
+           :param temporal_type: The temporal type "absolute" or "relative",
+                                 the temporal type of the space time dataset
+                                 is used by default
+           :param unit: The relative time unit, the unit of the space time
+                        dataset is used by default
+           :param has_vertical_extent: False in case the bottom and top of the
+                                       maps are not available
+        """
+        self.stds = stds
+        if temporal_type is None:
+            temporal_type = stds.get_temporal_type()
+        if unit is None and temporal_type == "relative":
+            unit = stds.get_relative_time_unit()
+        self.temporal_type = temporal_type
+        self.unit = unit
+        self.has_vertical_extent = has_vertical_extent
+
+        self.ids = []
+        self._start = array(_INT64)
+        self._end = array(_INT64)
+        # 1 if the map has an end time, 0 for time instances
+        self._has_end = array("b")
+        # north, south, east, west, top, bottom of each map
+        self._extent = array("d")
+
+    @classmethod
+    def from_rows(cls, stds, rows, has_vertical_extent=True):
+        """Create a map table from the rows of get_registered_maps()
+
+           The rows must provide the columns id, start_time, end_time,
+           west, east, south and north and in case of a vertical extent
+           bottom and top.
+
+           :param stds: The space time dataset of the rows
+           :param rows: The SQL rows or None
+           :param has_vertical_extent: True if the rows provide bottom and top
+           :return: The map table
+        """
+        table = cls(stds, has_vertical_extent=has_vertical_extent)
+        if rows is None:
+            return table
+
+        for row in rows:
+            if has_vertical_extent:
+                top = row["top"]
+                bottom = row["bottom"]
+            else:
+                top = bottom = 0
+            table.append(row["id"], row["start_time"], row["end_time"],
+                         row["north"], row["south"], row["east"], row["west"],
+                         top, bottom)
+        return table
+
+    def _encode_time(self, value):
+        if self.temporal_type == "absolute":
+            delta = value - _EPOCH
+            return (delta.days * 86400 + delta.seconds) * 1000000 + \
+                delta.microseconds
+        return int(value)
+
+    def _decode_time(self, value):
+        if self.temporal_type == "absolute":
+            return _EPOCH + timedelta(microseconds=value)
+        return value
+
+    def append(self, ident, start_time, end_time=None, north=None,
+               south=None, east=None, west=None, top=None, bottom=None):
+        """Append a map to the table
+
+           :param ident: The map id "name@mapset"
+           :param start_time: The start time as datetime object or integer
+           :param end_time: The end time or None for time instances
+           :param north: The northern edge, undefined edges are stored as NaN
+           :param south: The southern edge
+           :param east: The eastern edge
+           :param west: The western edge
+           :param top: The top edge
+           :param bottom: The bottom edge
+        """
+        self.ids.append(ident)
+        self._start.append(self._encode_time(start_time))
+        if end_time is None:
+            self._end.append(self._start[-1])
+            self._has_end.append(0)
+        else:
+            self._end.append(self._encode_time(end_time))
+            self._has_end.append(1)
+        for value in (north, south, east, west, top, bottom):
+            self._extent.append(float("nan") if value is None
+                                else float(value))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        for index in range(len(self.ids)):
+            yield self.get_map(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(range(*index.indices(len(self.ids))))
+        return self.get_map(index)
+
+    def get_id(self, index):
+        """Return the id of the map at index"""
+        return self.ids[index]
+
+    def get_name(self, index):
+        """Return the name of the map at index"""
+        name = self.ids[index].split("@")[0]
+        if name.find(":") >= 0:
+            name = name.split(":")[0]
+        return name
+
+    def get_layer(self, index):
+        """Return the layer of the map at index or None"""
+        name = self.ids[index].split("@")[0]
+        if name.find(":") >= 0:
+            return name.split(":")[1]
+        return None
+
+    def get_mapset(self, index):
+        """Return the mapset of the map at index"""
+        return self.ids[index].split("@")[1]
+
+    def get_start_time(self, index):
+        """Return the start time of the map at index"""
+        return self._decode_time(self._start[index])
+
+    def get_end_time(self, index):
+        """Return the end time of the map at index or None"""
+        if not self._has_end[index]:
+            return None
+        return self._decode_time(self._end[index])
+
+    def get_temporal_extent_as_tuple(self, index):
+        """Return the start and end time of the map at index as tuple"""
+        return (self.get_start_time(index), self.get_end_time(index))
+
+    def get_spatial_extent_as_tuple(self, index):
+        """Return the spatial extent of the map at index as tuple
+           (north, south, east, west, top, bottom)
+        """
+        offset = index * 6
+        return tuple(self._extent[offset:offset + 6])
+
+    def get_map(self, index):
+        """Create the map object of the map at index
+
+           The object is initialized with its id and the spatio-temporal
+           extent, as in
+           AbstractSpaceTimeDataset.get_registered_maps_as_objects().
+
+           :param index: The index of the map in the table
+           :return: The map object
+        """
+        map = self.stds.get_new_map_instance(self.ids[index])
+        start, end = self.get_temporal_extent_as_tuple(index)
+        if self.temporal_type == "absolute":
+            map.set_absolute_time(start, end)
+        elif self.temporal_type == "relative":
+            map.set_relative_time(start, end, self.unit)
+        north, south, east, west, top, bottom = \
+            self.get_spatial_extent_as_tuple(index)
+        if self.has_vertical_extent:
+            map.set_spatial_extent_from_values(north=north, south=south,
+                                               east=east, west=west,
+                                               top=top, bottom=bottom)
+        else:
+            map.set_spatial_extent_from_values(north=north, south=south,
+                                               east=east, west=west)
+        return map
+
+    def to_objects(self):
+        """Return the list of all map objects of the table"""
+        return [self.get_map(index) for index in range(len(self.ids))]
+
+    def take(self, indices):
+        """Return a new table with the maps at the provided indices
+
+           :param indices: An iterable of indices
+           :return: The new map table
+        """
+        table = MapTable(self.stds, self.temporal_type, self.unit,
+                         self.has_vertical_extent)
+        for index in indices:
+            table.ids.append(self.ids[index])
+            table._start.append(self._start[index])
+            table._end.append(self._end[index])
+            table._has_end.append(self._has_end[index])
+            offset = index * 6
+            table._extent.extend(self._extent[offset:offset + 6])
+        return table
+
+    def filter(self, function):
+        """Return a new table with the maps for which function is True
+
+           :param function: A function that is called with the id, the start
+                            time and the end time of each map
+           :return: The new map table
+        """
+        return self.take([index for index in range(len(self.ids))
+                          if function(self.ids[index],
+                                      self.get_start_time(index),
+                                      self.get_end_time(index))])
+
+    def sort(self, key="start_time", reverse=False):
+        """Return a new table sorted by id, start_time or end_time
+
+           The sort is stable, time instances are sorted by their start time
+           when sorting by end time.
+
+           :param key: The column to sort by: "id", "start_time" or "end_time"
+           :param reverse: Sort in descending order
+           :return: The new map table
+        """
+        if key == "id":
+            column = self.ids
+        elif key == "start_time":
+            column = self._start
+        elif key == "end_time":
+            column = self._end
+        else:
+            raise ValueError(_("Unable to sort the map table by <%s>") % key)
+        order = sorted(range(len(self.ids)), key=column.__getitem__,
+                       reverse=reverse)
+        return self.take(order)
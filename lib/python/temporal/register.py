@@ -19,6 +19,7 @@ for details.
 from datetime import datetime
 import grass.script as gscript
 from .core import get_tgis_message_interface, init_dbif, get_current_mapset
+from .core import get_tgis_c_library_interface, get_enable_mapset_check
 from .open_stds import open_old_stds
 from .abstract_map_dataset import AbstractMapDataset
 from .factory import dataset_factory
@@ -197,20 +198,42 @@ def register_maps_in_space_time_dataset(
 
     num_maps = len(maplist)
     map_object_list = []
-    statement = ""
+    # The INSERT and UPDATE statements of the maps, one list for each table
+    insert_statements = []
+    update_statements = []
     # Store the ids of datasets that must be updated
     datatsets_to_modify = {}
 
     msgr.message(_("Gathering map information..."))
 
+    # Read the metadata of all maps from the spatial database in a few
+    # batched requests instead of several requests for each map
+    maps = [dataset_factory(type, row["id"]) for row in maplist]
+    ciface = get_tgis_c_library_interface()
+    maps_metadata = ciface.read_maps_metadata(type,
+                                              [(map.get_name(),
+                                                map.get_mapset(),
+                                                map.get_layer())
+                                               for map in maps])
+
+    # Check with a single query which maps are already in the temporal
+    # database
+    ids_in_db = _select_ids_in_db(dbif, maps)
+    maps_seen = set()
+
     for count in range(len(maplist)):
         if count % 50 == 0:
             msgr.percent(count, num_maps, 1)
 
-        # Get a new instance of the map type
-        map = dataset_factory(type, maplist[count]["id"])
+        map = maps[count]
+        metadata = maps_metadata[count]
+
+        # Skip maps that are listed more than once
+        if map.get_id() in maps_seen:
+            continue
+        maps_seen.add(map.get_id())
 
-        if map.map_exists() is not True:
+        if metadata["exists"] is not True:
             msgr.fatal(_("Unable to update %(t)s map <%(id)s>. "
                          "The map does not exist.") % {'t': map.get_type(),
                                                        'id': map.get_map_id()})
@@ -230,9 +253,9 @@ def register_maps_in_space_time_dataset(
         is_in_db = False
 
         # Put the map into the database
-        if not map.is_in_db(dbif):
+        if map.get_id() not in ids_in_db:
             # Break in case no valid time is provided
-            if (start == "" or start is None) and not map.has_grass_timestamp():
+            if (start == "" or start is None) and not metadata["has_timestamp"]:
                 dbif.close()
                 if map.get_layer():
                     msgr.fatal(_("Unable to register %(t)s map <%(id)s> with "
@@ -279,6 +302,7 @@ def register_maps_in_space_time_dataset(
 
                 # Simple registration is allowed
                 if name:
+                    map.select(dbif)
                     map_object_list.append(map)
                 # Jump to next map
                 continue
@@ -308,14 +332,14 @@ def register_maps_in_space_time_dataset(
                                     'id': map.get_map_id()})
 
         # Load the data from the grass file database
-        map.load()
+        map.load(metadata)
 
         # Try to read an existing time stamp from the grass spatial database
         # in case this map wasn't already registered in the temporal database
         # Read the spatial database time stamp only, if no time stamp was provided for this map
         # as method argument or in the input file
         if not is_in_db and not start:
-            map.read_timestamp_from_grass()
+            map.read_timestamp_from_grass(metadata)
 
         # Set the valid time
         if start:
@@ -336,22 +360,33 @@ def register_maps_in_space_time_dataset(
             map.set_band_reference(band_reference)
         else:
             # Try to read band reference from GRASS data base if defined
-            map.read_band_reference_from_grass()
+            map.read_band_reference_from_grass(metadata)
 
         if is_in_db:
-            #  Gather the SQL update statement
-            statement += map.update_all(dbif=dbif, execute=False)
+            #  Gather the SQL update statements grouped by table
+            if get_enable_mapset_check() is True and \
+               map.get_mapset() != get_current_mapset():
+                dbif.close()
+                msgr.fatal(_("Unable to update dataset <%(ds)s> of type "
+                             "%(type)s in the temporal database. The mapset"
+                             " of the dataset does not match the current "
+                             "mapset") % {"ds": map.get_id(),
+                                          "type": map.get_type()})
+            _append_statements(update_statements,
+                               map.get_update_all_statements())
         else:
-            #  Gather the SQL insert statement
-            statement += map.insert(dbif=dbif, execute=False)
-
-        # Sqlite3 performance is better for huge datasets when committing in
-        # small chunks
-        if dbif.get_dbmi().__name__ == "sqlite3":
-            if count % 100 == 0:
-                if statement is not None and statement != "":
-                    dbif.execute_transaction(statement)
-                    statement = ""
+            #  Gather the SQL insert statements grouped by table, so that
+            #  they can be executed with executemany()
+            if get_enable_mapset_check() is True and \
+               map.get_mapset() != get_current_mapset():
+                dbif.close()
+                msgr.fatal(_("Unable to insert dataset <%(ds)s> of type "
+                             "%(type)s in the temporal database. The mapset "
+                             "of the dataset does not match the current "
+                             "mapset") % {"ds": map.get_id(),
+                                          "type": map.get_type()})
+            _append_statements(insert_statements,
+                               map.get_insert_statements())
 
         # Store the maps in a list to register in a space time dataset
         if name:
@@ -359,20 +394,16 @@ def register_maps_in_space_time_dataset(
 
     msgr.percent(num_maps, num_maps, 1)
 
-    if statement is not None and statement != "":
+    if update_statements or insert_statements:
         msgr.message(_("Registering maps in the temporal database..."))
-        dbif.execute_transaction(statement)
+        dbif.executemany_transaction([entry for table in
+                                      update_statements + insert_statements
+                                      for entry in table])
 
     # Finally Register the maps in the space time dataset
     if name and map_object_list:
-        count = 0
-        num_maps = len(map_object_list)
         msgr.message(_("Registering maps in the space time dataset..."))
-        for map in map_object_list:
-            if count % 50 == 0:
-                msgr.percent(count, num_maps, 1)
-            sp.register_map(map=map, dbif=dbif)
-            count += 1
+        sp.register_maps(map_object_list, dbif=dbif)
 
     # Update the space time tables
     if name and map_object_list:
@@ -401,6 +432,59 @@ def register_maps_in_space_time_dataset(
 
 ###############################################################################
 
+def _append_statements(table_statements, statements):
+    """Append the statements of a map to the statement lists of the tables
+
+       Statements of the same table share the same SQL string and can be
+       executed with a single executemany() call.
+
+       :param table_statements: A list of statement lists, one for each table
+       :param statements: The list of (sql, args) tuples of a map in table
+                          order
+    """
+    for index, entry in enumerate(statements):
+        if index == len(table_statements):
+            table_statements.append([])
+        table_statements[index].append(entry)
+
+
+def _select_ids_in_db(dbif, maps):
+    """Return the set of map ids that are already present in the temporal
+       database
+
+       The ids are selected in chunks with a single query for each chunk,
+       instead of a query for each map.
+
+       :param dbif: The database interface to be used
+       :param maps: A list of map objects of the same type
+       :return: A set of map ids
+    """
+    ids_in_db = set()
+    if not maps:
+        return ids_in_db
+
+    table = maps[0].base.get_table_name()
+    if dbif.get_dbmi().paramstyle == "qmark":
+        place_holder = "?"
+    else:
+        place_holder = "%s"
+
+    # SQLite limits the number of host parameters of a statement
+    chunk_size = 500
+    ids = [map.get_id() for map in maps]
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        sql = "SELECT id FROM " + table + " WHERE id IN (" + \
+              ",".join([place_holder] * len(chunk)) + ")"
+        dbif.execute(sql, chunk)
+        rows = dbif.fetchall()
+        if rows:
+            ids_in_db.update(row[0] for row in rows)
+
+    return ids_in_db
+
+###############################################################################
+
 def assign_valid_time_to_map(ttype, map, start, end, unit, increment=None,
                              mult=1, interval=False):
     """Assign the valid time to a map dataset
@@ -230,20 +230,29 @@ class RasterDataset(AbstractMapDataset):
         return self.ciface.has_raster_timestamp(self.get_name(),
                                                 self.get_mapset())
 
-    def read_timestamp_from_grass(self):
+    def read_timestamp_from_grass(self, metadata=None):
         """Read the timestamp of this map from the map metadata
            in the grass file system based spatial database and
            set the internal time stamp that should be insert/updated
            in the temporal database.
 
+           :param metadata: The map metadata as returned by
+                            read_metadata_from_grass(), if None
+                            the timestamp is read from the spatial database
            :return: True if success, False on error
         """
 
-        if not self.has_grass_timestamp():
-            return False
+        if metadata is None:
+            if not self.has_grass_timestamp():
+                return False
+
+            check, dates = self.ciface.read_raster_timestamp(self.get_name(),
+                                                             self.get_mapset(),)
+        else:
+            if not metadata["has_timestamp"]:
+                return False
 
-        check, dates = self.ciface.read_raster_timestamp(self.get_name(),
-                                                         self.get_mapset(),)
+            check, dates = metadata["timestamp"]
 
         if check < 1:
             self.msgr.error(_("Unable to read timestamp file "
@@ -303,17 +312,24 @@ class RasterDataset(AbstractMapDataset):
 
         return True
 
-    def read_band_reference_from_grass(self):
+    def read_band_reference_from_grass(self, metadata=None):
         """Read the band identifier of this map from the map metadata
            in the GRASS file system based spatial database and
            set the internal band identifier that should be insert/updated
            in the temporal database.
 
+           :param metadata: The map metadata as returned by
+                            read_metadata_from_grass(), if None
+                            the band identifier is read from the spatial
+                            database
            :return: True if success, False on error
         """
 
-        check, band_ref = self.ciface.read_raster_band_reference(self.get_name(),
-                                                                 self.get_mapset())
+        if metadata is None:
+            check, band_ref = self.ciface.read_raster_band_reference(self.get_name(),
+                                                                     self.get_mapset())
+        else:
+            check, band_ref = metadata["band_reference"]
 
         if check < 1:
             self.msgr.error(_("Unable to read band reference file "
@@ -350,25 +366,30 @@ class RasterDataset(AbstractMapDataset):
         return self.ciface.raster_map_exists(self.get_name(),
                                              self.get_mapset())
 
-    def load(self):
+    def load(self, metadata=None):
         """Load all info from an existing raster map into the internal structure
 
            This method checks first if the map exists, in case it exists
            the metadata of the map is put into this object and True is returned
 
+           :param metadata: The map metadata as returned by
+                            read_metadata_from_grass(), if None
+                            the metadata is read from the spatial database
            :return: True is the map exists and the metadata was filled
                     successfully and getting the data was successful,
                     False otherwise
         """
 
-        if self.map_exists() is not True:
+        if metadata is None:
+            metadata = self.read_metadata_from_grass(timestamps=False)
+
+        if metadata["exists"] is not True:
             return False
 
         # Fill base information
         self.base.set_creator(str(getpass.getuser()))
 
-        kvp = self.ciface.read_raster_info(self.get_name(),
-                                           self.get_mapset())
+        kvp = metadata["info"]
 
         if kvp:
             # Fill spatial extent
@@ -394,8 +415,7 @@ class RasterDataset(AbstractMapDataset):
             self.metadata.set_number_of_cells(ncells)
 
             # Fill band reference if defined
-            check, band_ref = self.ciface.read_raster_band_reference(self.get_name(),
-                                                                     self.get_mapset())
+            check, band_ref = metadata["band_reference"]
             if check > 0:
                 self.metadata.set_band_reference(band_ref)
 
@@ -636,20 +656,29 @@ class Raster3DDataset(AbstractMapDataset):
         return self.ciface.has_raster3d_timestamp(self.get_name(),
                                                   self.get_mapset())
 
-    def read_timestamp_from_grass(self):
+    def read_timestamp_from_grass(self, metadata=None):
         """Read the timestamp of this map from the map metadata
            in the grass file system based spatial database and
            set the internal time stamp that should be insert/updated
            in the temporal database.
 
+           :param metadata: The map metadata as returned by
+                            read_metadata_from_grass(), if None
+                            the timestamp is read from the spatial database
            :return: True if success, False on error
         """
 
-        if not self.has_grass_timestamp():
-            return False
+        if metadata is None:
+            if not self.has_grass_timestamp():
+                return False
 
-        check, dates = self.ciface.read_raster3d_timestamp(self.get_name(),
-                                                           self.get_mapset(),)
+            check, dates = self.ciface.read_raster3d_timestamp(self.get_name(),
+                                                               self.get_mapset(),)
+        else:
+            if not metadata["has_timestamp"]:
+                return False
+
+            check, dates = metadata["timestamp"]
 
         if check < 1:
             self.msgr.error(_("Unable to read timestamp file "
@@ -714,26 +743,31 @@ class Raster3DDataset(AbstractMapDataset):
         return self.ciface.raster3d_map_exists(self.get_name(),
                                                self.get_mapset())
 
-    def load(self):
+    def load(self, metadata=None):
         """Load all info from an existing 3d raster map into the internal structure
 
            This method checks first if the map exists, in case it exists
            the metadata of the map is put into this object and True is returned
 
+           :param metadata: The map metadata as returned by
+                            read_metadata_from_grass(), if None
+                            the metadata is read from the spatial database
            :return: True is the map exists and the metadata was filled
                     successfully and getting the data was successful,
                     False otherwise
         """
 
-        if self.map_exists() is not True:
+        if metadata is None:
+            metadata = self.read_metadata_from_grass(timestamps=False)
+
+        if metadata["exists"] is not True:
             return False
 
         # Fill base information
         self.base.set_creator(str(getpass.getuser()))
 
         # Fill spatial extent
-        kvp = self.ciface.read_raster3d_info(self.get_name(),
-                                             self.get_mapset())
+        kvp = metadata["info"]
 
         if kvp:
             self.set_spatial_extent_from_values(north=kvp["north"],
@@ -946,18 +980,28 @@ class VectorDataset(AbstractMapDataset):
                                                 self.get_mapset(),
                                                 self.get_layer())
 
-    def read_timestamp_from_grass(self):
+    def read_timestamp_from_grass(self, metadata=None):
         """Read the timestamp of this map from the map metadata
            in the grass file system based spatial database and
            set the internal time stamp that should be insert/updated
            in the temporal database.
+
+           :param metadata: The map metadata as returned by
+                            read_metadata_from_grass(), if None
+                            the timestamp is read from the spatial database
         """
 
-        if not self.has_grass_timestamp():
-            return False
+        if metadata is None:
+            if not self.has_grass_timestamp():
+                return False
+
+            check, dates = self.ciface.read_vector_timestamp(self.get_name(),
+                                                             self.get_mapset(),)
+        else:
+            if not metadata["has_timestamp"]:
+                return False
 
-        check, dates = self.ciface.read_vector_timestamp(self.get_name(),
-                                                         self.get_mapset(),)
+            check, dates = metadata["timestamp"]
 
         if check < 1:
             self.msgr.error(_("Unable to read timestamp file "
@@ -1018,19 +1062,24 @@ class VectorDataset(AbstractMapDataset):
         return self.ciface.vector_map_exists(self.get_name(),
                                              self.get_mapset())
 
-    def load(self):
-
+    def load(self, metadata=None):
         """Load all info from an existing vector map into the internal structure
 
            This method checks first if the map exists, in case it exists
            the metadata of the map is put into this object and True is returned
 
+           :param metadata: The map metadata as returned by
+                            read_metadata_from_grass(), if None
+                            the metadata is read from the spatial database
            :return: True is the map exists and the metadata was filled
                     successfully and getting the data was successful,
                     False otherwise
         """
 
-        if self.map_exists() is not True:
+        if metadata is None:
+            metadata = self.read_metadata_from_grass(timestamps=False)
+
+        if metadata["exists"] is not True:
             return False
 
         # Fill base information
@@ -1038,8 +1087,7 @@ class VectorDataset(AbstractMapDataset):
 
         # Get the data from an existing vector map
 
-        kvp = self.ciface.read_vector_info(self.get_name(),
-                                           self.get_mapset())
+        kvp = metadata["info"]
 
         if kvp:
             # Fill spatial extent
@@ -80,8 +80,25 @@ class SpatialTopologyDatasetConnector(object):
     def reset_spatial_topology(self):
         """Reset any information about temporal topology"""
         self._spatial_topology = {}
+        # The ids of the related maps for fast membership tests
+        self._spatial_members = {}
         self._has_spatial_topology = False
 
+    def _append_spatial_relation(self, relation, map):
+        """Append a map to the list of a spatial relation, a map that is
+           already part of the relation is not appended again
+
+           :param relation: The name of the relation in upper case
+           :param map: This object should be of type AbstractMapDataset
+                       or derived classes
+        """
+        if relation not in self._spatial_topology:
+            self._spatial_topology[relation] = []
+            self._spatial_members[relation] = set()
+        if id(map) not in self._spatial_members[relation]:
+            self._spatial_members[relation].add(id(map))
+            self._spatial_topology[relation].append(map)
+
     def get_spatial_relations(self):
         """Return the dictionary of spatial relationships
 
@@ -165,9 +182,7 @@ class SpatialTopologyDatasetConnector(object):
            :param map: This object should be of type AbstractMapDataset
                        or derived classes
         """
-        if "EQUIVALENT" not in self._spatial_topology:
-            self._spatial_topology["EQUIVALENT"] = []
-        self._spatial_topology["EQUIVALENT"].append(map)
+        self._append_spatial_relation("EQUIVALENT", map)
 
     def get_equivalent(self):
         """Return a list of map objects with equivalent spatial extent as this map
@@ -184,9 +199,7 @@ class SpatialTopologyDatasetConnector(object):
            :param map: This object should be of type AbstractMapDataset
                        or derived classes
         """
-        if "OVERLAP" not in self._spatial_topology:
-            self._spatial_topology["OVERLAP"] = []
-        self._spatial_topology["OVERLAP"].append(map)
+        self._append_spatial_relation("OVERLAP", map)
 
     def get_overlap(self):
         """Return a list of map objects that this map spatial overlap with
@@ -203,9 +216,7 @@ class SpatialTopologyDatasetConnector(object):
            :param map: This object should be of type AbstractMapDataset
                        or derived classes
         """
-        if "IN" not in self._spatial_topology:
-            self._spatial_topology["IN"] = []
-        self._spatial_topology["IN"].append(map)
+        self._append_spatial_relation("IN", map)
 
     def get_in(self):
         """Return a list of map objects that are spatial in this map
@@ -222,9 +233,7 @@ class SpatialTopologyDatasetConnector(object):
            :param map: This object should be of type AbstractMapDataset
                        or derived classes
         """
-        if "CONTAIN" not in self._spatial_topology:
-            self._spatial_topology["CONTAIN"] = []
-        self._spatial_topology["CONTAIN"].append(map)
+        self._append_spatial_relation("CONTAIN", map)
 
     def get_contain(self):
         """Return a list of map objects that this map contains
@@ -241,9 +250,7 @@ class SpatialTopologyDatasetConnector(object):
            :param map: This object should be of type AbstractMapDataset
                        or derived classes
         """
-        if "MEET" not in self._spatial_topology:
-            self._spatial_topology["MEET"] = []
-        self._spatial_topology["MEET"].append(map)
+        self._append_spatial_relation("MEET", map)
 
     def get_meet(self):
         """Return a list of map objects that spatially meet with this map
@@ -260,9 +267,7 @@ class SpatialTopologyDatasetConnector(object):
            :param map: This object should be of type AbstractMapDataset
                        or derived classes
         """
-        if "COVER" not in self._spatial_topology:
-            self._spatial_topology["COVER"] = []
-        self._spatial_topology["COVER"].append(map)
+        self._append_spatial_relation("COVER", map)
 
     def get_cover(self):
         """Return a list of map objects that spatially cover this map
@@ -279,9 +284,7 @@ class SpatialTopologyDatasetConnector(object):
            :param map: This object should be of type AbstractMapDataset
                        or derived classes
         """
-        if "COVERED" not in self._spatial_topology:
-            self._spatial_topology["COVERED"] = []
-        self._spatial_topology["COVERED"].append(map)
+        self._append_spatial_relation("COVERED", map)
 
     def get_covered(self):
         """Return a list of map objects that are spatially covered by this map
@@ -26,6 +26,17 @@ import grass.lib.vector as vector
 import grass.lib.rtree as rtree
 import grass.lib.gis as gis
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# The temporal relations in the order in which they are checked by
+# AbstractTemporalExtent.temporal_relation()
+TEMPORAL_RELATIONS = ("equal", "during", "contains", "overlaps",
+                      "overlapped", "after", "before", "starts", "finishes",
+                      "started", "finished", "follows", "precedes")
+
 ###############################################################################
 
 
@@ -500,6 +511,200 @@ class SpatioTemporalTopologyBuilder(object):
 
         return tree
 
+    def _time_arrays(self, maps):
+        """Return the start and end times of the maps as numpy arrays
+
+           Absolute times are converted into integer microseconds since
+           0001-01-01, relative times into floating point numbers. The end
+           time of a time instance is set to its start time.
+
+           :return: A tuple (start, end, instance, absolute, unit) with
+                    instance a boolean array that is True for time instances,
+                    or None in case the maps have undefined start times,
+                    mixed temporal types or different relative units
+        """
+        start_list = []
+        end_list = []
+        instance_list = []
+        absolute = None
+        unit = None
+
+        for map_ in maps:
+            start, end = map_.get_temporal_extent_as_tuple()
+            if start is None:
+                return None
+            is_absolute = isinstance(start, datetime)
+            if absolute is None:
+                absolute = is_absolute
+                if not absolute:
+                    unit = map_.get_relative_time_unit()
+            elif absolute != is_absolute:
+                return None
+            if not absolute:
+                if unit is None or map_.get_relative_time_unit() != unit:
+                    return None
+
+            instance_list.append(end is None)
+            if end is None:
+                end = start
+            if absolute:
+                delta = start - self._timeref
+                start = (delta.days * 86400 + delta.seconds) * 1000000 + \
+                    delta.microseconds
+                delta = end - self._timeref
+                end = (delta.days * 86400 + delta.seconds) * 1000000 + \
+                    delta.microseconds
+            start_list.append(start)
+            end_list.append(end)
+
+        dtype = np.int64 if absolute else np.float64
+        return (np.array(start_list, dtype=dtype),
+                np.array(end_list, dtype=dtype),
+                np.array(instance_list, dtype=bool), absolute, unit)
+
+    @staticmethod
+    def _expand_ranges(lo, hi):
+        """Expand the index ranges [lo, hi) into an owner and an index array
+
+           :return: A tuple (owner, index), owner is the position of the
+                    range in lo and hi, index the index inside the range
+        """
+        counts = hi - lo
+        total = int(counts.sum())
+        owner = np.repeat(np.arange(len(lo)), counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts,
+                                               counts)
+        return owner, np.repeat(lo, counts) + offsets
+
+    @staticmethod
+    def _classify_temporal_relations(bs, be, bi, as_, ae, ai):
+        """Classify the temporal relations of B to A for arrays of pairs
+
+           The classification is the vectorized version of
+           AbstractTemporalExtent.temporal_relation(), it returns for each
+           pair the index of the relation in TEMPORAL_RELATIONS or -1.
+        """
+        bn = ~bi
+        an = ~ai
+        intervals = bn & an
+        conditions = [
+            # equal
+            (bi & ai & (bs == as_)) |
+            (intervals & (bs == as_) & (be == ae)),
+            # during
+            an & ((bi & (bs >= as_) & (bs < ae)) |
+                  (bn & (bs > as_) & (be < ae))),
+            # contains
+            bn & ((ai & (bs <= as_) & (be > as_)) |
+                  (an & (bs < as_) & (be > ae))),
+            # overlaps
+            intervals & (bs < as_) & (be < ae) & (be > as_),
+            # overlapped
+            intervals & (bs > as_) & (be > ae) & (bs < ae),
+            # after
+            (ai & (bs > as_)) | (an & (bs > ae)),
+            # before
+            (bi & (bs < as_)) | (bn & (be < as_)),
+            # starts
+            intervals & (bs == as_) & (be < ae),
+            # finishes
+            intervals & (be == ae) & (bs > as_),
+            # started
+            intervals & (bs == as_) & (be > ae),
+            # finished
+            intervals & (be == ae) & (bs < as_),
+            # follows
+            an & (bs == ae),
+            # precedes
+            bn & (be == as_)]
+        return np.select(conditions, list(range(len(conditions))), -1)
+
+    def _build_sweep(self, mapsA, mapsB, spatial=None):
+        """Build the temporal relations between mapsA and mapsB with a
+           sweep over the start times instead of an R*-Tree
+
+           All pairs of temporally intersecting maps are found with binary
+           searches in the sorted start times: pairs in which the start of
+           A is located in B and pairs in which the start of B is located
+           after the start of A inside of A. The temporal relations of the
+           pairs are classified in vectorized form. In case of a spatial
+           topology, the pairs are filtered by their spatial extent and the
+           spatial relations are computed for the remaining pairs.
+
+           :return: True if the topology was build, False in case the fast
+                    path is not applicable, for example if numpy is not
+                    available or the maps have mixed temporal types
+        """
+        if np is None or not mapsA or not mapsB:
+            return False
+
+        times_a = self._time_arrays(mapsA)
+        times_b = self._time_arrays(mapsB)
+        if times_a is None or times_b is None:
+            return False
+        as_, ae, ai, absolute_a, unit_a = times_a
+        bs, be, bi, absolute_b, unit_b = times_b
+        if absolute_a != absolute_b or unit_a != unit_b:
+            return False
+
+        order_a = np.argsort(as_, kind="mergesort")
+        order_b = np.argsort(bs, kind="mergesort")
+        sorted_as = as_[order_a]
+        sorted_bs = bs[order_b]
+
+        # Maps of A that start inside of B
+        lo = np.searchsorted(sorted_as, bs, side="left")
+        hi = np.searchsorted(sorted_as, be, side="right")
+        j1, pos = self._expand_ranges(lo, hi)
+        i1 = order_a[pos]
+
+        # Maps of B that start after the start of A inside of A
+        lo = np.searchsorted(sorted_bs, as_, side="right")
+        hi = np.searchsorted(sorted_bs, ae, side="right")
+        i2, pos = self._expand_ranges(lo, hi)
+        j2 = order_b[pos]
+
+        i = np.concatenate((i1, i2))
+        j = np.concatenate((j1, j2))
+
+        if spatial is not None:
+            # north, south, east, west, top, bottom
+            extent_a = [map_.get_spatial_extent_as_tuple() for map_ in mapsA]
+            extent_b = [map_.get_spatial_extent_as_tuple() for map_ in mapsB]
+            if any(None in extent for extent in extent_a + extent_b):
+                return False
+            extent_a = np.array(extent_a, dtype=np.float64)
+            extent_b = np.array(extent_b, dtype=np.float64)
+            ea = extent_a[i]
+            eb = extent_b[j]
+            mask = (ea[:, 3] <= eb[:, 2]) & (ea[:, 2] >= eb[:, 3]) & \
+                   (ea[:, 1] <= eb[:, 0]) & (ea[:, 0] >= eb[:, 1])
+            if spatial == "3D":
+                mask &= (ea[:, 5] <= eb[:, 4]) & (ea[:, 4] >= eb[:, 5])
+            i = i[mask]
+            j = j[mask]
+
+        # Process the pairs in the order of mapsB and mapsA
+        order = np.lexsort((i, j))
+        i = i[order]
+        j = j[order]
+
+        codes = self._classify_temporal_relations(bs[j], be[j], bi[j],
+                                                  as_[i], ae[i], ai[i])
+
+        for index_a, index_b, code in zip(i.tolist(), j.tolist(),
+                                          codes.tolist()):
+            A = mapsA[index_a]
+            B = mapsB[index_b]
+            if code >= 0:
+                set_temoral_relationship(A, B, TEMPORAL_RELATIONS[code])
+
+            if spatial is not None:
+                relation = B.spatial_relation(A)
+                set_spatial_relationship(A, B, relation)
+
+        return True
+
     def build(self, mapsA, mapsB=None, spatial=None):
         """Build the spatio-temporal topology structure between
            one or two unordered lists of abstract dataset objects
@@ -540,6 +745,12 @@ class SpatioTemporalTopologyBuilder(object):
             for map_ in mapsB:
                 map_.reset_topology()
 
+        if self._build_sweep(mapsA, mapsB, spatial):
+            self._build_internal_iteratable(mapsA, spatial)
+            if not identical and mapsB is not None:
+                self._build_iteratable(mapsB, spatial)
+            return
+
         tree = self. _build_rtree(mapsA, spatial)
 
         list_ = gis.G_new_ilist()
@@ -591,177 +802,78 @@ class SpatioTemporalTopologyBuilder(object):
 
 
 def set_temoral_relationship(A, B, relation):
+    """Set the temporal relation of B to A and the inverse relation of A to B
+
+       The topology connectors ignore maps that are already part of a
+       relation, so that no linear membership tests are required.
+    """
     if relation == "equal" or relation == "equals":
         if A != B:
-            if not B.get_equal() or \
-            (B.get_equal() and \
-            A not in B.get_equal()):
-                B.append_equal(A)
-            if not A.get_equal() or \
-            (A.get_equal() and \
-            B not in A.get_equal()):
-                A.append_equal(B)
+            B.append_equal(A)
+            A.append_equal(B)
     elif relation == "follows":
-        if not B.get_follows() or \
-            (B.get_follows() and \
-            A not in B.get_follows()):
-            B.append_follows(A)
-        if not A.get_precedes() or \
-            (A.get_precedes() and
-            B not in A.get_precedes()):
-            A.append_precedes(B)
+        B.append_follows(A)
+        A.append_precedes(B)
     elif relation == "precedes":
-        if not B.get_precedes() or \
-            (B.get_precedes() and \
-            A not in B.get_precedes()):
-            B.append_precedes(A)
-        if not A.get_follows() or \
-            (A.get_follows() and \
-            B not in A.get_follows()):
-            A.append_follows(B)
+        B.append_precedes(A)
+        A.append_follows(B)
     elif relation == "during" or relation == "starts" or \
             relation == "finishes":
-        if not B.get_during() or \
-            (B.get_during() and \
-            A not in B.get_during()):
-            B.append_during(A)
-        if not A.get_contains() or \
-            (A.get_contains() and \
-            B not in A.get_contains()):
-            A.append_contains(B)
+        B.append_during(A)
+        A.append_contains(B)
         if relation == "starts":
-            if not B.get_starts() or \
-            (B.get_starts() and \
-            A not in B.get_starts()):
-                B.append_starts(A)
-            if not A.get_started() or \
-            (A.get_started() and \
-            B not in A.get_started()):
-                A.append_started(B)
+            B.append_starts(A)
+            A.append_started(B)
         if relation == "finishes":
-            if not B.get_finishes() or \
-            (B.get_finishes() and \
-            A not in B.get_finishes()):
-                B.append_finishes(A)
-            if not A.get_finished() or \
-            (A.get_finished() and \
-            B not in A.get_finished()):
-                A.append_finished(B)
+            B.append_finishes(A)
+            A.append_finished(B)
     elif relation == "contains" or relation == "started" or \
             relation == "finished":
-        if not B.get_contains() or \
-            (B.get_contains() and \
-            A not in B.get_contains()):
-            B.append_contains(A)
-        if not A.get_during() or \
-            (A.get_during() and \
-            B not in A.get_during()):
-            A.append_during(B)
+        B.append_contains(A)
+        A.append_during(B)
         if relation == "started":
-            if not B.get_started() or \
-            (B.get_started() and \
-            A not in B.get_started()):
-                B.append_started(A)
-            if not A.get_starts() or \
-            (A.get_starts() and \
-            B not in A.get_starts()):
-                A.append_starts(B)
+            B.append_started(A)
+            A.append_starts(B)
         if relation == "finished":
-            if not B.get_finished() or \
-            (B.get_finished() and \
-            A not in B.get_finished()):
-                B.append_finished(A)
-            if not A.get_finishes() or \
-            (A.get_finishes() and \
-            B not in A.get_finishes()):
-                A.append_finishes(B)
+            B.append_finished(A)
+            A.append_finishes(B)
     elif relation == "overlaps":
-        if not B.get_overlaps() or \
-            (B.get_overlaps() and \
-            A not in B.get_overlaps()):
-            B.append_overlaps(A)
-        if not A.get_overlapped() or \
-            (A.get_overlapped() and \
-            B not in A.get_overlapped()):
-            A.append_overlapped(B)
+        B.append_overlaps(A)
+        A.append_overlapped(B)
     elif relation == "overlapped":
-        if not B.get_overlapped() or \
-            (B.get_overlapped() and \
-            A not in B.get_overlapped()):
-            B.append_overlapped(A)
-        if not A.get_overlaps() or \
-            (A.get_overlaps() and \
-            B not in A.get_overlaps()):
-            A.append_overlaps(B)
+        B.append_overlapped(A)
+        A.append_overlaps(B)
 
 ###############################################################################
 
 def set_spatial_relationship(A, B, relation):
+    """Set the spatial relation of B to A and the inverse relation of A to B
 
+       The topology connectors ignore maps that are already part of a
+       relation, so that no linear membership tests are required.
+    """
     if relation == "equivalent":
         if A != B:
-            if not B.get_equivalent() or \
-            (B.get_equivalent() and \
-            A not in B.get_equivalent()):
-                B.append_equivalent(A)
-            if not A.get_equivalent() or \
-            (A.get_equivalent() and \
-            B not in A.get_equivalent()):
-                A.append_equivalent(B)
+            B.append_equivalent(A)
+            A.append_equivalent(B)
     elif relation == "overlap":
-        if not B.get_overlap() or \
-            (B.get_overlap() and \
-            A not in B.get_overlap()):
-            B.append_overlap(A)
-        if not A.get_overlap() or \
-            (A.get_overlap() and
-            B not in A.get_overlap()):
-            A.append_overlap(B)
+        B.append_overlap(A)
+        A.append_overlap(B)
     elif relation == "meet":
-        if not B.get_meet() or \
-            (B.get_meet() and \
-            A not in B.get_meet()):
-            B.append_meet(A)
-        if not A.get_meet() or \
-            (A.get_meet() and
-            B not in A.get_meet()):
-            A.append_meet(B)
+        B.append_meet(A)
+        A.append_meet(B)
     elif relation == "contain":
-        if not B.get_contain() or \
-            (B.get_contain() and \
-            A not in B.get_contain()):
-            B.append_contain(A)
-        if not A.get_in() or \
-            (A.get_in() and \
-            B not in A.get_in()):
-            A.append_in(B)
+        B.append_contain(A)
+        A.append_in(B)
     elif relation == "in":
-        if not B.get_in() or \
-            (B.get_in() and \
-            A not in B.get_in()):
-            B.append_in(A)
-        if not A.get_contain() or \
-            (A.get_contain() and \
-            B not in A.get_contain()):
-            A.append_contain(B)
+        B.append_in(A)
+        A.append_contain(B)
     elif relation == "cover":
-        if not B.get_cover() or \
-            (B.get_cover() and \
-            A not in B.get_cover()):
-            B.append_cover(A)
-        if not A.get_covered() or \
-            (A.get_covered() and \
-            B not in A.get_covered()):
-            A.append_covered(B)
+        B.append_cover(A)
+        A.append_covered(B)
     elif relation == "covered":
-        if not B.get_covered() or \
-            (B.get_covered() and \
-            A not in B.get_covered()):
-            B.append_covered(A)
-        if not A.get_cover() or \
-            (A.get_cover() and \
-            B not in A.get_cover()):
-            A.append_cover(B)
+        B.append_covered(A)
+        A.append_cover(B)
 
 ###############################################################################
 
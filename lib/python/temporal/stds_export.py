@@ -27,11 +27,11 @@ for details.
 
 import shutil
 import os
+import subprocess
 import tarfile
 import tempfile
 
 import grass.script as gscript
-from grass.exceptions import CalledModuleError
 from .open_stds import open_old_stds
 
 
@@ -50,163 +50,184 @@ exported_maps = {}
 ############################################################################
 
 
-def _export_raster_maps_as_gdal(rows, tar, list_file, new_cwd, fs, format_,
-                                type_, **kwargs):
+def _run_map_jobs(jobs, nprocs=1, finished=None):
+    """Run the export or import modules of the maps with a bounded pool of
+       processes
+
+       At most nprocs modules run at the same time, a finished module is
+       replaced by the next one. The jobs are created on demand, so that
+       the modules of large space time datasets are not created at once.
+
+       :param jobs: An iterable of (Module object, payload) tuples, the
+                    modules must be created with run_=False
+       :param nprocs: The maximum number of modules that run in parallel
+       :param finished: A function that is called in the calling process
+                        with the payload of each module that finished
+                        successfully, in order of completion
+       :return: The payload of the first module that failed or None
+    """
+    import grass.pygrass.modules as pymod
+
+    payloads = {}
+    failed = []
+
+    def callback(module, num_finished, num_put):
+        payload = payloads.pop(id(module))
+        if module.popen.returncode != 0:
+            failed.append(payload)
+        elif finished:
+            finished(payload)
+
+    queue = pymod.ParallelModuleQueue(max(1, int(nprocs)), pool=True,
+                                      fail_fast=False, callback=callback)
+    for module, payload in jobs:
+        # Do not start new modules after an error
+        if failed:
+            break
+        payloads[id(module)] = payload
+        queue.put(module)
+    queue.wait()
+
+    if failed:
+        return failed[0]
+    return None
+
+############################################################################
+
+
+def _write_map_list_entry(list_file, fs, name, start, end):
+    if not end:
+        end = start
+    # Write the filename, the start_time and the end_time
+    list_file.write("%s%s%s%s%s\n" % (name, fs, start, fs, end))
+
+############################################################################
+
+
+def _export_raster_maps_as_gdal(rows, list_file, fs, format_, type_,
+                                **kwargs):
+    import grass.pygrass.modules as pymod
+
     kwargs = {key: value for key, value in kwargs.items() if value is not None}
     for row in rows:
         name = row["name"]
-        start = row["start_time"]
-        end = row["end_time"]
         max_val = row["max"]
         min_val = row["min"]
         datatype = row["datatype"]
-        if not end:
-            end = start
-        string = "%s%s%s%s%s\n" % (name, fs, start, fs, end)
-        # Write the filename, the start_time and the end_time
-        list_file.write(string)
-
-        try:
-            if format_ == "GTiff":
-                # Export the raster map with r.out.gdal as tif
-                out_name = name + ".tif"
-                if datatype == "CELL" and not type_:
-                    nodata = max_val + 1
-                    if nodata < 256 and min_val >= 0:
-                        gdal_type = "Byte"
-                    elif nodata < 65536 and min_val >= 0:
-                        gdal_type = "UInt16"
-                    elif min_val >= 0:
-                        gdal_type = "UInt32"
-                    else:
-                        gdal_type = "Int32"
-                    gscript.run_command("r.out.gdal", flags="c", input=name,
-                                        output=out_name, nodata=nodata,
-                                        type=gdal_type, format="GTiff",
-                                        **kwargs)
-                elif type_:
-                    gscript.run_command("r.out.gdal", flags="cf", input=name,
-                                        output=out_name,
-                                        type=type_, format="GTiff", **kwargs)
-                else:
-                    gscript.run_command("r.out.gdal", flags="c",
-                                        input=name, output=out_name,
-                                        format="GTiff", **kwargs)
-            elif format_ == "AAIGrid":
-                # Export the raster map with r.out.gdal as Arc/Info ASCII Grid
-                out_name = name + ".asc"
-                gscript.run_command("r.out.gdal", flags="c", input=name,
-                                    output=out_name, format="AAIGrid",
-                                    **kwargs)
-
-        except CalledModuleError:
-            shutil.rmtree(new_cwd)
-            tar.close()
-            gscript.fatal(_("Unable to export raster map <%s>" % name))
+        _write_map_list_entry(list_file, fs, name, row["start_time"],
+                              row["end_time"])
 
-        tar.add(out_name)
+        if format_ == "GTiff":
+            # Export the raster map with r.out.gdal as tif
+            out_name = name + ".tif"
+            if datatype == "CELL" and not type_:
+                nodata = max_val + 1
+                if nodata < 256 and min_val >= 0:
+                    gdal_type = "Byte"
+                elif nodata < 65536 and min_val >= 0:
+                    gdal_type = "UInt16"
+                elif min_val >= 0:
+                    gdal_type = "UInt32"
+                else:
+                    gdal_type = "Int32"
+                module = pymod.Module("r.out.gdal", flags="c", input=name,
+                                      output=out_name, nodata=nodata,
+                                      type=gdal_type, format="GTiff",
+                                      run_=False, finish_=False, **kwargs)
+            elif type_:
+                module = pymod.Module("r.out.gdal", flags="cf", input=name,
+                                      output=out_name, type=type_,
+                                      format="GTiff", run_=False,
+                                      finish_=False, **kwargs)
+            else:
+                module = pymod.Module("r.out.gdal", flags="c", input=name,
+                                      output=out_name, format="GTiff",
+                                      run_=False, finish_=False, **kwargs)
+        elif format_ == "AAIGrid":
+            # Export the raster map with r.out.gdal as Arc/Info ASCII Grid
+            out_name = name + ".asc"
+            module = pymod.Module("r.out.gdal", flags="c", input=name,
+                                  output=out_name, format="AAIGrid",
+                                  run_=False, finish_=False, **kwargs)
+
+        yield module, ([out_name, ],
+                       _("Unable to export raster map <%s>") % name)
 
         # Export the color rules
         out_name = name + ".color"
-        try:
-            gscript.run_command("r.colors.out", map=name, rules=out_name)
-        except CalledModuleError:
-            shutil.rmtree(new_cwd)
-            tar.close()
-            gscript.fatal(_("Unable to export color rules for raster "
-                            "map <%s> r.out.gdal" % name))
-
-        tar.add(out_name)
+        module = pymod.Module("r.colors.out", map=name, rules=out_name,
+                              run_=False, finish_=False)
+        yield module, ([out_name, ],
+                       _("Unable to export color rules for raster "
+                         "map <%s> r.out.gdal") % name)
 
 ############################################################################
 
 
-def _export_raster_maps(rows, tar, list_file, new_cwd, fs):
+def _export_raster_maps(rows, list_file, fs):
+    import grass.pygrass.modules as pymod
+
     for row in rows:
         name = row["name"]
-        start = row["start_time"]
-        end = row["end_time"]
-        if not end:
-            end = start
-        string = "%s%s%s%s%s\n" % (name, fs, start, fs, end)
-        # Write the filename, the start_time and the end_time
-        list_file.write(string)
+        _write_map_list_entry(list_file, fs, name, row["start_time"],
+                              row["end_time"])
         # Export the raster map with r.pack
-        try:
-            gscript.run_command("r.pack", input=name, flags="c")
-        except CalledModuleError:
-            shutil.rmtree(new_cwd)
-            tar.close()
-            gscript.fatal(_("Unable to export raster map <%s> with r.pack" %
-                          name))
-
-        tar.add(name + ".pack")
+        module = pymod.Module("r.pack", input=name, flags="c", run_=False,
+                              finish_=False)
+        yield module, ([name + ".pack", ],
+                       _("Unable to export raster map <%s> with r.pack") %
+                       name)
 
 ############################################################################
 
 
-def _export_vector_maps_as_gml(rows, tar, list_file, new_cwd, fs):
+def _export_vector_maps_as_gml(rows, list_file, fs):
+    import grass.pygrass.modules as pymod
+
     for row in rows:
         name = row["name"]
-        start = row["start_time"]
-        end = row["end_time"]
         layer = row["layer"]
         if not layer:
             layer = 1
-        if not end:
-            end = start
-        string = "%s%s%s%s%s\n" % (name, fs, start, fs, end)
-        # Write the filename, the start_time and the end_time
-        list_file.write(string)
+        _write_map_list_entry(list_file, fs, name, row["start_time"],
+                              row["end_time"])
         # Export the vector map with v.out.ogr
-        try:
-            gscript.run_command("v.out.ogr", input=name, output=(name + ".xml"),
-                                layer=layer, format="GML")
-        except CalledModuleError:
-            shutil.rmtree(new_cwd)
-            tar.close()
-            gscript.fatal(_("Unable to export vector map <%s> as "
-                            "GML with v.out.ogr" % name))
-
-        tar.add(name + ".xml")
-        tar.add(name + ".xsd")
+        module = pymod.Module("v.out.ogr", input=name, output=(name + ".xml"),
+                              layer=layer, format="GML", run_=False,
+                              finish_=False)
+        yield module, ([name + ".xml", name + ".xsd"],
+                       _("Unable to export vector map <%s> as "
+                         "GML with v.out.ogr") % name)
 
 ############################################################################
 
 
-def _export_vector_maps_as_gpkg(rows, tar, list_file, new_cwd, fs):
+def _export_vector_maps_as_gpkg(rows, list_file, fs):
+    import grass.pygrass.modules as pymod
+
     for row in rows:
         name = row["name"]
-        start = row["start_time"]
-        end = row["end_time"]
         layer = row["layer"]
         if not layer:
             layer = 1
-        if not end:
-            end = start
-        string = "%s%s%s%s%s\n" % (name, fs, start, fs, end)
-        # Write the filename, the start_time and the end_time
-        list_file.write(string)
+        _write_map_list_entry(list_file, fs, name, row["start_time"],
+                              row["end_time"])
         # Export the vector map with v.out.ogr
-        try:
-            gscript.run_command("v.out.ogr", input=name, output=(name + ".gpkg"),
-                                layer=layer, format="GPKG")
-        except CalledModuleError:
-            shutil.rmtree(new_cwd)
-            tar.close()
-            gscript.fatal(_("Unable to export vector map <%s> as "
-                            "GPKG with v.out.ogr" % name))
-
-        tar.add(name + ".gpkg")
+        module = pymod.Module("v.out.ogr", input=name,
+                              output=(name + ".gpkg"), layer=layer,
+                              format="GPKG", run_=False, finish_=False)
+        yield module, ([name + ".gpkg", ],
+                       _("Unable to export vector map <%s> as "
+                         "GPKG with v.out.ogr") % name)
 
 ############################################################################
 
 
-def _export_vector_maps(rows, tar, list_file, new_cwd, fs):
+def _export_vector_maps(rows, list_file, fs):
+    import grass.pygrass.modules as pymod
+
     for row in rows:
         name = row["name"]
-        start = row["start_time"]
-        end = row["end_time"]
         layer = row["layer"]
 
         # Export unique maps only
@@ -215,53 +236,87 @@ def _export_vector_maps(rows, tar, list_file, new_cwd, fs):
 
         if not layer:
             layer = 1
-        if not end:
-            end = start
-        string = "%s:%s%s%s%s%s\n" % (name, layer, fs, start, fs, end)
-        # Write the filename, the start_time and the end_time
-        list_file.write(string)
-        # Export the vector map with v.pack
-        try:
-            gscript.run_command("v.pack", input=name, flags="c")
-        except CalledModuleError:
-            shutil.rmtree(new_cwd)
-            tar.close()
-            gscript.fatal(_("Unable to export vector map <%s> with v.pack" %
-                          name))
-
-        tar.add(name + ".pack")
-
+        _write_map_list_entry(list_file, fs, "%s:%s" % (name, layer),
+                              row["start_time"], row["end_time"])
         exported_maps[name] = name
+        # Export the vector map with v.pack
+        module = pymod.Module("v.pack", input=name, flags="c", run_=False,
+                              finish_=False)
+        yield module, ([name + ".pack", ],
+                       _("Unable to export vector map <%s> with v.pack") %
+                       name)
 
 ############################################################################
 
 
-def _export_raster3d_maps(rows, tar, list_file, new_cwd, fs):
+def _export_raster3d_maps(rows, list_file, fs):
+    import grass.pygrass.modules as pymod
+
     for row in rows:
         name = row["name"]
-        start = row["start_time"]
-        end = row["end_time"]
-        if not end:
-            end = start
-        string = "%s%s%s%s%s\n" % (name, fs, start, fs, end)
-        # Write the filename, the start_time and the end_time
-        list_file.write(string)
+        _write_map_list_entry(list_file, fs, name, row["start_time"],
+                              row["end_time"])
         # Export the raster 3d map with r3.pack
-        try:
-            gscript.run_command("r3.pack", input=name, flags="c")
-        except CalledModuleError:
-            shutil.rmtree(new_cwd)
-            tar.close()
-            gscript.fatal(_("Unable to export raster map <%s> with r3.pack" %
-                          name))
+        module = pymod.Module("r3.pack", input=name, flags="c", run_=False,
+                              finish_=False)
+        yield module, ([name + ".pack", ],
+                       _("Unable to export raster map <%s> with r3.pack") %
+                       name)
+
+############################################################################
+
+
+def _open_archive(compression, nprocs=1):
+    """Open the temporary tar archive for writing
+
+       In case several processes are used and pigz or pbzip2 is
+       available, the tar stream is compressed by the multithreaded
+       compressor instead of the tarfile module.
+
+       :return: A tuple of the tarfile object, the compressor process
+                and the archive file, the last two are None in case the
+                tarfile module compresses the archive
+    """
+    if compression == "gzip":
+        flag = "w:gz"
+        compressor = gscript.shutil_which("pigz")
+        args = ["-p", str(nprocs)]
+    elif compression == "bzip2":
+        flag = "w:bz2"
+        compressor = gscript.shutil_which("pbzip2")
+        args = ["-p%d" % nprocs]
+    else:
+        flag = "w:"
+        compressor = None
+
+    if compressor and nprocs > 1:
+        archive = open(tmp_tar_file_name, "wb")
+        process = subprocess.Popen([compressor, "-c"] + args,
+                                   stdin=subprocess.PIPE, stdout=archive)
+        tar = tarfile.open(fileobj=process.stdin, mode="w|")
+        return tar, process, archive
+
+    return tarfile.open(tmp_tar_file_name, flag), None, None
+
 
-        tar.add(name + ".pack")
+def _close_archive(tar, process, archive):
+    """Close the temporary tar archive and wait for the compressor
+
+       :return: True in case the archive was written successfully
+    """
+    tar.close()
+    if process is None:
+        return True
+    process.stdin.close()
+    returncode = process.wait()
+    archive.close()
+    return returncode == 0
 
 ############################################################################
 
 
 def export_stds(input, output, compression, directory, where, format_="pack",
-                type_="strds", datatype=None, **kwargs):
+                type_="strds", datatype=None, nprocs=1, **kwargs):
     """Export space time datasets as tar archive with optional compression
 
         This method should be used to export space time datasets
@@ -296,6 +351,10 @@ def export_stds(input, output, compression, directory, where, format_="pack",
               - "str3ds" Space time 3D raster dataset
               - "stvds" Space time vector dataset
         :param datatype: Force the output datatype for r.out.gdal
+        :param nprocs: The number of maps that are exported in parallel,
+                       each exported file is added to the archive and
+                       removed as soon as it is written. The archive is
+                       compressed with pigz or pbzip2 if available.
     """
 
     # Save current working directory path
@@ -315,36 +374,47 @@ def export_stds(input, output, compression, directory, where, format_="pack",
     sp = open_old_stds(input, type_)
     rows = sp.get_registered_maps(columns, where, "start_time", None)
 
-    if compression == "gzip":
-        flag = "w:gz"
-    elif compression == "bzip2":
-        flag = "w:bz2"
-    else:
-        flag = "w:"
+    nprocs = max(1, int(nprocs))
 
     # Open the tar archive to add the files
-    tar = tarfile.open(tmp_tar_file_name, flag)
+    tar, compressor, archive = _open_archive(compression, nprocs)
     list_file = open(list_file_name, "w")
 
     fs = "|"
 
+    def add_files(payload):
+        # Stream the exported files into the archive and remove them
+        files, message = payload
+        for name in files:
+            tar.add(name)
+            os.remove(name)
+
+    jobs = None
     if rows:
         if type_ == "strds":
             if format_ == "GTiff" or format_ == "AAIGrid":
-                _export_raster_maps_as_gdal(
-                    rows, tar, list_file, new_cwd, fs, format_, datatype,
-                    **kwargs)
+                jobs = _export_raster_maps_as_gdal(
+                    rows, list_file, fs, format_, datatype, **kwargs)
             else:
-                _export_raster_maps(rows, tar, list_file, new_cwd, fs)
+                jobs = _export_raster_maps(rows, list_file, fs)
         elif type_ == "stvds":
             if format_ == "GML":
-                _export_vector_maps_as_gml(rows, tar, list_file, new_cwd, fs)
+                jobs = _export_vector_maps_as_gml(rows, list_file, fs)
             elif format_ == "GPKG":
-                _export_vector_maps_as_gpkg(rows, tar, list_file, new_cwd, fs)
+                jobs = _export_vector_maps_as_gpkg(rows, list_file, fs)
             else:
-                _export_vector_maps(rows, tar, list_file, new_cwd, fs)
+                jobs = _export_vector_maps(rows, list_file, fs)
         elif type_ == "str3ds":
-            _export_raster3d_maps(rows, tar, list_file, new_cwd, fs)
+            jobs = _export_raster3d_maps(rows, list_file, fs)
+
+    if jobs is not None:
+        error = _run_map_jobs(jobs, nprocs, add_files)
+        if error is not None:
+            list_file.close()
+            _close_archive(tar, compressor, archive)
+            os.chdir(old_cwd)
+            shutil.rmtree(new_cwd)
+            gscript.fatal(error[1])
 
     list_file.close()
 
@@ -430,7 +500,10 @@ def export_stds(input, output, compression, directory, where, format_="pack",
     tar.add(init_file_name)
     tar.add(read_file_name)
     tar.add(metadata_file_name)
-    tar.close()
+    if not _close_archive(tar, compressor, archive):
+        os.chdir(old_cwd)
+        shutil.rmtree(new_cwd)
+        gscript.fatal(_("Unable to compress the archive <%s>") % output)
 
     os.chdir(old_cwd)
 
@@ -36,6 +36,7 @@ import tarfile
 from .core import get_current_mapset, get_tgis_message_interface
 from .register import register_maps_in_space_time_dataset
 from .factory import dataset_factory
+from .stds_export import _run_map_jobs
 import grass.script as gscript
 from grass.exceptions import CalledModuleError
 
@@ -52,75 +53,93 @@ imported_maps = {}
 
 
 def _import_raster_maps_from_gdal(maplist, overr, exp, location, link, format_,
-                                  set_current_region=False, memory=300):
+                                  set_current_region=False, memory=300,
+                                  nprocs=1):
+    import grass.pygrass.modules as pymod
+
     impflags = ""
     if overr:
         impflags += "o"
     if exp or location:
         impflags += "e"
-    for row in maplist:
-        name = row["name"]
-        if format_ == "GTiff":
-            filename = row["filename"] + ".tif"
-        elif format_ == "AAIGrid":
-            filename = row["filename"] + ".asc"
-            if not overr:
-                impflags += "o"
+    if format_ == "AAIGrid" and not overr:
+        impflags += "o"
+
+    def import_jobs():
+        for row in maplist:
+            name = row["name"]
+            if format_ == "GTiff":
+                filename = row["filename"] + ".tif"
+            elif format_ == "AAIGrid":
+                filename = row["filename"] + ".asc"
 
-        try:
             if link:
-                gscript.run_command("r.external", input=filename,
-                                    output=name,
-                                    flags=impflags,
-                                    overwrite=gscript.overwrite())
+                module = pymod.Module("r.external", input=filename,
+                                      output=name, flags=impflags,
+                                      overwrite=gscript.overwrite(),
+                                      run_=False, finish_=False)
             else:
-                gscript.run_command("r.in.gdal", input=filename,
-                                    output=name, memory=memory,
-                                    flags=impflags,
-                                    overwrite=gscript.overwrite())
-
-        except CalledModuleError:
-            gscript.fatal(_("Unable to import/link raster map <%s> from file"
-                            " %s.") % (name, filename))
-
+                module = pymod.Module("r.in.gdal", input=filename,
+                                      output=name, memory=memory,
+                                      flags=impflags,
+                                      overwrite=gscript.overwrite(),
+                                      run_=False, finish_=False)
+            yield module, _("Unable to import/link raster map <%s> from file"
+                            " %s.") % (name, filename)
+
+    def color_jobs():
         # Set the color rules if present
-        filename = row["filename"] + ".color"
-        if os.path.isfile(filename):
-            try:
-                gscript.run_command("r.colors", map=name,
-                                    rules=filename,
-                                    overwrite=gscript.overwrite())
-            except CalledModuleError:
-                gscript.fatal(_("Unable to set the color rules for "
-                                "raster map <%s>.") % name)
+        for row in maplist:
+            name = row["name"]
+            filename = row["filename"] + ".color"
+            if os.path.isfile(filename):
+                module = pymod.Module("r.colors", map=name, rules=filename,
+                                      overwrite=gscript.overwrite(),
+                                      run_=False, finish_=False)
+                yield module, _("Unable to set the color rules for "
+                                "raster map <%s>.") % name
+
+    # The e flag reads, extends and writes the region of the mapset,
+    # concurrent runs would overwrite the extensions of each other
+    import_nprocs = 1 if "e" in impflags else nprocs
+    for jobs, procs in ((import_jobs(), import_nprocs),
+                        (color_jobs(), nprocs)):
+        error = _run_map_jobs(jobs, procs)
+        if error is not None:
+            gscript.fatal(error)
 
     # Set the computational region from the last map imported
-    if set_current_region is True:
-        gscript.run_command("g.region", raster=name)
+    if set_current_region is True and maplist:
+        gscript.run_command("g.region", raster=maplist[-1]["name"])
 
 ############################################################################
 
 
-def _import_raster_maps(maplist, set_current_region=False):
+def _import_raster_maps(maplist, set_current_region=False, nprocs=1):
+    import grass.pygrass.modules as pymod
+
     # We need to disable the projection check because of its
     # simple implementation
     impflags = "o"
-    for row in maplist:
-        name = row["name"]
-        filename = row["filename"] + ".pack"
-        try:
-            gscript.run_command("r.unpack", input=filename,
-                                output=name, flags=impflags,
-                                overwrite=gscript.overwrite(),
-                                verbose=True)
 
-        except CalledModuleError:
-            gscript.fatal(_("Unable to unpack raster map <%s> from file "
-                            "%s.") % (name, filename))
+    def jobs():
+        for row in maplist:
+            name = row["name"]
+            filename = row["filename"] + ".pack"
+            module = pymod.Module("r.unpack", input=filename, output=name,
+                                  flags=impflags,
+                                  overwrite=gscript.overwrite(), verbose=True,
+                                  run_=False, finish_=False)
+            yield module, _("Unable to unpack raster map <%s> from file "
+                            "%s.") % (name, filename)
+
+    error = _run_map_jobs(jobs(), nprocs)
+    if error is not None:
+        gscript.fatal(error)
 
     # Set the computational region from the last map imported
-    if set_current_region is True:
-        gscript.run_command("g.region", raster=name)
+    if set_current_region is True and maplist:
+        gscript.run_command("g.region", raster=maplist[-1]["name"])
 
 ############################################################################
 
@@ -173,7 +192,7 @@ def _import_vector_maps(maplist):
 def import_stds(input, output, directory, title=None, descr=None, location=None,
                 link=False, exp=False, overr=False, create=False,
                 stds_type="strds", base=None, set_current_region=False,
-                memory=300):
+                memory=300, nprocs=1):
     """Import space time datasets of type raster and vector
 
         :param input: Name of the input archive file
@@ -195,6 +214,9 @@ def import_stds(input, output, directory, title=None, descr=None, location=None,
         :param base: The base name of the new imported maps, it will be
                      extended using a numerical index.
         :param memory: Cache size for raster rows, used in r.in.gdal
+        :param nprocs: The number of raster maps that are imported in
+                       parallel, vector maps are imported one after the
+                       other since they share the attribute database
     """
 
     old_state = gscript.raise_on_error
@@ -439,9 +461,9 @@ def import_stds(input, output, directory, title=None, descr=None, location=None,
             if format_ == "GTiff" or format_ == "AAIGrid":
                 _import_raster_maps_from_gdal(maplist, overr, exp, location,
                                               link, format_, set_current_region,
-                                              memory)
+                                              memory, nprocs)
             if format_ == "pack":
-                _import_raster_maps(maplist, set_current_region)
+                _import_raster_maps(maplist, set_current_region, nprocs)
         elif type_ == "stvds":
             if format_ == "GML":
                 _import_vector_maps_from_gml(
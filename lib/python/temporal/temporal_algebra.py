@@ -440,12 +440,6 @@ for details.
 """
 from __future__ import print_function
 
-try:
-    import ply.lex as lex
-    import ply.yacc as yacc
-except:
-    pass
-
 import os
 import sys
 import copy
@@ -460,7 +454,8 @@ from .abstract_map_dataset import AbstractMapDataset
 from .space_time_datasets import RasterDataset
 from .factory import dataset_factory
 from .open_stds import open_new_stds, open_old_stds
-from .temporal_operator import TemporalOperatorParser
+from .temporal_operator import TemporalOperatorParser, build_algebra_lexer,\
+    build_algebra_parser
 from .spatio_temporal_relationships import SpatioTemporalTopologyBuilder
 from .datetime_math import time_delta_to_relative_time, string_to_datetime
 from .abstract_space_time_dataset import AbstractSpaceTimeDataset
@@ -674,8 +669,7 @@ class TemporalAlgebraLexer(object):
 
     # Build the lexer
     def build(self,**kwargs):
-        self.lexer = lex.lex(module=self, optimize=False,
-                             nowarn=True, debug=0, **kwargs)
+        self.lexer = build_algebra_lexer(self, **kwargs)
 
     # Just for testing
     def test(self,data):
@@ -784,6 +778,8 @@ class TemporalAlgebraParser(object):
         self.m_copy = pymod.Module('g.copy')
         self.nprocs = nprocs
         self.use_granularity = False
+        # The parser is built on the first call of parse()
+        self.parser = None
         self.time_suffix = time_suffix
 
         # Topology lists
@@ -895,7 +891,8 @@ class TemporalAlgebraParser(object):
         """
         self.lexer = TemporalAlgebraLexer()
         self.lexer.build()
-        self.parser = yacc.yacc(module=self, debug=self.debug, write_tables=False)
+        if self.parser is None:
+            self.parser = build_algebra_parser(self, self.debug)
 
         self.overwrite = overwrite
         self.count = 0
@@ -904,7 +901,7 @@ class TemporalAlgebraParser(object):
         self.mapclass = mapclass
         self.basename = basename
         self.expression = expression
-        self.parser.parse(expression)
+        self.parser.parse(expression, lexer=self.lexer.lexer)
 
         return self.process_chain_dict
 
@@ -2196,7 +2193,7 @@ class TemporalAlgebraParser(object):
                     leadzero = len(str(num))
 
                     if self.dry_run is False:
-                        process_queue = pymod.ParallelModuleQueue(int(self.nprocs))
+                        process_queue = pymod.ParallelModuleQueue(int(self.nprocs), pool=True)
 
                     for map_i in t[3]:
                         # Check if the map type and stds type are compatible
@@ -147,6 +147,106 @@ try:
 except:
     pass
 
+import hashlib
+import os
+import sys
+
+from grass.script.utils import get_cache_dir
+
+# The lexers built for each lexer class, they are cloned for new objects
+_lexer_cache = {}
+
+
+def build_algebra_lexer(module, **kwargs):
+    """Build a PLY lexer for the rules of a lexer object
+
+       The lexer is built once for each lexer class in optimized mode and
+       cloned for each further object of this class. In case keyword
+       arguments are provided, a new lexer is always built.
+
+       :param module: The lexer object that provides the token rules
+       :param kwargs: Additional keyword arguments for lex.lex()
+       :return: The PLY lexer
+    """
+    if kwargs:
+        return lex.lex(module=module, optimize=True, lextab=None,
+                       nowarn=True, debug=0, **kwargs)
+
+    lexer = _lexer_cache.get(type(module))
+    if lexer is None:
+        lexer = lex.lex(module=module, optimize=True, lextab=None,
+                        nowarn=True, debug=0)
+        _lexer_cache[type(module)] = lexer
+    return lexer.clone(module)
+
+
+def _grammar_key(module):
+    """Return a key that changes whenever the grammar of module changes"""
+    parts = [sys.version_info[0], getattr(yacc, '__version__', None),
+             getattr(module, 'start', None), getattr(module, 'precedence', None),
+             sorted(module.tokens)]
+    for name in sorted(dir(module)):
+        if name.startswith('p_'):
+            parts.append((name, getattr(getattr(module, name), '__doc__', None)))
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def build_algebra_parser(module, debug=False):
+    """Build a PLY parser for the grammar of a parser object
+
+       Generating the LALR tables of the algebra grammars is expensive,
+       hence the tables are pickled in the parser table cache directory
+       (see the GRASS_TGIS_PARSER_CACHE variable). The file name includes a
+       key of the grammar, so that the tables are generated once for each
+       grammar version. The grammar actions are bound to module.
+
+       :param module: The parser object that provides the grammar rules
+       :param debug: Build the parser in debug mode, the cache is not
+                     used in this case
+       :return: The PLY parser
+    """
+    # the GRASS_TGIS_PARSER_CACHE variable sets the directory of the
+    # on-disk cache, an empty value disables it
+    cache_dir = get_cache_dir('tgis_parser_cache', 'GRASS_TGIS_PARSER_CACHE')
+    if debug or not cache_dir:
+        return yacc.yacc(module=module, debug=debug, write_tables=False)
+
+    picklefile = os.path.join(cache_dir, '%s_%s.pickle' % (
+        type(module).__name__, _grammar_key(module)))
+
+    if os.path.isfile(picklefile):
+        try:
+            return yacc.yacc(module=module, debug=False,
+                             write_tables=False, picklefile=picklefile)
+        except Exception:
+            # A broken cache file is replaced below
+            pass
+
+    # Write to a private file first, concurrent processes
+    # must never read partially written tables
+    tmp_file = '%s.%d' % (picklefile, os.getpid())
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+    except OSError:
+        return yacc.yacc(module=module, debug=False, write_tables=False)
+
+    parser = yacc.yacc(module=module, debug=False, write_tables=False,
+                       picklefile=tmp_file)
+    try:
+        if os.path.isfile(picklefile):
+            os.remove(picklefile)
+        os.rename(tmp_file, picklefile)
+    except OSError:
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+    return parser
+
+###############################################################################
+
+
 class TemporalOperatorLexer(object):
     """Lexical analyzer for the GRASS GIS temporal operator"""
 
@@ -268,8 +368,7 @@ class TemporalOperatorLexer(object):
 
     # Build the lexer
     def build(self,**kwargs):
-        self.lexer = lex.lex(module=self, optimize=False,
-                             nowarn=True, debug=0, **kwargs)
+        self.lexer = build_algebra_lexer(self, **kwargs)
 
     # Just for testing
     def test(self,data):
@@ -289,7 +388,7 @@ class TemporalOperatorParser(object):
     def __init__(self):
         self.lexer = TemporalOperatorLexer()
         self.lexer.build()
-        self.parser = yacc.yacc(module=self, debug=0)
+        self.parser = build_algebra_parser(self)
         self.relations = None   # Temporal relations (equals, contain, during, ...)
         self.temporal  = None   # Temporal operation (intersect, left, right, ...)
         self.function  = None   # Actual operation (+, -, /, *, ... )
@@ -315,7 +414,7 @@ class TemporalOperatorParser(object):
         if optype not in self.optype_list:
             raise SyntaxError("Unknown optype %s, must be one of %s"%(self.optype, str(self.optype_list)))
         self.expression = expression
-        self.parser.parse(expression)
+        self.parser.parse(expression, lexer=self.lexer.lexer)
 
     # Error rule for syntax errors.
     def p_error(self, t):
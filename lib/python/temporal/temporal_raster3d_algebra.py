@@ -12,16 +12,11 @@ for details.
 """
 from __future__ import print_function
 
-try:
-    import ply.lex as lex
-    import ply.yacc as yacc
-except:
-    pass
-
 from .temporal_raster_base_algebra import TemporalRasterBaseAlgebraParser,\
     TemporalRasterAlgebraLexer
 import grass.pygrass.modules as pymod
 from .space_time_datasets import Raster3DDataset
+from .temporal_operator import build_algebra_parser
 
 
 ###############################################################################
@@ -30,11 +25,12 @@ class TemporalRaster3DAlgebraParser(TemporalRasterBaseAlgebraParser):
     """The temporal raster algebra class"""
 
     def __init__(self, pid=None, run=False, debug=True, spatial=False,
-                 register_null=False, dry_run=False, nprocs=1):
+                 register_null=False, dry_run=False, nprocs=1, batch=1):
 
         TemporalRasterBaseAlgebraParser.__init__(self, pid=pid, run=run, debug=debug,
                                                  spatial=spatial, register_null=register_null,
-                                                 dry_run=dry_run, nprocs=nprocs)
+                                                 dry_run=dry_run, nprocs=nprocs,
+                                                 batch=batch)
 
         self.m_mapcalc = pymod.Module('r3.mapcalc')
         self.m_mremove = pymod.Module('g.remove')
@@ -54,7 +50,8 @@ class TemporalRaster3DAlgebraParser(TemporalRasterBaseAlgebraParser):
 
         self.lexer = TemporalRasterAlgebraLexer()
         self.lexer.build()
-        self.parser = yacc.yacc(module=self, debug=self.debug, write_tables=False)
+        if self.parser is None:
+            self.parser = build_algebra_parser(self, self.debug)
 
         self.overwrite = overwrite
         self.count = 0
@@ -63,7 +60,7 @@ class TemporalRaster3DAlgebraParser(TemporalRasterBaseAlgebraParser):
         self.mapclass = Raster3DDataset
         self.basename = basename
         self.expression = expression
-        self.parser.parse(expression)
+        self.parser.parse(expression, lexer=self.lexer.lexer)
 
         return self.process_chain_dict
 
@@ -53,16 +53,11 @@ for details.
 """
 from __future__ import print_function
 
-try:
-    import ply.lex as lex
-    import ply.yacc as yacc
-except:
-    pass
-
 from .temporal_raster_base_algebra import TemporalRasterBaseAlgebraParser,\
     TemporalRasterAlgebraLexer
 import grass.pygrass.modules as pymod
 from .space_time_datasets import RasterDataset
+from .temporal_operator import build_algebra_parser
 
 ###############################################################################
 
@@ -70,12 +65,13 @@ class TemporalRasterAlgebraParser(TemporalRasterBaseAlgebraParser):
     """The temporal raster algebra class"""
 
     def __init__(self, pid=None, run=False, debug=True, spatial=False,
-                 register_null=False, dry_run=False, nprocs=1, time_suffix=None):
+                 register_null=False, dry_run=False, nprocs=1, time_suffix=None,
+                 batch=1):
 
         TemporalRasterBaseAlgebraParser.__init__(self, pid=pid, run=run, debug=debug,
                                                  spatial=spatial, register_null=register_null,
                                                  dry_run=dry_run, nprocs=nprocs,
-                                                 time_suffix=time_suffix)
+                                                 time_suffix=time_suffix, batch=batch)
 
         if spatial is True:
             self.m_mapcalc = pymod.Module('r.mapcalc', region="union", run_=False)
@@ -98,7 +94,8 @@ class TemporalRasterAlgebraParser(TemporalRasterBaseAlgebraParser):
 
         self.lexer = TemporalRasterAlgebraLexer()
         self.lexer.build()
-        self.parser = yacc.yacc(module=self, debug=self.debug, write_tables=False)
+        if self.parser is None:
+            self.parser = build_algebra_parser(self, self.debug)
 
         self.overwrite = overwrite
         self.count = 0
@@ -107,7 +104,7 @@ class TemporalRasterAlgebraParser(TemporalRasterBaseAlgebraParser):
         self.mapclass = RasterDataset
         self.basename = basename
         self.expression = expression
-        self.parser.parse(expression)
+        self.parser.parse(expression, lexer=self.lexer.lexer)
 
         return self.process_chain_dict
 
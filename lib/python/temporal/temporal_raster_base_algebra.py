@@ -162,7 +162,7 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                  debug=False, spatial=False,
                  register_null=False,
                  dry_run=False, nprocs=1,
-                 time_suffix=None):
+                 time_suffix=None, batch=1):
 
         TemporalAlgebraParser.__init__(self,
                                        pid=pid,
@@ -173,6 +173,9 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                                        dry_run=dry_run,
                                        nprocs=nprocs,
                                        time_suffix=time_suffix)
+        # The number of time steps that are computed in a single
+        # r.mapcalc or r3.mapcalc run
+        self.batch = batch
 
     def check_null(self, t):
         try:
@@ -626,6 +629,36 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
 
     ###########################################################################
 
+    def put_mapcalc_expressions(self, expressions, process_queue=None):
+        """Create the r.mapcalc modules for a list of map expressions
+
+           Up to batch expressions are fused into a single r.mapcalc run,
+           separated by semicolons. A fused run starts a single process and
+           opens input maps that are shared by several time steps only once.
+           The union region of the spatial raster algebra spans all input
+           maps of a run, hence each expression gets its own run in this case.
+
+           :param expressions: A list of "newmap = expression" strings
+           :param process_queue: The ParallelModuleQueue the modules are put
+                                 into, in case of None the modules are only
+                                 added to the process chain
+        """
+        batch = max(1, int(self.batch))
+        if "region" in self.m_mapcalc.inputs and \
+                self.m_mapcalc.inputs["region"].value == "union":
+            batch = 1
+
+        for i in range(0, len(expressions), batch):
+            m = copy.deepcopy(self.m_mapcalc)
+            m.inputs["expression"].value = str(";".join(expressions[i:i + batch]))
+            m.flags["overwrite"].value = self.overwrite
+            if self.debug:
+                print(m.get_bash())
+            self.process_chain_dict["processes"].append(m.get_dict())
+
+            if process_queue is not None:
+                process_queue.put(m)
+
     def p_statement_assign(self, t):
         # This function executes the processing of raster/raster3d algebra
         # that was build based on the expression
@@ -635,7 +668,7 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
         if self.run:
             # Create the process queue for parallel mapcalc processing
             if self.dry_run is False:
-                process_queue = pymod.ParallelModuleQueue(int(self.nprocs))
+                process_queue = pymod.ParallelModuleQueue(int(self.nprocs), pool=True)
 
             if isinstance(t[3], list):
 
@@ -681,6 +714,7 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                 # The second loop creates the resulting raster maps
                 count = 0
                 map_test_list = []
+                expressions = []
                 for map_i in t[3]:
 
                     # Create new map with basename
@@ -708,16 +742,7 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                         new_map.set_spatial_extent(map_i.get_spatial_extent())
                         map_test_list.append(new_map)
 
-                        m = copy.deepcopy(self.m_mapcalc)
-                        m_expression = newident + "=" + map_i.cmd_list
-                        m.inputs["expression"].value = str(m_expression)
-                        m.flags["overwrite"].value = self.overwrite
-                        if self.debug:
-                            print(m.get_bash())
-                        self.process_chain_dict["processes"].append(m.get_dict())
-
-                        if self.dry_run is False:
-                            process_queue.put(m)
+                        expressions.append(newident + "=" + map_i.cmd_list)
 
                     elif map_i.map_exists():
                         # Copy map if it exists b = a
@@ -726,23 +751,17 @@ class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
                         new_map.set_spatial_extent(map_i.get_spatial_extent())
                         map_test_list.append(new_map)
 
-                        m = copy.deepcopy(self.m_mapcalc)
-                        m_expression = newident + "=" + map_i.get_map_id()
-                        m.inputs["expression"].value = str(m_expression)
-                        m.flags["overwrite"].value = self.overwrite
-                        if self.debug:
-                            print(m.get_bash())
-                        self.process_chain_dict["processes"].append(m.get_dict())
-
-                        if self.dry_run is False:
-                            process_queue.put(m)
+                        expressions.append(newident + "=" + map_i.get_map_id())
 
                     else:
                         self.msgr.error(_("Error computing map <%s>"%map_i.get_id()))
                     count += 1
 
                 if self.dry_run is False:
+                    self.put_mapcalc_expressions(expressions, process_queue)
                     process_queue.wait()
+                else:
+                    self.put_mapcalc_expressions(expressions)
 
                 for map_i in map_test_list:
                     register_list.append(map_i)
@@ -116,8 +116,25 @@ class TemporalTopologyDatasetConnector(object):
     def reset_temporal_topology(self):
         """Reset any information about temporal topology"""
         self._temporal_topology = {}
+        # The ids of the related maps for fast membership tests
+        self._temporal_members = {}
         self._has_temporal_topology = False
 
+    def _append_temporal_relation(self, relation, map):
+        """Append a map to the list of a temporal relation, a map that is
+           already part of the relation is not appended again
+
+           :param relation: The name of the relation in upper case
+           :param map: This object should be of type AbstractMapDataset
+                       or derived classes
+        """
+        if relation not in self._temporal_topology:
+            self._temporal_topology[relation] = []
+            self._temporal_members[relation] = set()
+        if id(map) not in self._temporal_members[relation]:
+            self._temporal_members[relation].add(id(map))
+            self._temporal_topology[relation].append(map)
+
     def get_temporal_relations(self):
         """Return the dictionary of temporal relationships
 
@@ -265,9 +282,7 @@ class TemporalTopologyDatasetConnector(object):
            :param map: This object should be of type AbstractMapDataset
                        or derived classes
         """
-        if "EQUAL" not in self._temporal_topology:
-            self._temporal_topology["EQUAL"] = []
-        self._temporal_topology["EQUAL"].append(map)
+        self._append_temporal_relation("EQUAL", map)
 
     def get_equal(self):
         """Return a list of map objects with equivalent temporal extent as
@@ -285,9 +300,7 @@ class TemporalTopologyDatasetConnector(object):
            :param map: This object should be of type AbstractMapDataset
                        or derived classes
         """
-        if "STARTS" not in self._temporal_topology:
-            self._temporal_topology["STARTS"] = []
-        self._temporal_topology["STARTS"].append(map)
+        self._append_temporal_relation("STARTS", map)
 
     def get_starts(self):
         """Return a list of map objects that this map temporally starts with
@@ -304,9 +317,7 @@ class TemporalTopologyDatasetConnector(object):
            :param map: This object should be of type AbstractMapDataset
                        or derived classes
         """
-        if "STARTED" not in self._temporal_topology:
-            self._temporal_topology["STARTED"] = []
-        self._temporal_topology["STARTED"].append(map)
+        self._append_temporal_relation("STARTED", map)
 
     def get_started(self):
         """Return a list of map objects that this map temporally started with
@@ -323,9 +334,7 @@ class TemporalTopologyDatasetConnector(object):
            :param map: This object should be of type AbstractMapDataset
                        or derived classes
         """
-        if "FINISHES" not in self._temporal_topology:
-            self._temporal_topology["FINISHES"] = []
-        self._temporal_topology["FINISHES"].append(map)
+        self._append_temporal_relation("FINISHES", map)
 
     def get_finishes(self):
         """Return a list of map objects that this map temporally finishes with
@@ -342,9 +351,7 @@ class TemporalTopologyDatasetConnector(object):
            :param map: This object should be of type AbstractMapDataset
                        or derived classes
         """
-        if "FINISHED" not in self._temporal_topology:
-            self._temporal_topology["FINISHED"] = []
-        self._temporal_topology["FINISHED"].append(map)
+        self._append_temporal_relation("FINISHED", map)
 
     def get_finished(self):
         """Return a list of map objects that this map temporally finished with
@@ -361,9 +368,7 @@ class TemporalTopologyDatasetConnector(object):
            :param map: This object should be of type AbstractMapDataset
                        or derived classes
         """
-        if "OVERLAPS" not in self._temporal_topology:
-            self._temporal_topology["OVERLAPS"] = []
-        self._temporal_topology["OVERLAPS"].append(map)
+        self._append_temporal_relation("OVERLAPS", map)
 
     def get_overlaps(self):
         """Return a list of map objects that this map temporally overlaps
@@ -380,9 +385,7 @@ class TemporalTopologyDatasetConnector(object):
            :param map: This object should be of type AbstractMapDataset
                        or derived classes
         """
-        if "OVERLAPPED" not in self._temporal_topology:
-            self._temporal_topology["OVERLAPPED"] = []
-        self._temporal_topology["OVERLAPPED"].append(map)
+        self._append_temporal_relation("OVERLAPPED", map)
 
     def get_overlapped(self):
         """Return a list of map objects that this map temporally overlapped
@@ -399,9 +402,7 @@ class TemporalTopologyDatasetConnector(object):
            :param map: This object should be of type AbstractMapDataset
                        or derived classes
         """
-        if "FOLLOWS" not in self._temporal_topology:
-            self._temporal_topology["FOLLOWS"] = []
-        self._temporal_topology["FOLLOWS"].append(map)
+        self._append_temporal_relation("FOLLOWS", map)
 
     def get_follows(self):
         """Return a list of map objects that this map temporally follows
@@ -418,9 +419,7 @@ class TemporalTopologyDatasetConnector(object):
            :param map: This object should be of type AbstractMapDataset
                        or derived classes
         """
-        if "PRECEDES" not in self._temporal_topology:
-            self._temporal_topology["PRECEDES"] = []
-        self._temporal_topology["PRECEDES"].append(map)
+        self._append_temporal_relation("PRECEDES", map)
 
     def get_precedes(self):
         """Return a list of map objects that this map temporally precedes
@@ -438,9 +437,7 @@ class TemporalTopologyDatasetConnector(object):
            :param map: This object should be of type
                        AbstractMapDataset or derived classes
         """
-        if "DURING" not in self._temporal_topology:
-            self._temporal_topology["DURING"] = []
-        self._temporal_topology["DURING"].append(map)
+        self._append_temporal_relation("DURING", map)
 
     def get_during(self):
         """Return a list of map objects that this map is temporally located during
@@ -459,9 +456,7 @@ class TemporalTopologyDatasetConnector(object):
            :param map: This object should be of type AbstractMapDataset
                        or derived classes
         """
-        if "CONTAINS" not in self._temporal_topology:
-            self._temporal_topology["CONTAINS"] = []
-        self._temporal_topology["CONTAINS"].append(map)
+        self._append_temporal_relation("CONTAINS", map)
 
     def get_contains(self):
         """Return a list of map objects that this map temporally contains
@@ -43,12 +43,6 @@ for details.
 """
 from __future__ import print_function
 
-try:
-    import ply.lex as lex
-    import ply.yacc as yacc
-except:
-    pass
-
 import grass.pygrass.modules as pygrass
 
 import copy
@@ -58,6 +52,7 @@ from .abstract_dataset import AbstractDatasetComparisonKeyStartTime
 from .open_stds import open_new_stds
 from .spatio_temporal_relationships import SpatioTemporalTopologyBuilder
 from .space_time_datasets import VectorDataset
+from .temporal_operator import build_algebra_parser
 
 
 ##############################################################################
@@ -149,7 +144,8 @@ class TemporalVectorAlgebraParser(TemporalAlgebraParser):
 
         self.lexer = TemporalVectorAlgebraLexer()
         self.lexer.build()
-        self.parser = yacc.yacc(module=self, debug=self.debug, write_tables=False)
+        if self.parser is None:
+            self.parser = build_algebra_parser(self, self.debug)
 
         self.overwrite = overwrite
         self.count = 0
@@ -158,7 +154,7 @@ class TemporalVectorAlgebraParser(TemporalAlgebraParser):
         self.mapclass = VectorDataset
         self.basename = basename
         self.expression = expression
-        self.parser.parse(expression)
+        self.parser.parse(expression, lexer=self.lexer.lexer)
 
     ######################### Temporal functions ##############################
 
@@ -10,6 +10,7 @@ for details.
 """
 
 import grass.temporal as tgis
+from grass.temporal.register import _select_ids_in_db
 from grass.gunittest.case import TestCase
 from grass.gunittest.main import test
 import datetime
@@ -388,6 +389,52 @@ class TestRasterRegisterFunctions(TestCase):
         self.assertEqual(end, 2000000)
         self.assertEqual(unit, "seconds")
 
+    def test_bulk_registration(self):
+        """Test the registration of new, already registered and duplicate
+           maps in a single call
+        """
+        mapset = tgis.get_current_mapset()
+        map_ids = ["register_map_1@" + mapset, "register_map_2@" + mapset]
+
+        tgis.register_maps_in_space_time_dataset(type="raster", name=self.strds_abs.get_name(),
+                 maps="register_map_1", start="2001-01-01", increment="1 day",
+                 interval=True)
+        tgis.register_maps_in_space_time_dataset(type="raster", name=self.strds_abs.get_name(),
+                 maps="register_map_1,register_map_2,register_map_2",
+                 start="2001-01-01", increment="1 day", interval=True)
+
+        self.strds_abs.select()
+        self.assertEqual(self.strds_abs.metadata.get_number_of_maps(), 2)
+        start, end = self.strds_abs.get_absolute_time()
+        self.assertEqual(start, datetime.datetime(2001, 1, 1))
+        self.assertEqual(end, datetime.datetime(2001, 1, 3))
+
+        # Each map is listed once in the register table of the dataset
+        dbif = tgis.SQLDatabaseInterfaceConnection()
+        dbif.connect()
+        dbif.execute("SELECT id FROM " + self.strds_abs.get_map_register())
+        rows = dbif.fetchall()
+        self.assertEqual(sorted(row[0] for row in rows), map_ids)
+
+        maps = []
+        for map_id in map_ids:
+            map = tgis.RasterDataset(map_id)
+            map.select(dbif)
+            self.assertEqual(map.get_registered_stds(dbif),
+                             [self.strds_abs.get_id()])
+            maps.append(map)
+
+        # Maps that are already registered are skipped
+        self.assertEqual(self.strds_abs.register_maps(maps + maps, dbif=dbif), 0)
+        self.strds_abs.select(dbif)
+        self.assertEqual(self.strds_abs.metadata.get_number_of_maps(), 2)
+
+        # The chunked lookup of the maps in the temporal database
+        new_map = tgis.RasterDataset("register_map_null@" + mapset)
+        ids_in_db = _select_ids_in_db(dbif, maps + [new_map])
+        self.assertEqual(ids_in_db, set(map_ids))
+        dbif.close()
+
 
 class TestVectorRegisterFunctions(TestCase):
 
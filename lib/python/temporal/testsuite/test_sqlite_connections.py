@@ -0,0 +1,96 @@
+"""Unit test of the long-lived sqlite connections of the temporal database
+
+(C) 2020 by the GRASS Development Team
+This program is free software under the GNU General Public
+License (>=v2). Read the file COPYING that comes with GRASS
+for details.
+
+:authors: GRASS Development Team
+"""
+
+import os
+import threading
+
+import grass.temporal as tgis
+from grass.gunittest.case import TestCase
+from grass.gunittest.main import test
+
+
+class TestSQLiteConnections(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Initiate the temporal GIS
+        """
+        tgis.init()
+
+    def setUp(self):
+        """Start each test with new connections
+        """
+        if tgis.get_tgis_backend() != "sqlite":
+            self.skipTest("The temporal database backend is not sqlite")
+        self.mapset = tgis.get_current_mapset()
+        tgis.close_sqlite_connections()
+
+    def tearDown(self):
+        """Remove the pragma settings and the connections using them
+        """
+        os.environ.pop("GRASS_TGIS_SQLITE_PRAGMAS", None)
+        tgis.close_sqlite_connections()
+
+    def connect(self):
+        dbif = tgis.SQLDatabaseInterfaceConnection()
+        dbif.connect()
+        return dbif
+
+    def test_shared_connection(self):
+        """Test that the connections of one thread share the sqlite
+           connection and that other threads use their own
+        """
+        dbif1 = self.connect()
+        dbif2 = self.connect()
+        connection = dbif1.connections[self.mapset].connection
+        self.assertIs(dbif2.connections[self.mapset].connection, connection)
+        dbif1.close()
+        dbif2.close()
+
+        # Closing a database interface keeps the connection open
+        dbif3 = self.connect()
+        self.assertIs(dbif3.connections[self.mapset].connection, connection)
+        dbif3.close()
+
+        connections = []
+
+        def connect_thread():
+            dbif = self.connect()
+            connections.append(dbif.connections[self.mapset].connection)
+            dbif.close()
+
+        thread = threading.Thread(target=connect_thread)
+        thread.start()
+        thread.join()
+        self.assertEqual(len(connections), 1)
+        self.assertIsNot(connections[0], connection)
+
+    def test_pragmas(self):
+        """Test that the pragmas of GRASS_TGIS_SQLITE_PRAGMAS overwrite the
+           defaults of new connections
+        """
+        os.environ["GRASS_TGIS_SQLITE_PRAGMAS"] = \
+            "cache_size=-1234, busy_timeout=4321, invalid name=1"
+        pragmas = dict(tgis.get_sqlite_pragmas())
+        self.assertEqual(pragmas["cache_size"], "-1234")
+        self.assertEqual(pragmas["busy_timeout"], "4321")
+        self.assertEqual(pragmas["temp_store"], "MEMORY")
+        self.assertNotIn("invalid name", pragmas)
+
+        dbif = self.connect()
+        for name, value in (("cache_size", -1234), ("busy_timeout", 4321),
+                            ("temp_store", 2)):
+            dbif.execute("PRAGMA %s" % name, mapset=self.mapset)
+            self.assertEqual(dbif.fetchone(mapset=self.mapset)[0], value)
+        dbif.close()
+
+
+if __name__ == '__main__':
+    test()
@@ -0,0 +1,135 @@
+"""Unit test comparing the temporal topology built with the sweep over the
+   start times with the topology built with the R*-Tree
+
+(C) 2020 by the GRASS Development Team
+This program is free software under the GNU General Public
+License (>=v2). Read the file COPYING that comes with GRASS
+for details.
+
+:authors: GRASS Development Team
+"""
+
+import grass.temporal as tgis
+from grass.gunittest.case import TestCase
+from grass.gunittest.main import test
+from datetime import datetime
+
+
+def create_maps(prefix, extents, absolute=True, spatial=None):
+    """Create raster map objects with the provided temporal extents,
+       days of January 2001 or relative days, and optional spatial extents
+       (north, south, east, west)
+    """
+    maps = []
+    for i, (start, end) in enumerate(extents):
+        map_ = tgis.RasterDataset("%s_%i@PERMANENT" % (prefix, i))
+        if absolute:
+            map_.set_absolute_time(datetime(2001, 1, start),
+                                   None if end is None
+                                   else datetime(2001, 1, end))
+        else:
+            map_.set_relative_time(start, end, "days")
+        north, south, east, west = spatial[i] if spatial else (80, 0, 120, 0)
+        map_.set_spatial_extent_from_values(north=north, south=south,
+                                            east=east, west=west)
+        maps.append(map_)
+    return maps
+
+
+def get_relations(maps, spatial=None):
+    """Return the temporal and spatial relations of the maps as
+       dictionary of sorted map ids"""
+    result = {}
+    for map_ in maps:
+        relations = dict(map_.get_temporal_relations())
+        if spatial is not None:
+            relations.update(map_.get_spatial_relations())
+        result[map_.get_id()] = dict(
+            (name, sorted(related.get_id() for related in relations[name]))
+            for name in relations if relations[name])
+    return result
+
+
+class TestTemporalTopologySweep(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Initiate the temporal GIS
+        """
+        tgis.init()
+
+    def build(self, mapsA, mapsB=None, spatial=None, sweep=True):
+        """Build the topology with the sweep or the R*-Tree and return the
+           relations of mapsA and mapsB"""
+        tb = tgis.SpatioTemporalTopologyBuilder()
+        used = []
+        build_sweep = tb._build_sweep
+
+        def _build_sweep(*args):
+            used.append(build_sweep(*args) if sweep else False)
+            return used[-1]
+
+        tb._build_sweep = _build_sweep
+        tb.build(mapsA, mapsB, spatial)
+        self.assertEqual(used, [sweep])
+        return (get_relations(mapsA, spatial),
+                get_relations(mapsB if mapsB else mapsA, spatial))
+
+    def assertSameTopology(self, mapsA, mapsB=None, spatial=None):
+        """Assert that the sweep and the R*-Tree build the same relations"""
+        rtree = self.build(mapsA, mapsB, spatial, sweep=False)
+        sweep = self.build(mapsA, mapsB, spatial, sweep=True)
+        self.assertEqual(sweep, rtree)
+        # at least some relations must be found
+        self.assertTrue(any(sweep[0].values()))
+
+    def test_intervals(self):
+        """Intervals with shared start and end points"""
+        mapsA = create_maps("a", [(1, 3), (3, 5), (5, 9), (9, 10), (2, 7)])
+        mapsB = create_maps("b", [(1, 3), (1, 5), (2, 3), (3, 9), (4, 6),
+                                  (5, 10), (6, 9), (10, 12), (12, 13)])
+        self.assertSameTopology(mapsA, mapsB)
+
+    def test_instants(self):
+        """Time instances with identical and different start times"""
+        mapsA = create_maps("a", [(1, None), (3, None), (5, None)])
+        mapsB = create_maps("b", [(1, None), (2, None), (3, None),
+                                  (3, None), (7, None)])
+        self.assertSameTopology(mapsA, mapsB)
+
+    def test_mixed(self):
+        """Intervals and time instances located inside of intervals and at
+           their start and end"""
+        mapsA = create_maps("a", [(1, 3), (3, None), (3, 5), (4, None),
+                                  (5, None), (5, 8)])
+        mapsB = create_maps("b", [(1, None), (2, None), (1, 5), (3, 4),
+                                  (5, None), (8, None), (6, 9)])
+        self.assertSameTopology(mapsA, mapsB)
+
+    def test_identical(self):
+        """Topology of a single list of intervals and time instances"""
+        maps = create_maps("a", [(1, 3), (3, None), (3, 5), (2, 4),
+                                 (5, None), (1, 3), (4, 8)])
+        self.assertSameTopology(maps)
+
+    def test_relative(self):
+        """Relative intervals and time instances"""
+        mapsA = create_maps("a", [(0, 2), (2, 4), (4, None), (1, 6)],
+                            absolute=False)
+        mapsB = create_maps("b", [(0, 4), (2, None), (4, 5), (6, 8)],
+                            absolute=False)
+        self.assertSameTopology(mapsA, mapsB)
+
+    def test_spatial(self):
+        """Spatio-temporal topology with disjoint spatial extents"""
+        mapsA = create_maps("a", [(1, 3), (3, 5), (2, 7)],
+                            spatial=[(80, 0, 120, 0), (40, 0, 60, 0),
+                                     (80, 40, 120, 60)])
+        mapsB = create_maps("b", [(1, 5), (3, None), (4, 6)],
+                            spatial=[(40, 0, 60, 0), (80, 0, 120, 0),
+                                     (100, 90, 200, 130)])
+        self.assertSameTopology(mapsA, mapsB, spatial="2D")
+
+
+if __name__ == '__main__':
+    test()
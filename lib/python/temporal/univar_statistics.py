@@ -20,17 +20,298 @@ for details.
 """
 from __future__ import print_function
 
+import collections
+import multiprocessing
 from .core import SQLDatabaseInterfaceConnection, get_current_mapset
 from .factory import dataset_factory
 from .open_stds import open_old_stds
 import grass.script as gscript
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# The columns of the table output of r.univar and r3.univar
+# and the corresponding keys of the shell script style output
+univar_table_keys = {"non_null_cells": "n",
+                     "first_quart": "first_quartile",
+                     "third_quart": "third_quartile",
+                     "perc_90": "percentile_90"}
+
+###############################################################################
+
+
+def parse_univar_table(output):
+    """Parse the table output (-t flag) of r.univar or r3.univar
+
+       :param output: The decoded output of the module
+       :return: A list of dictionaries, one for each zone, using the keys
+                of the shell script style output
+
+       >>> output = "zone|label|non_null_cells|null_cells|min|max|mean\\n"
+       >>> output += "1||10|0|1|5|2.5\\n2|b|4|2|3|3|3\\n"
+       >>> stats = parse_univar_table(output)
+       >>> stats[0]["zone"], stats[0]["n"], stats[0]["cells"]
+       ('1', '10', '10')
+       >>> stats[1]["label"], stats[1]["mean"], stats[1]["cells"]
+       ('b', '3', '6')
+    """
+    lines = [line for line in output.splitlines() if line.strip()]
+    if not lines:
+        return []
+
+    keys = [univar_table_keys.get(key, key) for key in lines[0].split("|")]
+    stats_list = []
+    for line in lines[1:]:
+        stats = dict(zip(keys, line.split("|")))
+        if "n" in stats and "null_cells" in stats:
+            stats["cells"] = str(int(stats["n"]) + int(stats["null_cells"]))
+        stats_list.append(stats)
+    return stats_list
+
+###############################################################################
+
+
+def _format_univar_value(value):
+    """Format a value like the shell script style output of r.univar"""
+    if isinstance(value, float):
+        return "%.15g" % value
+    return str(value)
+
+
+def _univar_statistics_from_values(n, null_cells, min_value, max_value,
+                                   sum_value, sum_abs, sum_sq, values=None):
+    """Create the r.univar statistics dictionary from accumulated values
+
+       :param values: The sorted non-null values to compute the extended
+                      statistics, None for no extended statistics
+    """
+    stats = {"n": n, "null_cells": null_cells, "cells": n + null_cells}
+    if n == 0:
+        return dict((key, str(value)) for key, value in stats.items())
+
+    mean = sum_value / n
+    # Avoid negative variances caused by rounding errors
+    variance = max(sum_sq / n - mean * mean, 0.0)
+    stddev = variance ** 0.5
+    if mean != 0:
+        coeff_var = 100.0 * stddev / mean
+    else:
+        coeff_var = float("nan")
+    stats.update({"min": min_value, "max": max_value,
+                  "range": max_value - min_value,
+                  "mean": mean, "mean_of_abs": sum_abs / n,
+                  "stddev": stddev, "variance": variance,
+                  "coeff_var": coeff_var, "sum": sum_value})
+    if values is not None:
+        # The quantiles are computed like in r.univar
+        stats["first_quartile"] = values[int(n * 0.25 - 0.5)]
+        stats["third_quartile"] = values[int(n * 0.75 - 0.5)]
+        stats["percentile_90"] = values[int(n * 0.9 - 0.5)]
+        if n % 2:
+            stats["median"] = values[(n - 1) // 2]
+        else:
+            stats["median"] = (values[n // 2 - 1] + values[n // 2]) / 2.0
+
+    return dict((key, _format_univar_value(value)) for key, value
+                in stats.items())
+
+
+def compute_raster_univar_statistics(map_id, extended=False, zones=None,
+                                     rast_region=False):
+    """Compute the univariate statistics of a raster map in this process
+
+       The raster map is read row by row and the statistics are accumulated
+       with numpy, so that no r.univar process is required. The results
+       match the shell script style output of r.univar.
+
+       :param map_id: The id of the raster map
+       :param extended: If True compute extended statistics
+       :param zones: The name of a raster map with zones, the statistics
+                     are computed for each zone in a single pass
+       :param rast_region: If True use the region of the raster map instead
+                           of the current region
+       :return: A list of dictionaries, one for each zone
+    """
+    from grass.pygrass.raster import RasterRow
+    from grass.pygrass.gis.region import Region
+
+    if np is None:
+        raise ImportError(_("NumPy is required to compute the statistics "
+                            "in process"))
+
+    current_region = None
+    if rast_region:
+        current_region = Region()
+        current_region.get_current()
+        region = Region()
+        region.from_rast(map_id)
+        region.set_raster_region()
+
+    # zone: [n, null_cells, min, max, sum, sum_abs, sum_sq, values]
+    accumulators = {}
+
+    def accumulate(zone, row, null):
+        valid = row[~null]
+        acc = accumulators.get(zone)
+        if acc is None:
+            acc = accumulators[zone] = [0, 0, np.inf, -np.inf, 0.0, 0.0, 0.0,
+                                        []]
+        acc[0] += valid.size
+        acc[1] += int(null.sum())
+        if valid.size:
+            acc[2] = min(acc[2], float(valid.min()))
+            acc[3] = max(acc[3], float(valid.max()))
+            acc[4] += float(valid.sum())
+            acc[5] += float(np.abs(valid).sum())
+            acc[6] += float(np.dot(valid, valid))
+            if extended:
+                acc[7].append(valid.copy())
+
+    name, mapset = map_id.split("@")
+    try:
+        with RasterRow(name, mapset) as rast:
+            is_cell = rast.mtype == "CELL"
+            zone_rast = None
+            if zones:
+                zone_rast = RasterRow(zones)
+                zone_rast.open("r")
+            try:
+                for i in range(rast._rows):
+                    row = np.asarray(rast.get_row(i))
+                    if is_cell:
+                        null = row == np.iinfo(np.int32).min
+                    else:
+                        null = np.isnan(row)
+                    row = row.astype(np.float64)
+                    if zone_rast is None:
+                        accumulate(None, row, null)
+                        continue
+                    zone_row = np.asarray(zone_rast.get_row(i))
+                    in_zone = zone_row != np.iinfo(np.int32).min
+                    for zone in np.unique(zone_row[in_zone]).tolist():
+                        mask = zone_row == zone
+                        accumulate(zone, row[mask], null[mask])
+            finally:
+                if zone_rast is not None:
+                    zone_rast.close()
+    finally:
+        if current_region is not None:
+            current_region.set_raster_region()
+
+    stats_list = []
+    for zone in sorted(accumulators, key=lambda zone: (zone is not None,
+                                                       zone)):
+        n, null_cells, min_, max_, sum_, sum_abs, sum_sq, values = \
+            accumulators[zone]
+        if extended:
+            values = np.sort(np.concatenate(values)) if values else []
+        else:
+            values = None
+        stats = _univar_statistics_from_values(n, null_cells, min_, max_,
+                                               sum_, sum_abs, sum_sq, values)
+        if zone is not None:
+            stats["zone"] = str(zone)
+        stats_list.append(stats)
+    return stats_list
+
+
+def _compute_raster_univar_statistics(args):
+    """Process pool wrapper of compute_raster_univar_statistics()"""
+    return compute_raster_univar_statistics(*args)
+
+
+def _start_univar(type, map_id, extended, zones, rast_region):
+    """Start r.univar or r3.univar for a single map and return the process"""
+    flag = "g"
+    if zones:
+        flag = "t"
+    if extended is True:
+        flag += "e"
+    if type == "strds" and rast_region is True:
+        flag += "r"
+
+    kwargs = {"map": map_id, "flags": flag}
+    if zones:
+        kwargs["zones"] = zones
+
+    if type == "strds":
+        return gscript.pipe_command("r.univar", **kwargs)
+    return gscript.pipe_command("r3.univar", **kwargs)
+
+
+def _read_univar(process, zones):
+    """Wait for a r.univar or r3.univar process and parse its output"""
+    output = gscript.decode(process.communicate()[0])
+    if process.returncode != 0:
+        return None
+    if zones:
+        return parse_univar_table(output)
+    stats = gscript.parse_key_val(output)
+    if not stats:
+        return None
+    return [stats]
+
+
+def compute_gridded_univar_statistics(type, rows, extended=False, zones=None,
+                                      rast_region=False, nprocs=1,
+                                      in_process=False):
+    """Compute the univariate statistics of a list of raster or raster3d
+       maps
+
+       The statistics are computed by up to nprocs r.univar or r3.univar
+       processes running in parallel, or in case of in_process by numpy in
+       up to nprocs worker processes. The results are streamed back in the
+       order of the rows.
+
+       :param type: Must be "strds" or "str3ds"
+       :param rows: The rows of the maps, each must provide an "id"
+       :param extended: If True compute extended statistics
+       :param zones: The name of a raster map with zones
+       :param rast_region: If set True use the raster map regions
+       :param nprocs: The number of processes to use
+       :param in_process: Compute the statistics of raster maps with numpy
+                          instead of r.univar
+       :return: A generator of (row, stats_list) tuples, stats_list is None
+                in case the statistics could not be computed
+    """
+    nprocs = max(1, int(nprocs))
+
+    if in_process:
+        args = [(row["id"], extended, zones, rast_region) for row in rows]
+        if nprocs == 1:
+            for row, arg in zip(rows, args):
+                yield row, _compute_raster_univar_statistics(arg)
+            return
+        pool = multiprocessing.Pool(nprocs)
+        try:
+            for row, stats in zip(rows, pool.imap(
+                    _compute_raster_univar_statistics, args)):
+                yield row, stats
+        finally:
+            pool.terminate()
+        return
+
+    pending = collections.deque()
+    for row in rows:
+        pending.append((row, _start_univar(type, row["id"], extended, zones,
+                                           rast_region)))
+        if len(pending) >= nprocs:
+            row, process = pending.popleft()
+            yield row, _read_univar(process, zones)
+
+    while pending:
+        row, process = pending.popleft()
+        yield row, _read_univar(process, zones)
+
 ###############################################################################
 
 
 def print_gridded_dataset_univar_statistics(type, input, output, where, extended,
                                             no_header=False, fs="|",
-                                            rast_region=False):
+                                            rast_region=False, zones=None,
+                                            nprocs=1, in_process=False):
     """Print univariate statistics for a space time raster or raster3d dataset
 
        :param type: Must be "strds" or "str3ds"
@@ -43,6 +324,12 @@ def print_gridded_dataset_univar_statistics(type, input, output, where, extended
        :param rast_region: If set True ignore the current region settings
               and use the raster map regions for univar statistical calculation.
               Only available for strds.
+       :param zones: The name of a raster map with zones, the statistics
+              are computed for each zone and map
+       :param nprocs: The number of processes that compute statistics in
+              parallel
+       :param in_process: Compute the statistics with numpy instead of
+              r.univar, only available for strds
     """
 
     # We need a database interface
@@ -51,9 +338,6 @@ def print_gridded_dataset_univar_statistics(type, input, output, where, extended
 
     sp = open_old_stds(input, type, dbif)
 
-    if output is not None:
-        out_file = open(output, "w")
-
     rows = sp.get_registered_maps(
         "id,start_time,end_time", where, "start_time", dbif)
 
@@ -65,9 +349,25 @@ def print_gridded_dataset_univar_statistics(type, input, output, where, extended
         gscript.fatal(_(err) % {'sp': sp.get_new_map_instance(None).get_type(),
                                 'i': sp.get_id()})
 
+    dbif.close()
+
+    if in_process:
+        if type != "strds":
+            gscript.fatal(_("In process statistics are only available for "
+                            "space time raster datasets"))
+        if np is None:
+            gscript.fatal(_("NumPy is required to compute the statistics "
+                            "in process"))
+
+    if output is not None:
+        out_file = open(output, "w")
+
     if no_header is False:
         string = ""
-        string += "id" + fs + "start" + fs + "end" + fs + "mean" + fs
+        string += "id" + fs + "start" + fs + "end" + fs
+        if zones:
+            string += "zone" + fs
+        string += "mean" + fs
         string += "min" + fs + "max" + fs
         string += "mean_of_abs" + fs + "stddev" + fs + "variance" + fs
         string += "coeff_var" + fs + "sum" + fs + "null_cells" + fs + "cells"
@@ -81,25 +381,13 @@ def print_gridded_dataset_univar_statistics(type, input, output, where, extended
         else:
             out_file.write(string + "\n")
 
-    for row in rows:
-        string = ""
+    for row, stats_list in compute_gridded_univar_statistics(
+            type, rows, extended, zones, rast_region, nprocs, in_process):
         id = row["id"]
         start = row["start_time"]
         end = row["end_time"]
 
-        flag = "g"
-
-        if extended is True:
-            flag += "e"
-        if type == "strds" and rast_region is True:
-            flag += "r"
-
-        if type == "strds":
-            stats = gscript.parse_command("r.univar", map=id, flags=flag)
-        elif type == "str3ds":
-            stats = gscript.parse_command("r3.univar", map=id, flags=flag)
-
-        if not stats:
+        if not stats_list:
             if type == "strds":
                 gscript.warning(_("Unable to get statistics for raster map "
                                   "<%s>") % id)
@@ -108,23 +396,29 @@ def print_gridded_dataset_univar_statistics(type, input, output, where, extended
                                   " <%s>") % id)
             continue
 
-        string += str(id) + fs + str(start) + fs + str(end)
-        string += fs + str(stats["mean"]) + fs + str(stats["min"])
-        string += fs + str(stats["max"]) + fs + str(stats["mean_of_abs"])
-        string += fs + str(stats["stddev"]) + fs + str(stats["variance"])
-        string += fs + str(stats["coeff_var"]) + fs + str(stats["sum"])
-        string += fs + str(stats["null_cells"]) + fs + str(stats["cells"])
-        string += fs + str(int(stats["cells"]) - int(stats["null_cells"]))
-        if extended is True:
-            string += fs + str(stats["first_quartile"]) + fs + str(stats["median"])
-            string += fs + str(stats["third_quartile"]) + fs + str(stats["percentile_90"])
-
-        if output is None:
-            print(string)
-        else:
-            out_file.write(string + "\n")
+        for stats in stats_list:
+            # Zones without valid cells have no statistics
+            if "mean" not in stats:
+                continue
+
+            string = ""
+            string += str(id) + fs + str(start) + fs + str(end)
+            if zones:
+                string += fs + str(stats["zone"])
+            string += fs + str(stats["mean"]) + fs + str(stats["min"])
+            string += fs + str(stats["max"]) + fs + str(stats["mean_of_abs"])
+            string += fs + str(stats["stddev"]) + fs + str(stats["variance"])
+            string += fs + str(stats["coeff_var"]) + fs + str(stats["sum"])
+            string += fs + str(stats["null_cells"]) + fs + str(stats["cells"])
+            string += fs + str(int(stats["cells"]) - int(stats["null_cells"]))
+            if extended is True:
+                string += fs + str(stats["first_quartile"]) + fs + str(stats["median"])
+                string += fs + str(stats["third_quartile"]) + fs + str(stats["percentile_90"])
 
-    dbif.close()
+            if output is None:
+                print(string)
+            else:
+                out_file.write(string + "\n")
 
     if output is not None:
         out_file.close()
@@ -26,10 +26,16 @@
 #% key: table
 #% required: yes
 #%end
-#%option G_OPT_DB_COLUMN
-#% description: Name of attribute column on which to calculate statistics (must be numeric)
+#%option G_OPT_DB_COLUMNS
+#% key: column
+#% description: Name of attribute column(s) on which to calculate statistics (must be numeric)
 #% required: yes
 #%end
+#%option G_OPT_DB_COLUMN
+#% key: group
+#% description: Name of attribute column to group the statistics by
+#% required: no
+#%end
 #%option G_OPT_DB_DATABASE
 #%end
 #%option G_OPT_DB_DRIVER
@@ -46,6 +52,15 @@
 #% options: 0-100
 #% multiple: yes
 #%end
+#%option
+#% key: memory
+#% type: integer
+#% required: no
+#% multiple: no
+#% label: Maximum memory to be used (in MB)
+#% description: Memory for the exact quartiles and percentiles, approximations are used above
+#% answer: 300
+#%end
 #%flag
 #% key: e
 #% description: Extended statistics (quartiles and 90th percentile)
@@ -56,70 +71,380 @@
 #%end
 
 import sys
-import atexit
-import math
 
-import grass.script as gscript
+try:
+    import numpy as np
+    hasNumPy = True
+except ImportError:
+    hasNumPy = False
 
+import grass.script as gscript
+from grass.script.utils import decode
+
+# number of bytes of the db.select output that are parsed at once
+CHUNK_SIZE = 16 * 1024 * 1024
+
+
+class QuantileSketch(object):
+    """Bounded memory approximation of the quantiles of a stream of values
+
+    The values are kept in levels of sorted buffers, a value of level i
+    stands for 2**i input values. A full level is compacted by keeping
+    every other value in the next level, so that at most about
+    2 * size values are kept per level.
+    """
+
+    def __init__(self, size=4096):
+        self.size = size
+        self.levels = [np.empty(0)]
+        self.offset = 0
+
+    def update(self, values):
+        self.levels[0] = np.concatenate((self.levels[0], values))
+        level = 0
+        while level < len(self.levels):
+            if self.levels[level].size < 2 * self.size:
+                break
+            values = np.sort(self.levels[level])
+            # keep the largest value if the number of values is odd, so
+            # that the total weight stays exact
+            keep = values[values.size - values.size % 2:]
+            # alternate the compacted half to avoid a systematic bias
+            self.offset = 1 - self.offset
+            compacted = values[self.offset:values.size - values.size % 2:2]
+            self.levels[level] = keep
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level + 1] = np.concatenate((self.levels[level + 1],
+                                                     compacted))
+            level += 1
+
+    def ranks(self, positions):
+        """Return the values at the 1-based positions of the sorted input"""
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(level.size, 2 ** i)
+                                  for i, level in enumerate(self.levels)])
+        order = np.argsort(values, kind='mergesort')
+        cumulative = np.cumsum(weights[order])
+        index = np.searchsorted(cumulative, positions)
+        return values[order][np.minimum(index, values.size - 1)]
+
+
+class ColumnStatistics(object):
+    """Streaming statistics of a numeric column for a number of groups
+
+    The moments are accumulated for each chunk of values with
+    numpy.bincount. For the extended statistics the values are kept and
+    the exact quantiles are selected with numpy.partition, if more than
+    max_values values are read the values are moved into quantile
+    sketches instead.
+    """
+
+    def __init__(self, extended=False, max_values=None):
+        self.extended = extended
+        self.max_values = max_values
+        self.n = np.zeros(0, dtype=np.int64)
+        self.sum = np.zeros(0)
+        self.sum2 = np.zeros(0)
+        self.sum_abs = np.zeros(0)
+        self.min = np.zeros(0)
+        self.max = np.zeros(0)
+        self.values = []
+        self.num_values = 0
+        self.sketches = None
+
+    def _grow(self, ngroups):
+        missing = ngroups - self.n.size
+        if missing <= 0:
+            return
+        self.n = np.concatenate((self.n, np.zeros(missing, dtype=np.int64)))
+        for name in ('sum', 'sum2', 'sum_abs'):
+            setattr(self, name, np.concatenate((getattr(self, name),
+                                                np.zeros(missing))))
+        self.min = np.concatenate((self.min, np.full(missing, np.inf)))
+        self.max = np.concatenate((self.max, np.full(missing, -np.inf)))
+        if self.sketches is not None:
+            self.sketches.extend(QuantileSketch() for i in range(missing))
+        else:
+            self.values.extend([] for i in range(missing))
+
+    def update(self, groups, values, ngroups):
+        """Add a chunk of values
+
+        :param groups: The group index of each value
+        :param values: The values, NULL values are NaN
+        :param ngroups: The number of groups read so far
+        """
+        self._grow(ngroups)
+        valid = ~np.isnan(values)
+        groups = groups[valid]
+        values = values[valid]
+        if not values.size:
+            return
+
+        self.n += np.bincount(groups, minlength=ngroups)
+        self.sum += np.bincount(groups, weights=values, minlength=ngroups)
+        self.sum2 += np.bincount(groups, weights=values * values,
+                                 minlength=ngroups)
+        self.sum_abs += np.bincount(groups, weights=np.abs(values),
+                                    minlength=ngroups)
+        np.minimum.at(self.min, groups, values)
+        np.maximum.at(self.max, groups, values)
+
+        if not self.extended:
+            return
+        if ngroups == 1:
+            chunks = [(0, values)]
+        else:
+            order = np.argsort(groups, kind='mergesort')
+            groups = groups[order]
+            splits = np.flatnonzero(np.diff(groups)) + 1
+            chunks = zip(groups[np.concatenate(([0], splits))],
+                         np.split(values[order], splits))
+        if self.sketches is not None:
+            for group, chunk in chunks:
+                self.sketches[group].update(chunk)
+            return
+        for group, chunk in chunks:
+            self.values[group].append(chunk)
+        self.num_values += values.size
+        if self.max_values is not None and self.num_values > self.max_values:
+            gscript.warning(_("Memory limit reached, quartiles and "
+                              "percentiles are approximated"))
+            self.sketches = []
+            for chunks in self.values:
+                sketch = QuantileSketch()
+                for chunk in chunks:
+                    sketch.update(chunk)
+                self.sketches.append(sketch)
+            self.values = None
+
+    def quantiles(self, group, positions):
+        """Return the values at the 1-based positions of the sorted values
+        of a group"""
+        positions = np.asarray(positions, dtype=np.int64)
+        if self.sketches is not None:
+            return self.sketches[group].ranks(positions)
+        values = np.concatenate(self.values[group])
+        return np.partition(values, positions - 1)[positions - 1]
+
+    def statistics(self, group, perc):
+        """Return the statistics of a group as dictionary"""
+        N = int(self.n[group])
+        stats = {'n': N, 'min': self.min[group], 'max': self.max[group],
+                 'sum': self.sum[group], 'sum_abs': self.sum_abs[group],
+                 'sum2': self.sum2[group]}
+        if not self.extended or N == 0:
+            return stats
+
+        odd = N % 2
+        q25pos = max(round(N * 0.25), 1)
+        q50apos = max(round(N * 0.50), 1)
+        q50bpos = q50apos + (1 - odd)
+        q75pos = max(round(N * 0.75), 1)
+        ppos = [max(round(N * p / 100), 1) for p in perc]
+
+        q25, q50a, q50b, q75 = self.quantiles(
+            group, [q25pos, q50apos, q50bpos, q75pos])
+        stats['eostr'] = ['even', 'odd'][odd]
+        stats['q25'] = q25
+        stats['q50'] = (q50a + q50b) / 2
+        stats['q75'] = q75
+        stats['pval'] = list(self.quantiles(group, ppos))
+        return stats
+
+
+def read_columns(sql, ncolumns, database, driver, group):
+    """Stream the result of the SQL query with db.select
+
+    Yields for each chunk of rows the group values, or None without group,
+    and the values of the columns as float arrays with NaN for NULL.
+    """
+    separator = '|'
+    p = gscript.pipe_command('db.select', flags='c', sql=sql,
+                             database=database, driver=driver,
+                             separator=separator)
+    rest = b''
+    while True:
+        data = p.stdout.read(CHUNK_SIZE)
+        block = rest + data
+        if data:
+            # keep the incomplete last line for the next chunk as bytes,
+            # a multibyte character may cross the end of the chunk
+            block, _sep, rest = block.rpartition(b'\n')
+        else:
+            rest = b''
+        text = decode(block)
+        lines = [line for line in text.splitlines() if line.strip() or group]
+        if lines:
+            if group:
+                # the group column is the first one, it may contain the
+                # separator
+                rows = [line.rsplit(separator, ncolumns) for line in lines]
+                groups = [row[0] for row in rows]
+                fields = [row[1:] for row in rows]
+            else:
+                groups = None
+                if ncolumns == 1:
+                    fields = [[line] for line in lines]
+                else:
+                    fields = [line.split(separator) for line in lines]
+            fields = np.array(fields)
+            # NULL values are empty
+            fields = np.where(np.char.str_len(fields) == 0, 'nan', fields)
+            yield groups, fields.astype(np.float64).T
+        if not data:
+            break
+    if p.wait() != 0:
+        gscript.fatal(_("Unable to read the column values"))
+
+
+def ordinal_percentile(p):
+    """Return the label of a percentile"""
+    if p == int(p):  # integer
+        if int(p) % 10 == 1 and int(p) != 11:
+            return "%dst Percentile" % int(p)
+        elif int(p) % 10 == 2 and int(p) != 12:
+            return "%dnd Percentile" % int(p)
+        elif int(p) % 10 == 3 and int(p) != 13:
+            return "%drd Percentile" % int(p)
+        return "%dth Percentile" % int(p)
+    return "%.15g Percentile" % p
+
+
+def derived_statistics(stats):
+    """Return the mean, the mean of the absolute values, the variance, the
+    standard deviation and the coefficient of variation"""
+    N = stats['n']
+    sum = stats['sum']
+    sum2 = stats['sum2']
+    variance = (sum2 - sum * sum / N) / N
+    if not variance < 0:
+        stddev = np.sqrt(variance)
+        coeff_var = stddev / (np.sqrt(sum * sum) / N)
+    else:
+        variance = stddev = coeff_var = 0
+    return sum / N, stats['sum_abs'] / N, variance, stddev, coeff_var
 
-def cleanup():
-    for ext in ['', '.sort']:
-        gscript.try_remove(tmp + ext)
 
+def print_statistics(stats, perc, shellstyle, extend):
+    """Print the statistics of a single column"""
+    N = stats['n']
+    minv = stats['min']
+    maxv = stats['max']
+    mean, mean_abs, variance, stddev, coeff_var = derived_statistics(stats)
+    if not shellstyle:
+        sys.stdout.write("Number of values: %d\n" % N)
+        sys.stdout.write("Minimum: %.15g\n" % minv)
+        sys.stdout.write("Maximum: %.15g\n" % maxv)
+        sys.stdout.write("Range: %.15g\n" % (maxv - minv))
+        sys.stdout.write("Mean: %.15g\n" % mean)
+        sys.stdout.write(
+            "Arithmetic mean of absolute values: %.15g\n" % mean_abs)
+        sys.stdout.write("Variance: %.15g\n" % variance)
+        sys.stdout.write("Standard deviation: %.15g\n" % stddev)
+        sys.stdout.write("Coefficient of variation: %.15g\n" % coeff_var)
+        sys.stdout.write("Sum: %.15g\n" % stats['sum'])
+    else:
+        sys.stdout.write("n=%d\n" % N)
+        sys.stdout.write("min=%.15g\n" % minv)
+        sys.stdout.write("max=%.15g\n" % maxv)
+        sys.stdout.write("range=%.15g\n" % (maxv - minv))
+        sys.stdout.write("mean=%.15g\n" % mean)
+        sys.stdout.write("mean_abs=%.15g\n" % mean_abs)
+        sys.stdout.write("variance=%.15g\n" % variance)
+        sys.stdout.write("stddev=%.15g\n" % stddev)
+        sys.stdout.write("coeff_var=%.15g\n" % coeff_var)
+        sys.stdout.write("sum=%.15g\n" % stats['sum'])
 
-def sortfile(infile, outfile):
-    inf = open(infile, 'r')
-    outf = open(outfile, 'w')
+    if not extend:
+        return
 
-    if gscript.find_program('sort', '--help'):
-        gscript.run_command('sort', flags='n', stdin=inf, stdout=outf)
+    if not shellstyle:
+        sys.stdout.write("1st Quartile: %.15g\n" % stats['q25'])
+        sys.stdout.write("Median (%s N): %.15g\n" % (stats['eostr'],
+                                                     stats['q50']))
+        sys.stdout.write("3rd Quartile: %.15g\n" % stats['q75'])
+        for p, value in zip(perc, stats['pval']):
+            sys.stdout.write("%s: %.15g\n" % (ordinal_percentile(p), value))
     else:
-        # FIXME: we need a large-file sorting function
-        gscript.warning(_("'sort' not found: sorting in memory"))
-        lines = inf.readlines()
-        for i in range(len(lines)):
-            lines[i] = float(lines[i].rstrip('\r\n'))
-        lines.sort()
-        for line in lines:
-            outf.write(str(line) + '\n')
-
-    inf.close()
-    outf.close()
+        sys.stdout.write("first_quartile=%.15g\n" % stats['q25'])
+        sys.stdout.write("median=%.15g\n" % stats['q50'])
+        sys.stdout.write("third_quartile=%.15g\n" % stats['q75'])
+        for p, value in zip(perc, stats['pval']):
+            percstr = "%.15g" % p
+            percstr = percstr.replace('.', '_')
+            sys.stdout.write("percentile_%s=%.15g\n" % (percstr, value))
+
+
+def print_table(results, perc, group, extend):
+    """Print the statistics of several columns or groups as table"""
+    header = ['column']
+    if group:
+        header.append(group)
+    header += ['n', 'min', 'max', 'range', 'mean', 'mean_abs', 'variance',
+               'stddev', 'coeff_var', 'sum']
+    if extend:
+        header += ['first_quartile', 'median', 'third_quartile']
+        header += ['percentile_%s' % ("%.15g" % p).replace('.', '_')
+                   for p in perc]
+    sys.stdout.write('|'.join(header) + '\n')
+    for column, group_value, stats in results:
+        row = [column]
+        if group:
+            row.append(group_value)
+        row.append('%d' % stats['n'])
+        if stats['n']:
+            values = [stats['min'], stats['max'], stats['max'] - stats['min']]
+            values += derived_statistics(stats)
+            values.append(stats['sum'])
+            if extend:
+                values += [stats['q25'], stats['q50'], stats['q75']]
+                values += stats['pval']
+            row += ['%.15g' % value for value in values]
+        else:
+            row += [''] * (len(header) - len(row))
+        sys.stdout.write('|'.join(row) + '\n')
 
 
 def main():
-    global tmp
-    tmp = gscript.tempfile()
+    if not hasNumPy:
+        gscript.fatal(_("Required dependency NumPy not found. Exiting."))
 
     extend = flags['e']
     shellstyle = flags['g']
     table = options['table']
-    column = options['column']
+    columns = options['column'].split(',')
+    group = options['group']
     database = options['database']
     driver = options['driver']
     where = options['where']
     perc = options['percentile']
+    memory = int(options['memory'])
 
     perc = [float(p) for p in perc.split(',')]
 
     desc_table = gscript.db_describe(table, database=database, driver=driver)
     if not desc_table:
         gscript.fatal(_("Unable to describe table <%s>") % table)
-    found = False
-    for cname, ctype, cwidth in desc_table['cols']:
-        if cname == column:
-            found = True
-            if ctype not in ('INTEGER', 'DOUBLE PRECISION'):
-                gscript.fatal(_("Column <%s> is not numeric") % cname)
-    if not found:
-        gscript.fatal(_("Column <%s> not found in table <%s>") % (column, table))
+    types = dict((cname, ctype) for cname, ctype, cwidth in desc_table['cols'])
+    for column in columns:
+        if column not in types:
+            gscript.fatal(_("Column <%s> not found in table <%s>") % (column, table))
+        if types[column] not in ('INTEGER', 'DOUBLE PRECISION'):
+            gscript.fatal(_("Column <%s> is not numeric") % column)
+    if group and group not in types:
+        gscript.fatal(_("Column <%s> not found in table <%s>") % (group, table))
 
     if not shellstyle:
         gscript.verbose(_("Calculation for column <%s> of table <%s>..."
-                          ) % (column, table))
+                          ) % (', '.join(columns), table))
         gscript.message(_("Reading column values..."))
 
-    sql = "SELECT %s FROM %s" % (column, table)
+    select = columns
+    if group:
+        select = [group] + columns
+    sql = "SELECT %s FROM %s" % (', '.join(select), table)
     if where:
         sql += " WHERE " + where
 
@@ -129,181 +454,48 @@ def main():
     if not driver:
         driver = None
 
-    tmpf = open(tmp, 'w')
-    gscript.run_command('db.select', flags='c', table=table,
-                        database=database, driver=driver, sql=sql,
-                        stdout=tmpf)
-    tmpf.close()
+    # the values of all columns share the memory for the quantiles
+    max_values = memory * 1024 * 1024 // 8 // len(columns)
+    statistics = [ColumnStatistics(extend, max_values) for column in columns]
+    group_ids = {}
+    num_rows = 0
+    for groups, values in read_columns(sql, len(columns), database, driver,
+                                       group):
+        num_rows += values.shape[1]
+        if group:
+            keys, inverse = np.unique(np.array(groups), return_inverse=True)
+            ids = np.array([group_ids.setdefault(key, len(group_ids))
+                            for key in keys], dtype=np.int64)
+            indices = ids[inverse]
+        else:
+            group_ids[None] = 0
+            indices = np.zeros(values.shape[1], dtype=np.int64)
+        for stats, column_values in zip(statistics, values):
+            stats.update(indices, column_values, len(group_ids))
 
     # check if result is empty
-    tmpf = open(tmp)
-    if tmpf.read(1) == '':
+    if num_rows == 0:
         gscript.fatal(_("Table <%s> contains no data.") % table)
-        tmpf.close()
 
     # calculate statistics
     if not shellstyle:
         gscript.verbose(_("Calculating statistics..."))
 
-    N = 0
-    sum = 0.0
-    sum2 = 0.0
-    sum3 = 0.0
-    minv = 1e300
-    maxv = -1e300
-
-    tmpf = open(tmp)
-    for line in tmpf:
-        if len(line.rstrip('\r\n')) == 0:
-            continue
-        x = float(line.rstrip('\r\n'))
-        N += 1
-        sum += x
-        sum2 += x * x
-        sum3 += abs(x)
-        maxv = max(maxv, x)
-        minv = min(minv, x)
-    tmpf.close()
-
-    if N <= 0:
-        gscript.fatal(_("No non-null values found"))
-
-    if not shellstyle:
-        sys.stdout.write("Number of values: %d\n" % N)
-        sys.stdout.write("Minimum: %.15g\n" % minv)
-        sys.stdout.write("Maximum: %.15g\n" % maxv)
-        sys.stdout.write("Range: %.15g\n" % (maxv - minv))
-        sys.stdout.write("Mean: %.15g\n" % (sum / N))
-        sys.stdout.write(
-            "Arithmetic mean of absolute values: %.15g\n" %
-            (sum3 / N))
-        if not ((sum2 - sum * sum / N) / N) < 0:
-            sys.stdout.write("Variance: %.15g\n" % ((sum2 - sum * sum / N) / N))
-            sys.stdout.write(
-                "Standard deviation: %.15g\n" %
-                (math.sqrt((sum2 - sum * sum / N) / N)))
-            sys.stdout.write(
-                "Coefficient of variation: %.15g\n" %
-                ((math.sqrt((sum2 - sum * sum / N) / N)) /
-                 (math.sqrt(sum * sum) / N)))
-        else:
-            sys.stdout.write("Variance: 0\n")
-            sys.stdout.write("Standard deviation: 0\n")
-            sys.stdout.write("Coefficient of variation: 0\n")
-        sys.stdout.write("Sum: %.15g\n" % sum)
-    else:
-        sys.stdout.write("n=%d\n" % N)
-        sys.stdout.write("min=%.15g\n" % minv)
-        sys.stdout.write("max=%.15g\n" % maxv)
-        sys.stdout.write("range=%.15g\n" % (maxv - minv))
-        sys.stdout.write("mean=%.15g\n" % (sum / N))
-        sys.stdout.write("mean_abs=%.15g\n" % (sum3 / N))
-        if not ((sum2 - sum * sum / N) / N) < 0:
-            sys.stdout.write("variance=%.15g\n" % ((sum2 - sum * sum / N) / N))
-            sys.stdout.write(
-                "stddev=%.15g\n" %
-                (math.sqrt(
-                    (sum2 - sum * sum / N) / N)))
-            sys.stdout.write(
-                "coeff_var=%.15g\n" %
-                ((math.sqrt((sum2 - sum * sum / N) / N)) /
-                 (math.sqrt(sum * sum) / N)))
-        else:
-            sys.stdout.write("variance=0\n")
-            sys.stdout.write("stddev=0\n")
-            sys.stdout.write("coeff_var=0\n")
-        sys.stdout.write("sum=%.15g\n" % sum)
-
-    if not extend:
+    if len(columns) == 1 and not group:
+        stats = statistics[0].statistics(0, perc)
+        if stats['n'] <= 0:
+            gscript.fatal(_("No non-null values found"))
+        print_statistics(stats, perc, shellstyle, extend)
         return
 
-    # preparations:
-    sortfile(tmp, tmp + ".sort")
-
-    odd = N % 2
-    eostr = ['even', 'odd'][odd]
-
-    q25pos = round(N * 0.25)
-    if q25pos == 0:
-        q25pos = 1
-    q50apos = round(N * 0.50)
-    if q50apos == 0:
-        q50apos = 1
-    q50bpos = q50apos + (1 - odd)
-    q75pos = round(N * 0.75)
-    if q75pos == 0:
-        q75pos = 1
-
-    ppos = {}
-    pval = {}
-    for i in range(len(perc)):
-        ppos[i] = round(N * perc[i] / 100)
-        if ppos[i] == 0:
-            ppos[i] = 1
-        pval[i] = 0
-
-    inf = open(tmp + ".sort")
-    l = 1
-    for line in inf:
-        if l == q25pos:
-            q25 = float(line.rstrip('\r\n'))
-        if l == q50apos:
-            q50a = float(line.rstrip('\r\n'))
-        if l == q50bpos:
-            q50b = float(line.rstrip('\r\n'))
-        if l == q75pos:
-            q75 = float(line.rstrip('\r\n'))
-        for i in range(len(ppos)):
-            if l == ppos[i]:
-                pval[i] = float(line.rstrip('\r\n'))
-        l += 1
-
-    q50 = (q50a + q50b) / 2
+    results = []
+    for group_value in sorted(group_ids):
+        for column, stats in zip(columns, statistics):
+            results.append((column, group_value,
+                            stats.statistics(group_ids[group_value], perc)))
+    print_table(results, perc, group, extend)
 
-    if not shellstyle:
-        sys.stdout.write("1st Quartile: %.15g\n" % q25)
-        sys.stdout.write("Median (%s N): %.15g\n" % (eostr, q50))
-        sys.stdout.write("3rd Quartile: %.15g\n" % q75)
-        for i in range(len(perc)):
-            if perc[i] == int(perc[i]):  # integer
-                if int(perc[i]) % 10 == 1 and int(perc[i]) != 11:
-                    sys.stdout.write(
-                        "%dst Percentile: %.15g\n" %
-                        (int(
-                            perc[i]),
-                            pval[i]))
-                elif int(perc[i]) % 10 == 2 and int(perc[i]) != 12:
-                    sys.stdout.write(
-                        "%dnd Percentile: %.15g\n" %
-                        (int(
-                            perc[i]),
-                            pval[i]))
-                elif int(perc[i]) % 10 == 3 and int(perc[i]) != 13:
-                    sys.stdout.write(
-                        "%drd Percentile: %.15g\n" %
-                        (int(
-                            perc[i]),
-                            pval[i]))
-                else:
-                    sys.stdout.write(
-                        "%dth Percentile: %.15g\n" %
-                        (int(
-                            perc[i]),
-                            pval[i]))
-            else:
-                sys.stdout.write(
-                    "%.15g Percentile: %.15g\n" %
-                    (perc[i], pval[i]))
-    else:
-        sys.stdout.write("first_quartile=%.15g\n" % q25)
-        sys.stdout.write("median=%.15g\n" % q50)
-        sys.stdout.write("third_quartile=%.15g\n" % q75)
-        for i in range(len(perc)):
-            percstr = "%.15g" % perc[i]
-            percstr = percstr.replace('.', '_')
-            sys.stdout.write("percentile_%s=%.15g\n" % (percstr, pval[i]))
 
 if __name__ == "__main__":
     options, flags = gscript.parser()
-    atexit.register(cleanup)
     main()
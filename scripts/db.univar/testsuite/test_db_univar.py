@@ -44,5 +44,61 @@ class TestDbUnivar(TestCase):
                               column=self.columnName)
         self.assertModule(module)
 
+
+class TestDbUnivarGroups(TestCase):
+    """Test the extended and grouped statistics of db.univar"""
+
+    table = 'test_db_univar'
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a table with the values 1 to 10 in two groups"""
+        sql = "CREATE TABLE %s (grp VARCHAR(5), a DOUBLE PRECISION, " \
+              "b INTEGER);" % cls.table
+        for value in range(1, 11):
+            sql += "INSERT INTO %s VALUES ('%s', %d, %d);" % (
+                cls.table, 'x' if value <= 5 else 'y', value, 2 * value)
+        run_command('db.execute', sql=sql)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the table"""
+        run_command('db.droptable', table=cls.table, flags='f')
+
+    def test_extended(self):
+        """Compare the extended statistics with the known values"""
+        module = SimpleModule('db.univar', table=self.table, column='a',
+                              flags='eg')
+        self.assertModuleKeyValue(module,
+                                  reference=dict(n=10, min=1, max=10,
+                                                 mean=5.5, sum=55,
+                                                 first_quartile=2,
+                                                 median=5.5,
+                                                 third_quartile=8,
+                                                 percentile_90=9),
+                                  precision=1e-10, sep='=')
+
+    def test_extended_low_memory(self):
+        """The approximated quantiles are exact for small tables"""
+        module = SimpleModule('db.univar', table=self.table, column='a',
+                              flags='eg', memory=0)
+        self.assertModuleKeyValue(module,
+                                  reference=dict(n=10, first_quartile=2,
+                                                 median=5.5, third_quartile=8),
+                                  precision=1e-10, sep='=')
+
+    def test_group(self):
+        """Statistics of several columns grouped by a column"""
+        module = SimpleModule('db.univar', table=self.table,
+                              column=['a', 'b'], group='grp')
+        self.assertModule(module)
+        self.assertLooksLike(
+            """column|grp|n|min|max|range|mean|mean_abs|variance|stddev|coeff_var|sum
+a|x|5|1|5|4|3|3|2|...|...|15
+b|x|5|2|10|8|6|6|8|...|...|30
+a|y|5|6|10|4|8|8|2|...|...|40
+b|y|5|12|20|8|16|16|8|...|...|80
+""", module.outputs.stdout)
+
 if __name__ == '__main__':
     test()
@@ -106,20 +106,33 @@
 #% description: Cache size for raster rows
 #% answer: 300
 #%end
+#%option
+#% key: nprocs
+#% type: integer
+#% required: no
+#% multiple: no
+#% description: Number of holes to fill in parallel
+#% answer: 1
+#% guisection: RST options
+#%end
 
 
 import sys
 import os
 import atexit
 import subprocess
+from functools import partial
+from multiprocessing.pool import ThreadPool
 
 import grass.script as grass
-from grass.exceptions import CalledModuleError
+from grass.exceptions import CalledModuleError, ScriptError
 
 tmp_rmaps = list()
 tmp_vmaps = list()
 usermask = None
 mapset = None
+# maximum number of maps passed to r.patch and g.remove at once
+FILE_LIMIT = 500
 
 # what to do in case of user break:
 
@@ -135,6 +148,155 @@ def cleanup():
             grass.run_command('g.rename', quiet=True, raster=(usermask, 'MASK'), overwrite=True)
 
 
+def remove_maps(type, names, quiet):
+    """Remove maps in chunks to keep the command line short"""
+    for i in range(0, len(names), FILE_LIMIT):
+        grass.run_command('g.remove', quiet=quiet, flags='fb', type=type,
+                          name=names[i:i + FILE_LIMIT])
+
+
+def patch_maps(maps, output, quiet):
+    """Patch the filled holes into a single map
+
+    The holes do not overlap, the maps are patched in chunks to not exceed
+    the number of open files.
+    """
+    level = 0
+    while len(maps) > FILE_LIMIT:
+        chunks = list()
+        for i in range(0, len(maps), FILE_LIMIT):
+            chunk = '%s_patch_%d_%d' % (output, level, i)
+            tmp_rmaps.append(chunk)
+            grass.run_command('r.patch', input=maps[i:i + FILE_LIMIT],
+                              output=chunk, quiet=quiet)
+            chunks.append(chunk)
+        if level > 0:
+            for name in maps:
+                tmp_rmaps.remove(name)
+            remove_maps('raster', maps, quiet)
+        maps = chunks
+        level += 1
+    grass.run_command('r.patch', input=maps, output=output, quiet=quiet)
+    if level > 0:
+        for name in maps:
+            tmp_rmaps.remove(name)
+        remove_maps('raster', maps, quiet)
+
+
+def fill_hole(cat, input, prefix, edge, ew_res, ns_res, tension, smooth,
+              npmin, segmax, quiet):
+    """Fill a single hole with v.surf.rst
+
+    The modules are run in a region around the hole that is passed with
+    GRASS_REGION, the current region is not changed, so that several holes
+    can be filled at the same time.
+
+    Returns the name of the hole and the name of the raster map with the
+    interpolated values of the hole cells, or None if the hole could not
+    be filled.
+    """
+    holename = prefix + 'hole_' + cat
+    # cut out only CAT hole for processing
+    tmp_vmaps.append(holename + '_pol')
+    grass.run_command('v.extract', flags='t', input=prefix + 'holes',
+                      output=holename + '_pol', cats=cat, quiet=quiet)
+
+    # zoom to specific hole with a buffer of two cells around the hole to
+    # remove rest of data
+    env = dict(os.environ)
+    env['GRASS_REGION'] = grass.region_env(vector=holename + '_pol',
+                                           align=input,
+                                           w='w-%d' % (edge * 2 * ew_res),
+                                           e='e+%d' % (edge * 2 * ew_res),
+                                           n='n+%d' % (edge * 2 * ns_res),
+                                           s='s-%d' % (edge * 2 * ns_res))
+
+    # remove temporary map to not overfill disk
+    grass.run_command('g.remove', flags='fb', type='vector',
+                      name=holename + '_pol', quiet=quiet)
+    tmp_vmaps.remove(holename + '_pol')
+
+    # copy only data around hole
+    tmp_rmaps.append(holename)
+    grass.mapcalc("$out = if($inp == $catn, $inp, null())",
+                  out=holename, inp=prefix + 'holes', catn=cat, env=env)
+
+    # grow hole border to get it's edge area
+    tmp_rmaps.append(holename + '_grown')
+    grass.run_command('r.grow', input=holename, radius=edge + 0.01,
+                      old=-1, out=holename + '_grown', quiet=quiet, env=env)
+
+    # no idea why r.grow old=-1 doesn't replace existing values with NULL
+    tmp_rmaps.append(holename + '_edges')
+    grass.mapcalc("$out = if($inp == -1, null(), \"$dem\")",
+                  out=holename + '_edges', inp=holename + '_grown', dem=input,
+                  env=env)
+
+    # convert to points for interpolation
+    tmp_vmaps.append(holename)
+    grass.run_command('r.to.vect', input=holename + '_edges',
+                      output=holename, type='point', flags='zt', quiet=quiet,
+                      env=env)
+
+    # count number of points to control segmax parameter for interpolation:
+    pointsnumber = grass.vector_info_topo(map=holename)['points']
+    grass.verbose(_("Interpolating %d points") % pointsnumber)
+
+    if pointsnumber < 2:
+        grass.verbose(_("No points to interpolate"))
+        return holename, None
+
+    # Avoid v.surf.rst warnings
+    if pointsnumber < segmax:
+        use_npmin = pointsnumber
+        use_segmax = pointsnumber * 2
+    else:
+        use_npmin = npmin
+        use_segmax = segmax
+
+    # launch v.surf.rst
+    tmp_rmaps.append(holename + '_dem')
+    try:
+        grass.run_command('v.surf.rst', quiet=quiet,
+                          input=holename, elev=holename + '_dem',
+                          tension=tension, smooth=smooth,
+                          segmax=use_segmax, npmin=use_npmin, env=env)
+    except CalledModuleError:
+        # GTC Hole is NULL area in a raster map
+        raise ScriptError(_("Failed to fill hole %s") % cat)
+
+    # v.surf.rst sometimes fails with exit code 0
+    # related bug #1813
+    if not grass.find_file(holename + '_dem')['file']:
+        for name in ('', '_grown', '_edges', '_dem'):
+            tmp_rmaps.remove(holename + name)
+        tmp_vmaps.remove(holename)
+        grass.warning(
+            _("Filling has failed silently. Leaving temporary maps "
+              "with prefix <%s> for debugging.") %
+            holename)
+        return holename, None
+
+    # keep the interpolated values of the hole cells, they are patched
+    # into the original DEM later
+    tmp_rmaps.append(holename + '_fill')
+    grass.mapcalc("$out = if(isnull($inp), null(), $dem)",
+                  out=holename + '_fill', inp=holename, dem=holename + '_dem',
+                  env=env)
+
+    # remove temporary maps to not overfill disk
+    for name in ('', '_grown', '_edges', '_dem'):
+        tmp_rmaps.remove(holename + name)
+    grass.run_command('g.remove', quiet=quiet, flags='fb', type='raster',
+                      name=(holename, holename + '_grown',
+                            holename + '_edges', holename + '_dem'))
+    tmp_vmaps.remove(holename)
+    grass.run_command('g.remove', quiet=quiet, flags='fb', type='vector',
+                      name=holename)
+
+    return holename, holename + '_fill'
+
+
 def main():
     global usermask, mapset, tmp_rmaps, tmp_vmaps
 
@@ -148,6 +310,7 @@ def main():
     npmin = int(options['npmin'])
     lambda_ = float(options['lambda'])
     memory = options['memory']
+    nprocs = int(options['nprocs'])
     quiet = True  # FIXME
     mapset = grass.gisenv()['MAPSET']
     unique = str(os.getpid())  # Shouldn't we use temp name?
@@ -266,181 +429,60 @@ def main():
 
         # GTC Hole is NULL area in a raster map
         grass.message(_("Processing %d map holes") % len(cat_list))
-        first = True
-        hole_n = 1
-        for cat in cat_list:
-            holename = prefix + 'hole_' + cat
-            # GTC Hole is a NULL area in a raster map
-            grass.message(_("Filling hole %s of %s") % (hole_n, len(cat_list)))
-            hole_n = hole_n + 1
-            # cut out only CAT hole for processing
-            try:
-                grass.run_command('v.extract', input=prefix + 'holes',
-                                  output=holename + '_pol',
-                                  cats=cat, quiet=quiet)
-            except CalledModuleError:
-                grass.fatal(_("abandoned. Removing temporary maps, restoring "
-                              "user mask if needed:"))
-            tmp_vmaps.append(holename + '_pol')
-
-            # zoom to specific hole with a buffer of two cells around the hole to
-            # remove rest of data
-            try:
-                grass.run_command('g.region',
-                                  vector=holename + '_pol', align=input,
-                                  w='w-%d' % (edge * 2 * ew_res),
-                                  e='e+%d' % (edge * 2 * ew_res),
-                                  n='n+%d' % (edge * 2 * ns_res),
-                                  s='s-%d' % (edge * 2 * ns_res),
-                                  quiet=quiet)
-            except CalledModuleError:
-                grass.fatal(_("abandoned. Removing temporary maps, restoring "
-                              "user mask if needed:"))
-
-            # remove temporary map to not overfill disk
-            try:
-                grass.run_command('g.remove', flags='fb', type='vector',
-                                  name=holename + '_pol', quiet=quiet)
-            except CalledModuleError:
-                grass.fatal(_("abandoned. Removing temporary maps, restoring "
-                              "user mask if needed:"))
-            tmp_vmaps.remove(holename + '_pol')
-
-            # copy only data around hole
-            grass.mapcalc("$out = if($inp == $catn, $inp, null())",
-                          out=holename, inp=prefix + 'holes', catn=cat)
-            tmp_rmaps.append(holename)
-
-            # If here loop is split into two, next part of loop can be run in parallel
-            # (except final result patching)
-            # Downside - on large maps such approach causes large disk usage
-
-            # grow hole border to get it's edge area
-            tmp_rmaps.append(holename + '_grown')
-            try:
-                grass.run_command('r.grow', input=holename, radius=edge + 0.01,
-                                  old=-1, out=holename + '_grown', quiet=quiet)
-            except CalledModuleError:
-                grass.fatal(_("abandoned. Removing temporary map, restoring "
-                              "user mask if needed:"))
-
-            # no idea why r.grow old=-1 doesn't replace existing values with NULL
-            grass.mapcalc("$out = if($inp == -1, null(), \"$dem\")",
-                          out=holename + '_edges', inp=holename + '_grown', dem=input)
-            tmp_rmaps.append(holename + '_edges')
+        fill = partial(fill_hole, input=input, prefix=prefix, edge=edge,
+                       ew_res=ew_res, ns_res=ns_res, tension=tension,
+                       smooth=smooth, npmin=npmin, segmax=segmax,
+                       quiet=quiet)
+        # the holes are filled by threads, each running the modules of a
+        # hole in its own region, so that the lists of temporary maps are
+        # shared for the cleanup
+        pool = None
+        if nprocs > 1 and len(cat_list) > 1:
+            pool = ThreadPool(min(nprocs, len(cat_list)))
+            results = pool.imap_unordered(fill, cat_list)
+        else:
+            results = (fill(cat) for cat in cat_list)
 
-            # convert to points for interpolation
-            tmp_vmaps.append(holename)
-            try:
-                grass.run_command('r.to.vect',
-                                  input=holename + '_edges', output=holename,
-                                  type='point', flags='z', quiet=quiet)
-            except CalledModuleError:
-                grass.fatal(_("abandoned. Removing temporary maps, restoring "
-                              "user mask if needed:"))
-
-            # count number of points to control segmax parameter for interpolation:
-            pointsnumber = grass.vector_info_topo(map=holename)['points']
-            grass.verbose(_("Interpolating %d points") % pointsnumber)
-
-            if pointsnumber < 2:
-                grass.verbose(_("No points to interpolate"))
-                failed_list.append(holename)
-                continue
-
-            # Avoid v.surf.rst warnings
-            if pointsnumber < segmax:
-                use_npmin = pointsnumber
-                use_segmax = pointsnumber * 2
+        fill_maps = list()
+        hole_n = 0
+        error = None
+        try:
+            for holename, fill_map in results:
+                hole_n += 1
+                # GTC Hole is a NULL area in a raster map
+                grass.message(_("Filled hole %s of %s") % (hole_n, len(cat_list)))
+                if fill_map:
+                    fill_maps.append(fill_map)
+                else:
+                    failed_list.append(holename)
+        except CalledModuleError:
+            error = _("abandoned. Removing temporary maps, restoring "
+                      "user mask if needed:")
+        except ScriptError as e:
+            error = e.value
+        if pool:
+            # do not start the remaining holes after an error
+            if error:
+                pool.terminate()
             else:
-                use_npmin = npmin
-                use_segmax = segmax
+                pool.close()
+            pool.join()
+        if error:
+            grass.fatal(error)
 
-            # launch v.surf.rst
-            tmp_rmaps.append(holename + '_dem')
-            try:
-                grass.run_command('v.surf.rst', quiet=quiet,
-                                  input=holename, elev=holename + '_dem',
-                                  tension=tension, smooth=smooth,
-                                  segmax=use_segmax, npmin=use_npmin)
-            except CalledModuleError:
-                # GTC Hole is NULL area in a raster map
-                grass.fatal(_("Failed to fill hole %s") % cat)
-
-            # v.surf.rst sometimes fails with exit code 0
-            # related bug #1813
-            if not grass.find_file(holename + '_dem')['file']:
-                try:
-                    tmp_rmaps.remove(holename)
-                    tmp_rmaps.remove(holename + '_grown')
-                    tmp_rmaps.remove(holename + '_edges')
-                    tmp_rmaps.remove(holename + '_dem')
-                    tmp_vmaps.remove(holename)
-                except:
-                    pass
-                grass.warning(
-                    _("Filling has failed silently. Leaving temporary maps "
-                      "with prefix <%s> for debugging.") %
-                    holename)
-                failed_list.append(holename)
-                continue
-
-            # append hole result to interpolated version later used to patch into original DEM
-            if first:
-                tmp_rmaps.append(filling)
-                grass.run_command('g.region', align=input, raster=holename + '_dem', quiet=quiet)
-                grass.mapcalc("$out = if(isnull($inp), null(), $dem)",
-                              out=filling, inp=holename, dem=holename + '_dem')
-                first = False
+        # patch the hole results once in the aligned region
+        tmp_rmaps.append(filling)
+        try:
+            if fill_maps:
+                patch_maps(fill_maps, filling, quiet)
             else:
-                tmp_rmaps.append(filling + '_tmp')
-                grass.run_command(
-                    'g.region', align=input, raster=(
-                        filling, holename + '_dem'), quiet=quiet)
-                grass.mapcalc(
-                    "$out = if(isnull($inp), if(isnull($fill), null(), $fill), $dem)",
-                    out=filling + '_tmp',
-                    inp=holename,
-                    dem=holename + '_dem',
-                    fill=filling)
-                try:
-                    grass.run_command('g.rename',
-                                      raster=(filling + '_tmp', filling),
-                                      overwrite=True, quiet=quiet)
-                except CalledModuleError:
-                    grass.fatal(
-                        _("abandoned. Removing temporary maps, restoring user "
-                          "mask if needed:"))
-                # this map has been removed. No need for later cleanup.
-                tmp_rmaps.remove(filling + '_tmp')
-
-            # remove temporary maps to not overfill disk
-            try:
-                tmp_rmaps.remove(holename)
-                tmp_rmaps.remove(holename + '_grown')
-                tmp_rmaps.remove(holename + '_edges')
-                tmp_rmaps.remove(holename + '_dem')
-            except:
-                pass
-            try:
-                grass.run_command('g.remove', quiet=quiet,
-                                  flags='fb', type='raster',
-                                  name=(holename,
-                                        holename + '_grown',
-                                        holename + '_edges',
-                                        holename + '_dem'))
-            except CalledModuleError:
-                grass.fatal(_("abandoned. Removing temporary maps, restoring "
-                              "user mask if needed:"))
-            try:
-                tmp_vmaps.remove(holename)
-            except:
-                pass
-            try:
-                grass.run_command('g.remove', quiet=quiet, flags='fb',
-                                  type='vector', name=holename)
-            except CalledModuleError:
-                grass.fatal(_("abandoned. Removing temporary maps, restoring user mask if needed:"))
+                grass.mapcalc("$out = null()", out=filling)
+            for fill_map in fill_maps:
+                tmp_rmaps.remove(fill_map)
+            remove_maps('raster', fill_maps, quiet)
+        except CalledModuleError:
+            grass.fatal(_("abandoned. Removing temporary maps, restoring "
+                          "user mask if needed:"))
 
     # check if method is different from rst to use r.resamp.bspline
     if method != 'rst':
@@ -43,6 +43,14 @@ class TestRFillNulls(TestCase):
         self.assertRasterFitsUnivar(raster=self.mapComplete,
                                     reference=self.values)
 
+    def test_rst_nprocs(self):
+        module = SimpleModule(self.module, input=self.mapNameCalc,
+                              output=self.mapComplete, segmax=1200,
+                              npmin=100, tension=150, nprocs=4)
+        self.assertModule(module)
+        self.assertRasterFitsUnivar(raster=self.mapComplete,
+                                    reference=self.values)
+
     def test_bspline(self):
         module = SimpleModule(self.module, input=self.mapNameCalc,
                               output=self.mapComplete, method='bicubic')
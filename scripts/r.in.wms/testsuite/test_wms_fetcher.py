@@ -0,0 +1,168 @@
+"""
+Test of the concurrent tile download of r.in.wms against a local HTTP server
+
+@author: GRASS Development Team
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urllib2 import HTTPError
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.error import HTTPError
+
+from grass.gunittest.case import TestCase
+from grass.gunittest.main import test
+
+sys.path.insert(1, os.path.join(os.environ['GISBASE'], 'etc', 'r.in.wms'))
+from wms_fetcher import TileFetcher
+
+
+class TileHandler(BaseHTTPRequestHandler):
+    """Serves the request path as tile, the first request of paths
+    containing 'busy' is refused
+    """
+
+    protocol_version = 'HTTP/1.1'
+    requests = {}
+    clients = set()
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with self.lock:
+            count = self.requests.get(self.path, 0) + 1
+            self.requests[self.path] = count
+            self.clients.add(self.client_address)
+
+        if 'busy' in self.path and count == 1:
+            status, body = 503, b''
+        elif 'secret' in self.path:
+            status, body = 401, b''
+        else:
+            status, body = 200, self.path.encode('ascii') * 100
+
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ThreadingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class TestTileFetcher(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingServer(('127.0.0.1', 0), TileHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+        cls.url = 'http://127.0.0.1:%d/tile?' % cls.server.server_address[1]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        TileHandler.requests.clear()
+        TileHandler.clients.clear()
+        self.tempdir = tempfile.mkdtemp()
+        self.cache = os.path.join(self.tempdir, 'cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def tempfile(self):
+        handle, path = tempfile.mkstemp(dir=self.tempdir)
+        os.close(handle)
+        return path
+
+    def tiles(self, num):
+        return [(self.url + 'col=%d' % i, {'col': i}) for i in range(num)]
+
+    def assertTile(self, url, path):
+        with open(path, 'rb') as tile:
+            expected = url[url.index('/tile'):].encode('ascii') * 100
+            self.assertEqual(tile.read(), expected)
+
+    def test_concurrent(self):
+        """Test that all tiles are downloaded over persistent connections"""
+        fetcher = TileFetcher(self.tempfile, maxconn=3)
+        tiles = self.tiles(12)
+        result = list(fetcher.imap(tiles))
+        self.assertEqual(len(result), 12)
+        self.assertEqual(sorted(ref['col'] for url, ref, path, cached in result),
+                         list(range(12)))
+        for url, tile_ref, path, cached in result:
+            self.assertFalse(cached)
+            self.assertTile(url, path)
+        self.assertLessEqual(len(TileHandler.clients), 3)
+
+    def test_close(self):
+        """Test that the persistent connections are closed"""
+        for maxconn in (1, 3):
+            fetcher = TileFetcher(self.tempfile, maxconn=maxconn)
+            opened = []
+            connection = fetcher._connection
+
+            def _connection(*args, **kwargs):
+                opened.append(connection(*args, **kwargs))
+                return opened[-1]
+
+            fetcher._connection = _connection
+            self.assertEqual(len(list(fetcher.imap(self.tiles(6)))), 6)
+            self.assertTrue(opened)
+            self.assertFalse(fetcher.connections)
+            for conn in opened:
+                self.assertIsNone(conn.sock)
+
+    def test_retry(self):
+        """Test that a refused tile request is repeated"""
+        fetcher = TileFetcher(self.tempfile, maxconn=2, backoff=0)
+        tiles = [(self.url + 'busy', {})] + self.tiles(3)
+        result = list(fetcher.imap(tiles))
+        self.assertEqual(len(result), 4)
+        self.assertEqual(TileHandler.requests['/tile?busy'], 2)
+        for url, tile_ref, path, cached in result:
+            self.assertTile(url, path)
+
+    def test_unauthorized(self):
+        """Test that an authorization failure is not repeated"""
+        fetcher = TileFetcher(self.tempfile, maxconn=2, backoff=0)
+        tiles = [(self.url + 'secret', {})] + self.tiles(3)
+        with self.assertRaises(HTTPError):
+            list(fetcher.imap(tiles))
+        self.assertEqual(TileHandler.requests['/tile?secret'], 1)
+
+    def test_cache(self):
+        """Test that cached tiles are not downloaded again"""
+        fetcher = TileFetcher(self.tempfile, maxconn=2, cache=self.cache)
+        tiles = self.tiles(5)
+        for url, tile_ref, path, cached in fetcher.imap(tiles):
+            self.assertFalse(cached)
+            fetcher.store(url, path)
+        self.assertEqual(len(os.listdir(self.cache)), 5)
+
+        TileHandler.requests.clear()
+        for url, tile_ref, path, cached in fetcher.imap(tiles):
+            self.assertTrue(cached)
+            self.assertTile(url, path)
+        self.assertFalse(TileHandler.requests)
+
+
+if __name__ == '__main__':
+    test()
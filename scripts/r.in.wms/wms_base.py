@@ -164,6 +164,12 @@ class WMSBase(object):
                 self.region['rows'] /
                 float(maxrows)))
 
+        self.params['maxconn'] = int(options['maxconn'])
+        if self.params['maxconn'] < 1:
+            grass.fatal(_("Maxconn must be greater than 0"))
+
+        self.params['cache'] = options['cache'].strip()
+
         # default format for GDAL library
         self.gdal_drv_format = "GTiff"
 
@@ -186,7 +192,7 @@ class WMSBase(object):
 
             if i_param in options and \
                options[i_param] and \
-               i_param not in ['srs', 'wms_version', 'format']:  # params with default value
+               i_param not in ['srs', 'wms_version', 'format', 'maxconn']:  # params with default value
                 not_relevant_params.append('<' + i_param + '>')
 
         if len(not_relevant_params) > 0:
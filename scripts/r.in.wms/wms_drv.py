@@ -16,11 +16,8 @@ This program is free software under the GNU General Public License
 @author Stepan Turek <stepan.turek seznam.cz> (Mentor: Martin Landa)
 """
 
-import socket
 import grass.script as grass
 
-from time import sleep
-
 try:
     from osgeo import gdal
     from osgeo import gdalconst
@@ -45,6 +42,7 @@ except ImportError:  # < Python 2.7
     from xml.parsers.expat import ExpatError as ParseError
 
 from wms_base import WMSBase, GetSRSParamVal
+from wms_fetcher import TileFetcher
 
 from wms_cap_parsers import WMTSCapabilitiesTree, OnEarthCapabilitiesTree
 from srs import Srs
@@ -97,33 +95,34 @@ class WMSDrv(WMSBase):
         # all tiles will be joined
         map_region = req_mgr.GetMapRegion()
 
-        init = True
-        temp_map = None
-
-        fetch_try = 0
-
-        # iterate through all tiles and download them
+        # collect all tiles in advance, the request managers reuse
+        # the dictionary with the tile reference
+        tiles = []
         while True:
+            # get url for request the tile and information for placing the tile into
+            # raster with other tiles
+            tile = req_mgr.GetNextTile()
 
-            if fetch_try == 0:
-                # get url for request the tile and information for placing the tile into
-                # raster with other tiles
-                tile = req_mgr.GetNextTile()
-
-            # if last tile has been already downloaded
+            # if last tile has been already got
             if not tile:
                 break
+            tiles.append((tile[0], dict(tile[1])))
 
-            # url for request the tile
-            query_url = tile[0]
+        fetcher = TileFetcher(self._tempfile,
+                              username=self.params['username'],
+                              password=self.params['password'],
+                              maxconn=self.params['maxconn'],
+                              cache=self.params['cache'])
 
-            # the tile size and offset in pixels for placing it into raster where tiles are joined
-            tile_ref = tile[1]
-            grass.debug(query_url, 2)
+        init = True
+        temp_map = None
+
+        # download the tiles concurrently and merge each tile as soon as
+        # it arrives
+        tiles_iter = fetcher.imap(tiles)
+        while True:
             try:
-                wms_data = self._fetchDataFromServer(
-                    query_url, self.params['username'],
-                    self.params['password'])
+                tile = next(tiles_iter, None)
             except (IOError, HTTPException) as e:
                 if isinstance(e, HTTPError) and e.code == 401:
                     grass.fatal(
@@ -134,37 +133,14 @@ class WMSDrv(WMSBase):
                         _("Unable to fetch data from: '%s'\n%s") %
                         (self.params['url'], str(e)))
 
-            temp_tile = self._tempfile()
-
-            # download data into temporary file
-            try:
-                temp_tile_opened = open(temp_tile, 'wb')
-                temp_tile_opened.write(wms_data.read())
-            except IOError as e:
-                # some servers are not happy with many subsequent requests for tiles done immediately,
-                # if immediate request was unsuccessful, try to repeat the request after 5s and 30s breaks
-                # TODO probably servers can return more kinds of errors related to this
-                # problem (not only 104)
-                if isinstance(e, socket.error) and e[0] == 104 and fetch_try < 2:
-                    fetch_try += 1
-
-                    if fetch_try == 1:
-                        sleep_time = 5
-                    elif fetch_try == 2:
-                        sleep_time = 30
-
-                    grass.warning(
-                        _("Server refused to send data for a tile.\nRequest will be repeated after %d s.") %
-                        sleep_time)
-
-                    sleep(sleep_time)
-                    continue
-                else:
-                    grass.fatal(_("Unable to write data into tempfile.\n%s") % str(e))
-            finally:
-                temp_tile_opened.close()
+            # if last tile has been already downloaded
+            if not tile:
+                break
 
-            fetch_try = 0
+            # url for request the tile, the tile size and offset in pixels for
+            # placing it into raster where tiles are joined, downloaded tile
+            query_url, tile_ref, temp_tile, cached = tile
+            grass.debug(query_url, 2)
 
             tile_dataset_info = gdal.Open(temp_tile, gdal.GA_ReadOnly)
             if tile_dataset_info is None:
@@ -185,6 +161,11 @@ class WMSDrv(WMSBase):
             temp_tile_pct2rgb = None
             if tile_dataset_info.RasterCount < 1:
                 grass.fatal(_("WMS server error: no band(s) received. Is server URL correct? <%s>") % server_url )
+
+            # only valid tiles are stored in the tile cache
+            if not cached:
+                fetcher.store(query_url, temp_tile)
+
             if tile_dataset_info.RasterCount == 1 and \
                tile_dataset_info.GetRasterBand(1).GetRasterColorTable() is not None:
                 # expansion of color table into bands
@@ -201,7 +182,7 @@ class WMSDrv(WMSBase):
                 metadata = driver.GetMetadata()
                 if gdal.DCAP_CREATE not in metadata or \
                         metadata[gdal.DCAP_CREATE] == 'NO':
-                    grass.fatal(_('Driver %s does not supports Create() method') % drv_format)
+                    grass.fatal(_('Driver %s does not supports Create() method') % self.gdal_drv_format)
                 self.temp_map_bands_num = tile_dataset.RasterCount
                 temp_map_dataset = driver.Create(temp_map, map_region['cols'], map_region['rows'],
                                                  self.temp_map_bands_num,
@@ -217,7 +198,8 @@ class WMSDrv(WMSBase):
 
             tile_dataset = None
             tile_dataset_info = None
-            grass.try_remove(temp_tile)
+            if not cached:
+                grass.try_remove(temp_tile)
             grass.try_remove(temp_tile_pct2rgb)
 
         if not temp_map:
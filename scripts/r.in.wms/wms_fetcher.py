@@ -0,0 +1,263 @@
+"""!
+@brief Concurrent download of tiles for the GRASS drivers of r.in.wms.
+
+List of classes:
+ - wms_fetcher::TileFetcher
+
+(C) 2020 by the GRASS Development Team
+
+This program is free software under the GNU General Public License
+(>=v2). Read the file COPYING that comes with GRASS for details.
+"""
+
+import base64
+import hashlib
+import os
+import shutil
+import threading
+import time
+from multiprocessing.pool import ThreadPool
+
+try:
+    from urllib2 import Request, urlopen, HTTPError, getproxies, proxy_bypass
+    from urlparse import urlsplit
+    from httplib import HTTPConnection, HTTPSConnection, HTTPException
+except ImportError:
+    # python3
+    from urllib.request import Request, urlopen, getproxies, proxy_bypass
+    from urllib.error import HTTPError
+    from urllib.parse import urlsplit
+    from http.client import HTTPConnection, HTTPSConnection, HTTPException
+
+import grass.script as grass
+
+# size of the blocks in which the tiles are written to disk
+CHUNK_SIZE = 65536
+
+# HTTP status codes of responses, which are worth to be repeated
+RETRY_CODES = (429, 500, 502, 503, 504)
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+
+class TileFetcher(object):
+    """!Downloads tiles with a bounded number of concurrent connections.
+
+    Each download thread keeps its HTTP connections open, so that the
+    tiles of one server are requested over persistent connections, the
+    connections are closed when all tiles are downloaded.
+    Refused requests are repeated with an exponential backoff, e.g.
+    after 5, 10 and 20 seconds. The tiles can be cached on disk, the
+    cache is keyed by the tile request URL, which contains all
+    parameters of the request.
+    """
+
+    def __init__(self, tempfile, username=None, password=None, maxconn=1,
+                 cache=None, retries=3, backoff=5, timeout=60):
+        """!
+        @param tempfile function returning a path for a downloaded tile
+        @param username user name for HTTP basic authentication
+        @param password password for HTTP basic authentication
+        @param maxconn maximum number of concurrent connections
+        @param cache directory of the tile cache or None
+        @param retries how many times is a refused request repeated
+        @param backoff seconds to wait before the first repetition
+        @param timeout timeout of the connections in seconds
+        """
+        self.tempfile = tempfile
+        self.maxconn = max(1, int(maxconn))
+        self.cache = cache
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+        self.headers = {}
+        if username and password:
+            credentials = base64.b64encode(
+                ('%s:%s' % (username, password)).encode('utf-8'))
+            self.headers['Authorization'] = \
+                'Basic %s' % credentials.decode('ascii')
+        self.username = username
+
+        self.proxies = getproxies()
+        self.local = threading.local()
+        # the connections of all threads, see close()
+        self.connections = []
+        self.lock = threading.Lock()
+
+        if self.cache and not os.path.isdir(self.cache):
+            try:
+                os.makedirs(self.cache)
+            except OSError as error:
+                grass.fatal(_("Unable to create tile cache directory <%s>.\n%s")
+                            % (self.cache, error))
+
+    def imap(self, tiles):
+        """!Download the tiles, the tiles are yielded as soon as they are
+        available, not in the order of the requests.
+
+        @param tiles list of tuples (url, tile_ref)
+
+        @return iterator of tuples (url, tile_ref, path, cached), cached
+                is True in case the tile was found in the tile cache
+        """
+        if self.maxconn == 1 or len(tiles) < 2:
+            try:
+                for url, tile_ref in tiles:
+                    yield (url, tile_ref) + self.fetch(url)
+            finally:
+                self.close()
+            return
+
+        pool = ThreadPool(min(self.maxconn, len(tiles)))
+        try:
+            for result in pool.imap_unordered(self._fetchTile, tiles):
+                yield result
+        finally:
+            pool.terminate()
+            pool.join()
+            self.close()
+
+    def close(self):
+        """!Close the persistent connections of all threads"""
+        with self.lock:
+            connections, self.connections = self.connections, []
+            # the threads open new connections when used again
+            self.local = threading.local()
+        for connection in connections:
+            connection.close()
+
+    def _fetchTile(self, tile):
+        url, tile_ref = tile
+        return (url, tile_ref) + self.fetch(url)
+
+    def fetch(self, url):
+        """!Download one tile into a temporary file or get it from the cache
+
+        @return tuple (path, cached)
+        """
+        if self.cache:
+            cache_file = self.cacheFile(url)
+            if os.path.isfile(cache_file):
+                grass.debug("Tile found in cache: %s" % cache_file, 3)
+                return cache_file, True
+
+        attempt = 0
+        while True:
+            try:
+                return self._download(url), False
+            except HTTPError as error:
+                if error.code not in RETRY_CODES or attempt >= self.retries:
+                    raise
+            except (IOError, HTTPException):
+                if attempt >= self.retries:
+                    raise
+
+            sleep_time = self.backoff * 2 ** attempt
+            attempt += 1
+            grass.warning(_("Server refused to send data for a tile.\n"
+                            "Request will be repeated after %d s.") % sleep_time)
+            time.sleep(sleep_time)
+
+    def cacheFile(self, url):
+        """!Get the path of the tile in the cache"""
+        key = url
+        if self.username:
+            key += '\n' + self.username
+        return os.path.join(self.cache,
+                            hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def store(self, url, path):
+        """!Copy a valid downloaded tile into the tile cache"""
+        if not self.cache:
+            return
+        cache_file = self.cacheFile(url)
+        # copy and rename so that concurrent imports never read
+        # a partially written tile
+        temp_file = '%s.%d.%s' % (cache_file, os.getpid(),
+                                  threading.current_thread().ident)
+        try:
+            shutil.copyfile(path, temp_file)
+            os.rename(temp_file, cache_file)
+        except (IOError, OSError) as error:
+            grass.warning(_("Unable to store tile in cache <%s>.\n%s")
+                          % (self.cache, error))
+            grass.try_remove(temp_file)
+
+    def _download(self, url):
+        """!Download the tile into a temporary file
+
+        @return path to the temporary file
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or \
+           (parts.scheme in self.proxies and not proxy_bypass(parts.hostname)):
+            # proxies and other schemes are left on urllib
+            request = Request(url, headers=self.headers)
+            return self._write(urlopen(request, timeout=self.timeout))
+
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        connection = self._connection(parts.scheme, parts.netloc)
+        try:
+            connection.request('GET', path, headers=self.headers)
+            response = connection.getresponse()
+        except (IOError, HTTPException):
+            # the server may have closed the idle persistent connection,
+            # the request is repeated once with a new connection
+            connection = self._connection(parts.scheme, parts.netloc,
+                                          reconnect=True)
+            connection.request('GET', path, headers=self.headers)
+            response = connection.getresponse()
+
+        if response.status in REDIRECT_CODES and \
+           response.getheader('Location'):
+            response.read()
+            request = Request(response.getheader('Location'),
+                              headers=self.headers)
+            return self._write(urlopen(request, timeout=self.timeout))
+
+        if response.status >= 400:
+            response.read()
+            raise HTTPError(url, response.status, response.reason,
+                            response.msg, None)
+
+        return self._write(response)
+
+    def _connection(self, scheme, netloc, reconnect=False):
+        """!Get the persistent connection of the current thread"""
+        connections = getattr(self.local, 'connections', None)
+        if connections is None:
+            connections = self.local.connections = {}
+
+        key = (scheme, netloc)
+        connection = connections.get(key)
+        if connection is not None and reconnect:
+            connection.close()
+            connection = None
+        if connection is None:
+            if scheme == 'https':
+                connection = HTTPSConnection(netloc, timeout=self.timeout)
+            else:
+                connection = HTTPConnection(netloc, timeout=self.timeout)
+            connections[key] = connection
+            with self.lock:
+                self.connections.append(connection)
+        return connection
+
+    def _write(self, response):
+        """!Write the response body into a temporary file"""
+        temp_tile = self.tempfile()
+        try:
+            with open(temp_tile, 'wb') as temp_tile_opened:
+                while True:
+                    data = response.read(CHUNK_SIZE)
+                    if not data:
+                        break
+                    temp_tile_opened.write(data)
+        except (IOError, HTTPException):
+            grass.try_remove(temp_tile)
+            raise
+        return temp_tile
@@ -113,6 +113,14 @@ class WMSGdalDrv(WMSBase):
         block_size_y = etree.SubElement(gdal_wms, "BlockSizeY")
         block_size_y.text = str(self.tile_size['rows'])
 
+        max_connections = etree.SubElement(gdal_wms, "MaxConnections")
+        max_connections.text = str(self.params['maxconn'])
+
+        if self.params['cache']:
+            cache = etree.SubElement(gdal_wms, "Cache")
+            cache_path = etree.SubElement(cache, "Path")
+            cache_path.text = self.params['cache']
+
         if self.params['username'] and self.params['password']:
             user_password = etree.SubElement(gdal_wms, "UserPwd")
             user_password.text = "%s:%s" % (self.params['username'], self.params['password'])
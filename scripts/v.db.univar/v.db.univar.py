@@ -27,10 +27,16 @@
 #%end
 #%option G_OPT_V_FIELD
 #%end
-#%option G_OPT_DB_COLUMN
-#% description: Name of attribute column on which to calculate statistics (must be numeric)
+#%option G_OPT_DB_COLUMNS
+#% key: column
+#% description: Name of attribute column(s) on which to calculate statistics (must be numeric)
 #% required: yes
 #%end
+#%option G_OPT_DB_COLUMN
+#% key: group
+#% description: Name of attribute column to group the statistics by
+#% required: no
+#%end
 #%option G_OPT_DB_WHERE
 #%end
 #%option
@@ -42,6 +48,15 @@
 #% options: 0-100
 #% multiple: yes
 #%end
+#%option
+#% key: memory
+#% type: integer
+#% required: no
+#% multiple: no
+#% label: Maximum memory to be used (in MB)
+#% description: Memory for the exact quartiles and percentiles, approximations are used above
+#% answer: 300
+#%end
 #%flag
 #% key: e
 #% description: Extended statistics (quartiles and 90th percentile)
@@ -66,6 +81,8 @@ def main():
     column = options['column']
     where = options['where']
     perc = options['percentile']
+    group = options['group']
+    memory = options['memory']
 
     if not gscript.find_file(vector, element='vector')['file']:
         gscript.fatal(_("Vector map <%s> not found") % vector)
@@ -91,7 +108,8 @@ def main():
     try:
         gscript.run_command('db.univar', table=table, column=column,
                             database=database, driver=driver,
-                            perc=perc, where=where, flags=passflags)
+                            perc=perc, where=where, group=group,
+                            memory=memory, flags=passflags)
     except CalledModuleError:
         sys.exit(1)
 
@@ -64,6 +64,36 @@ class TestRastStats(TestCase):
         self.assertLooksLike(univar_string, str(v_db_select.outputs.stdout))
 
 
+    def test_in_process(self):
+        # Output of v.rast.stats
+        univar_string = """cat|value|label|a_minimum|a_maximum|a_sum|b_minimum|b_maximum|b_sum
+1|1||102|209|265905|102|209|265905
+2|2||121|280|1281195|121|280|1281195
+"""
+
+        self.assertModule("v.rast.stats", map="zone_map",
+                          raster=["map_a", "map_a"],
+                          method=["minimum", "maximum", "sum"], flags="cp",
+                          column_prefix=["a", "b"])
+        v_db_select = SimpleModule("v.db.select", map="zone_map")
+
+        self.runModule(v_db_select)
+        self.assertLooksLike(univar_string, str(v_db_select.outputs.stdout))
+
+    def test_nprocs(self):
+        output_str = """cat|name|a_median|a_number|a_range|b_median|b_number|b_range
+1|first|192|5|2|192|5|2
+2|second|181|27|5|181|27|5
+"""
+        self.assertModule("v.rast.stats", map="test_line",
+                          raster=["map_a", "map_a"],
+                          method=["median", "number", "range"], flags="c",
+                          column_prefix=["a", "b"], nprocs=2)
+        v_db_select = SimpleModule("v.db.select", map="test_line")
+
+        self.runModule(v_db_select)
+        self.assertLooksLike(output_str, str(v_db_select.outputs.stdout))
+
     def test_line_d(self):
         output_str = """cat|name|a_median|a_number|a_range
 1|first|192|3|1
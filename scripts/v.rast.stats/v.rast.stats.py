@@ -70,10 +70,24 @@
 #% answer: 90
 #% required : no
 #%end
+#%option
+#% key: nprocs
+#% type: integer
+#% description: Number of r.univar processes to run in parallel
+#% answer: 1
+#% required : no
+#%end
+#%flag
+#% key: p
+#% label: Compute the statistics of all raster maps in a single pass with NumPy
+#% description: Quartiles, median and percentile are always computed with r.univar
+#%end
 
 import sys
 import os
 import atexit
+from collections import deque
+
 import grass.script as grass
 from grass.script.utils import decode
 from grass.exceptions import CalledModuleError
@@ -87,6 +101,166 @@ def cleanup():
 #        grass.try_remove(f)
 
 
+def univar_tables(rasters, zones, extstat, percentile, nprocs=1):
+    """Compute the zonal statistics of the raster maps with r.univar
+
+    At most nprocs r.univar processes run at the same time. Yields the
+    index of each raster map and the rows of the r.univar table output,
+    in the order of the raster maps.
+    """
+    def start(raster):
+        return grass.pipe_command('r.univar', flags='t' + extstat, map=raster,
+                                  zones=zones, percentile=percentile, sep=';')
+
+    def read(r, p):
+        stdout = p.communicate()[0]
+        if p.returncode != 0:
+            grass.fatal(_("Unable to compute the statistics of raster map "
+                          "<%s>") % rasters[r])
+        lines = decode(stdout).splitlines()
+        # skip the header
+        return r, [line.split(';') for line in lines[1:] if line]
+
+    running = deque()
+    for r in range(len(rasters)):
+        running.append((r, start(rasters[r])))
+        if len(running) >= nprocs:
+            yield read(*running.popleft())
+    while running:
+        yield read(*running.popleft())
+
+
+def numpy_univar_tables(rasters, zones, cats):
+    """Compute the zonal statistics of all raster maps in a single pass
+
+    The zone map and the raster maps are read row by row and the
+    statistics of all zones are accumulated with numpy.bincount. Yields
+    the index of each raster map and rows in the layout of the r.univar
+    table output without the extended statistics.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        grass.fatal(_("NumPy is required to compute the statistics in process"))
+    from grass.pygrass.raster import RasterRow
+
+    zone_cats = np.array(sorted(int(cat) for cat in cats), dtype=np.int64)
+    nzones = len(zone_cats)
+    size = np.zeros(nzones, dtype=np.int64)
+    n = np.zeros((len(rasters), nzones), dtype=np.int64)
+    sums = np.zeros((len(rasters), nzones))
+    sums_sq = np.zeros((len(rasters), nzones))
+    mins = np.full((len(rasters), nzones), np.inf)
+    maxs = np.full((len(rasters), nzones), -np.inf)
+
+    maps = []
+    for raster in rasters:
+        name, mapset = (raster.split('@') + [''])[:2]
+        maps.append(RasterRow(name, mapset))
+    zone_map = RasterRow(zones)
+    zone_map.open('r')
+    try:
+        for rast in maps:
+            rast.open('r')
+        for row in range(zone_map._rows):
+            zone_row = np.asarray(zone_map.get_row(row)).astype(np.int64)
+            index = np.searchsorted(zone_cats, zone_row)
+            index[index == nzones] = 0
+            # NULL cells of the zone map do not match any category
+            in_zone = zone_cats[index] == zone_row
+            if not in_zone.any():
+                continue
+            index = index[in_zone]
+            size += np.bincount(index, minlength=nzones)
+            for r, rast in enumerate(maps):
+                values = np.asarray(rast.get_row(row))[in_zone]
+                if rast.mtype == 'CELL':
+                    valid = values != np.iinfo(np.int32).min
+                else:
+                    valid = ~np.isnan(values)
+                values = values[valid].astype(np.float64)
+                valid_index = index[valid]
+                n[r] += np.bincount(valid_index, minlength=nzones)
+                sums[r] += np.bincount(valid_index, weights=values,
+                                       minlength=nzones)
+                sums_sq[r] += np.bincount(valid_index, weights=values * values,
+                                          minlength=nzones)
+                np.minimum.at(mins[r], valid_index, values)
+                np.maximum.at(maxs[r], valid_index, values)
+    finally:
+        for rast in maps:
+            if rast.is_open():
+                rast.close()
+        zone_map.close()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for r in range(len(rasters)):
+            # the statistics are computed like in r.univar
+            mean = sums[r] / n[r]
+            variance = (sums_sq[r] - sums[r] * sums[r] / n[r]) / n[r]
+            variance[variance < 1.0e-15] = 0.0
+            stddev = np.sqrt(variance)
+            rows = []
+            for z in np.flatnonzero(size):
+                if n[r, z]:
+                    # the mean of the absolute values and their sum are
+                    # not used by any method
+                    stats = (mins[r, z], maxs[r, z], maxs[r, z] - mins[r, z],
+                             mean[z], np.nan, stddev[z], variance[z],
+                             stddev[z] / mean[z] * 100.0, sums[r, z], np.nan)
+                else:
+                    stats = (np.nan, ) * 10
+                rows.append(['%d' % zone_cats[z], '', '%d' % n[r, z],
+                             '%d' % (size[z] - n[r, z])] +
+                            ['%.15g' % value for value in stats])
+            yield r, rows
+
+
+def upload_statistics(fi, colnames, values):
+    """Update the columns of all categories in a single transaction
+
+    SQLite and PostgreSQL tables are updated with a single executemany
+    call, other drivers with a SQL file applied with db.execute.
+    """
+    if fi['driver'] in ('sqlite', 'pg'):
+        from grass.pygrass.vector.table import Link
+        link = Link(int(fi['layer']), fi['name'], fi['table'], fi['key'],
+                    fi['database'], fi['driver'])
+        placeholder = '?' if fi['driver'] == 'sqlite' else '%s'
+        sql = "UPDATE %s SET %s WHERE %s=%s" % (
+            fi['table'],
+            ', '.join('%s=%s' % (colname, placeholder) for colname in colnames),
+            fi['key'], placeholder)
+        conn = link.connection()
+        try:
+            cur = conn.cursor()
+            cur.executemany(sql, [[None if value is None else float(value)
+                                   for value in record] + [int(cat)]
+                                  for cat, record in values.items()])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return
+
+    grass.try_remove(sqltmp)
+    f = open(sqltmp, 'w')
+    f.write("{0}\n".format(grass.db_begin_transaction(fi['driver'])))
+    for cat, record in values.items():
+        f.write("UPDATE %s SET %s WHERE %s=%s;\n" % (
+            fi['table'],
+            ' , '.join("%s=%s" % (colname, 'NULL' if value is None else value)
+                       for colname, value in zip(colnames, record)),
+            fi['key'], cat))
+    f.write("{0}\n".format(grass.db_commit_transaction(fi['driver'])))
+    f.close()
+    grass.run_command('db.execute', input=sqltmp,
+                      database=fi['database'], driver=fi['driver'])
+
+
+
 def main():
     global tmp, sqltmp, tmpname, nuldev, vector, rastertmp
     rastertmp = False
@@ -210,40 +384,43 @@ def main():
     # replaced by user choiche
     #basecols = ['n', 'min', 'max', 'range', 'mean', 'stddev', 'variance', 'cf_var', 'sum']
 
-    for i in range(len(rasters)):
-        raster = rasters[i]
-        colprefix = colprefixes[i]
+    # by default perccol variable is used only for "variables" variable
+    perccol = "percentile"
+    perc = None
+    for b in basecols:
+        if b.startswith('p'):
+            perc = b
+    if perc:
+        # namespace is limited in DBF but the % value is important
+        if dbfdriver:
+            perccol = "per" + percentile
+        else:
+            perccol = "percentile_" + percentile
+        percindex = basecols.index(perc)
+        basecols[percindex] = perccol
+
+    # dictionary with name of methods and position in "r.univar -gt"  output
+    variables = {'number': 2, 'null_cells': 3, 'minimum': 4, 'maximum': 5, 'range': 6,
+                 'average': 7, 'stddev': 9, 'variance': 10, 'coeff_var': 11,
+                 'sum': 12, 'first_quartile': 14, 'median': 15,
+                 'third_quartile': 16, perccol: 17}
+    # this list is used to set the 'e' flag for r.univar
+    extracols = ['first_quartile', 'median', 'third_quartile', perccol]
+
+    # the statistics of all raster maps are uploaded at once, for every
+    # column the raster map and the position in the r.univar output is kept
+    colnames = []
+    colstats = []
+    addcols = []
+    extstat = ""
+    vector_columns = grass.vector_columns(vector, layer).keys()
+    for r in range(len(rasters)):
+        colprefix = colprefixes[r]
         # we need at least three chars to distinguish [mea]n from [med]ian
         # so colprefix can't be longer than 6 chars with DBF driver
         if dbfdriver:
             colprefix = colprefix[:6]
-            variables_dbf = {}
-
-        # by default perccol variable is used only for "variables" variable
-        perccol = "percentile"
-        perc = None
-        for b in basecols:
-            if b.startswith('p'):
-                perc = b
-        if perc:
-            # namespace is limited in DBF but the % value is important
-            if dbfdriver:
-                perccol = "per" + percentile
-            else:
-                perccol = "percentile_" + percentile
-            percindex = basecols.index(perc)
-            basecols[percindex] = perccol
-
-        # dictionary with name of methods and position in "r.univar -gt"  output
-        variables = {'number': 2, 'null_cells': 2, 'minimum': 4, 'maximum': 5, 'range': 6,
-                     'average': 7, 'stddev': 9, 'variance': 10, 'coeff_var': 11,
-                     'sum': 12, 'first_quartile': 14, 'median': 15,
-                     'third_quartile': 16, perccol: 17}
-        # this list is used to set the 'e' flag for r.univar
-        extracols = ['first_quartile', 'median', 'third_quartile', perccol]
-        addcols = []
-        colnames = []
-        extstat = ""
+
         for i in basecols:
             # this check the complete name of out input that should be truncated
             for k in variables.keys():
@@ -256,10 +433,10 @@ def main():
             currcolumn = ("%s_%s" % (colprefix, i))
             if dbfdriver:
                 currcolumn = currcolumn[:10]
-                variables_dbf[currcolumn.replace("%s_" % colprefix, '')] = i
 
             colnames.append(currcolumn)
-            if currcolumn in grass.vector_columns(vector, layer).keys():
+            colstats.append((r, variables[i]))
+            if currcolumn in vector_columns:
                 if not flags['c']:
                     grass.fatal((_("Cannot create column <%s> (already present). ") % currcolumn) +
                                 _("Use -c flag to update values in this column."))
@@ -270,75 +447,59 @@ def main():
                     coltype = "DOUBLE PRECISION"
                 addcols.append(currcolumn + ' ' + coltype)
 
-        if addcols:
-            grass.verbose(_("Adding columns '%s'") % addcols)
-            try:
-                grass.run_command('v.db.addcolumn', map=vector, columns=addcols,
-                                  layer=layer)
-            except CalledModuleError:
-                grass.fatal(_("Adding columns failed. Exiting."))
-
-        # calculate statistics:
-        grass.message(_("Processing input data (%d categories)...") % number)
-
-        # get rid of any earlier attempts
-        grass.try_remove(sqltmp)
-
-        f = open(sqltmp, 'w')
-
-        # do the stats
-        p = grass.pipe_command('r.univar', flags='t' + extstat, map=raster,
-                               zones=rastertmp, percentile=percentile, sep=';')
-
-        first_line = 1
-
-        f.write("{0}\n".format(grass.db_begin_transaction(fi['driver'])))
-        for line in p.stdout:
-            if first_line:
-                first_line = 0
-                continue
-
-            vars = decode(line).rstrip('\r\n').split(';')
-
-            f.write("UPDATE %s SET" % fi['table'])
-            first_var = 1
-            for colname in colnames:
-                variable = colname.replace("%s_" % colprefix, '', 1)
-                if dbfdriver:
-                    variable = variables_dbf[variable]
-                i = variables[variable]
+    if addcols:
+        grass.verbose(_("Adding columns '%s'") % addcols)
+        try:
+            grass.run_command('v.db.addcolumn', map=vector, columns=addcols,
+                              layer=layer)
+        except CalledModuleError:
+            grass.fatal(_("Adding columns failed. Exiting."))
+
+    # calculate statistics:
+    grass.message(_("Processing input data (%d categories)...") % number)
+
+    in_process = flags['p']
+    if in_process and extstat:
+        grass.warning(_("Quartiles, median and percentile are computed "
+                        "with r.univar"))
+        in_process = False
+    if in_process:
+        tables = numpy_univar_tables(rasters, rastertmp, cats)
+    else:
+        tables = univar_tables(rasters, rastertmp, extstat, percentile,
+                               max(1, int(options['nprocs'])))
+
+    # values of the columns for every category
+    values = {}
+    raster_columns = [[(c, i) for c, (r, i) in enumerate(colstats) if r == raster]
+                      for raster in range(len(rasters))]
+    for r, rows in tables:
+        for vars in rows:
+            record = values.get(vars[0])
+            if record is None:
+                record = values[vars[0]] = [None] * len(colnames)
+            for c, i in raster_columns[r]:
                 value = vars[i]
                 # convert nan, +nan, -nan, inf, +inf, -inf, Infinity, +Infinity,
                 # -Infinity to NULL
                 if value.lower().endswith('nan') or 'inf' in value.lower():
-                    value = 'NULL'
-                if not first_var:
-                    f.write(" , ")
-                else:
-                    first_var = 0
-                f.write(" %s=%s" % (colname, value))
+                    value = None
+                record[c] = value
+        grass.verbose((_("Statistics calculated from raster map <{raster}>"
+                         ).format(raster=rasters[r])))
 
-            f.write(" WHERE %s=%s;\n" % (fi['key'], vars[0]))
-        f.write("{0}\n".format(grass.db_commit_transaction(fi['driver'])))
-        p.wait()
-        f.close()
-
-        grass.message(_("Updating the database ..."))
-        exitcode = 0
-        try:
-            grass.run_command('db.execute', input=sqltmp,
-                              database=fi['database'], driver=fi['driver'])
-            grass.verbose((_("Statistics calculated from raster map <{raster}>"
-                             " and uploaded to attribute table"
-                             " of vector map <{vector}>."
-                             ).format(raster=raster, vector=vector)))
-        except CalledModuleError:
-            grass.warning(
-                _("Failed to upload statistics to attribute table of vector map <%s>.") %
-                vector)
-            exitcode = 1
+    grass.message(_("Updating the database ..."))
+    try:
+        upload_statistics(fi, colnames, values)
+        grass.verbose((_("Statistics uploaded to attribute table"
+                         " of vector map <{vector}>."
+                         ).format(vector=vector)))
+    except Exception:
+        grass.warning(
+            _("Failed to upload statistics to attribute table of vector map <%s>.") %
+            vector)
+        sys.exit(1)
 
-            sys.exit(exitcode)
 
 if __name__ == "__main__":
     options, flags = grass.parser()
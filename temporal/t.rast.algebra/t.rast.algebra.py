@@ -63,6 +63,16 @@
 #% answer: 1
 #%end
 
+#%option
+#% key: batch
+#% type: integer
+#% label: Number of time steps computed in a single r.mapcalc run
+#% description: The expressions of several time steps are fused into one r.mapcalc call, which reads input maps shared by these time steps only once
+#% required: no
+#% multiple: no
+#% answer: 1
+#%end
+
 #%flag
 #% key: s
 #% description: Check the spatial topology of temporally related maps and process only spatially related maps
@@ -94,6 +104,7 @@ def main():
     expression = options['expression']
     basename = options['basename']
     nprocs = options["nprocs"]
+    batch = options["batch"]
     time_suffix = options["suffix"]
     spatial = flags["s"]
     register_null = flags["n"]
@@ -114,6 +125,7 @@ def main():
                                          debug=False,
                                          spatial=spatial,
                                          nprocs=nprocs,
+                                         batch=batch,
                                          register_null=register_null,
                                          dry_run=dry_run, time_suffix=time_suffix)
 
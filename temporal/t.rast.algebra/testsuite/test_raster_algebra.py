@@ -105,6 +105,23 @@ class TestTRastAlgebra(TestCase):
         self.assertEqual(start, datetime.datetime(2001, 1, 1))
         self.assertEqual(end, datetime.datetime(2001, 1, 5))
 
+    def test_simple_arith_batch(self):
+        """Simple arithmetic test with several time steps per r.mapcalc run"""
+
+        self.assertModule("t.rast.algebra", expression='R = A + A', basename="r",
+                          batch=3, flags="d")
+        self.assertModule("t.rast.algebra", expression='R = A + A', basename="r",
+                          batch=3)
+
+        D = tgis.open_old_stds("R", type="strds")
+
+        self.assertEqual(D.metadata.get_number_of_maps(), 4)
+        self.assertEqual(D.metadata.get_min_min(), 2) # 1 + 1
+        self.assertEqual(D.metadata.get_max_max(), 8) # 4 + 4
+        start, end = D.get_absolute_time()
+        self.assertEqual(start, datetime.datetime(2001, 1, 1))
+        self.assertEqual(end, datetime.datetime(2001, 1, 5))
+
 
     def test_simple_arith_td_1(self):
         """Simple arithmetic test"""
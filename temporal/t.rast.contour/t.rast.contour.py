@@ -197,7 +197,7 @@ def main(options, flags):
             gscript.warning(_("The number of parellel r.contour processes was "\
                               "reduced to 1 because of the table attribute "\
                               "creation"))
-    process_queue = pymod.ParallelModuleQueue(int(nprocs))
+    process_queue = pymod.ParallelModuleQueue(int(nprocs), pool=True)
 
     count = 0
     num_maps = len(maps)
@@ -102,6 +102,15 @@
 #%option G_OPT_T_WHERE
 #%end
 
+#%option
+#% key: nprocs
+#% type: integer
+#% description: Number of maps to export in parallel
+#% required: no
+#% multiple: no
+#% answer: 1
+#%end
+
 import grass.script as grass
 
 
@@ -118,6 +127,7 @@ def main():
     where = options["where"]
     _format = options["format"]
     _type = options["type"]
+    nprocs = int(options["nprocs"])
     kws = {key: options[key]
            for key in ('createopt', 'metaopt', 'nodata') if options[key]}
 
@@ -132,7 +142,7 @@ def main():
     tgis.init()
     # Export the space time raster dataset
     tgis.export_stds(_input, output, compression, directory, where, _format,
-                     "strds", _type, **kws)
+                     "strds", _type, nprocs, **kws)
 
 
 ############################################################################
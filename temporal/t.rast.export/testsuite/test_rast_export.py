@@ -69,6 +69,16 @@ class TestRasterExport(TestCase):
                           overwrite=True, format="pack")
         self.assertFileExists(self.pack)
 
+    def test_parallel_pack(self):
+        self.assertModule("t.rast.export", input="A", output=self.pack,
+                          overwrite=True, format="pack", nprocs=4)
+        self.assertFileExists(self.pack)
+
+    def test_parallel_geotif_no_compression(self):
+        self.assertModule("t.rast.export", input="A", output=self.float_,
+                          overwrite=True, compression="no", nprocs=4)
+        self.assertFileExists(self.float_)
+
 if __name__ == '__main__':
     from grass.gunittest.main import test
     test()
@@ -109,7 +109,7 @@ def main():
                              overwrite=grass.overwrite(), quiet=True, run_=False,
                              finish_=False,)
 
-    process_queue = pymod.ParallelModuleQueue(int(nprocs))
+    process_queue = pymod.ParallelModuleQueue(int(nprocs), pool=True)
 
     gap_list = []
     overwrite_flags = {}
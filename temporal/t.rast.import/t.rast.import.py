@@ -85,6 +85,15 @@
 #% multiple: no
 #%end
 
+#%option
+#% key: nprocs
+#% type: integer
+#% description: Number of maps to import in parallel
+#% required: no
+#% multiple: no
+#% answer: 1
+#%end
+
 #%flag
 #% key: r
 #% description: Set the current region from the last map that was imported
@@ -127,6 +136,7 @@ def main():
     location = options["location"]
     base = options["basename"]
     memory = options["memory"]
+    nprocs = int(options["nprocs"])
     set_current_region = flags["r"]
     link = flags["l"]
     exp = flags["e"]
@@ -137,7 +147,7 @@ def main():
 
     tgis.import_stds(input, output, directory, title, descr, location,
                      link, exp, overr, create, "strds", base, 
-                     set_current_region, memory)
+                     set_current_region, memory, nprocs)
 
 if __name__ == "__main__":
     options, flags = grass.parser()
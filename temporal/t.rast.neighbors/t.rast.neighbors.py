@@ -149,7 +149,7 @@ def main():
                                    finish_=False,)
 
     # The module queue for parallel execution
-    process_queue = pymod.ParallelModuleQueue(int(nprocs))
+    process_queue = pymod.ParallelModuleQueue(int(nprocs), pool=True)
 
     count = 0
     num_maps = len(maps)
@@ -39,6 +39,22 @@
 #% guisection: Selection
 #%end
 
+#%option G_OPT_R_MAP
+#% key: zones
+#% description: Raster map used for zoning, must be of type CELL
+#% required: no
+#% guisection: Selection
+#%end
+
+#%option
+#% key: nprocs
+#% type: integer
+#% description: Number of processes to run in parallel
+#% required: no
+#% multiple: no
+#% answer: 1
+#%end
+
 #%option G_OPT_F_SEP
 #% label: Field separator character between the output columns
 #% guisection: Formatting
@@ -60,6 +76,11 @@
 #% guisection: Formatting
 #%end
 
+#%flag
+#% key: p
+#% description: Compute the statistics in process with NumPy instead of running r.univar
+#%end
+
 import grass.script as grass
 
 
@@ -77,6 +98,9 @@ def main():
     extended = flags["e"]
     no_header = flags["u"]
     rast_region = bool(flags["r"])
+    in_process = flags["p"]
+    zones = options["zones"]
+    nprocs = int(options["nprocs"])
     separator = grass.separator(options["separator"])
 
     # Make sure the temporal database exists
@@ -86,9 +110,12 @@ def main():
         output = None
     if output == "-":
         output = None
+    if not zones:
+        zones = None
 
     tgis.print_gridded_dataset_univar_statistics(
-        "strds", input, output, where, extended, no_header, separator, rast_region)
+        "strds", input, output, where, extended, no_header, separator, rast_region,
+        zones=zones, nprocs=nprocs, in_process=in_process)
 
 if __name__ == "__main__":
     options, flags = grass.parser()
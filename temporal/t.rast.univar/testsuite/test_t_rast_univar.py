@@ -24,6 +24,8 @@ class TestRasterUnivar(TestCase):
         cls.runModule("r.mapcalc", expression="a_2 = 200",  overwrite=True)
         cls.runModule("r.mapcalc", expression="a_3 = 300",  overwrite=True)
         cls.runModule("r.mapcalc", expression="a_4 = 400",  overwrite=True)
+        cls.runModule("r.mapcalc", expression="zones = if(row() <= 40, 1, 2)",
+                      overwrite=True)
 
         cls.runModule("t.create",  type="strds",  temporaltype="absolute",
                                  output="A",  title="A test",  description="A test",
@@ -141,6 +143,67 @@ a_4@testing|2001-10-01 00:00:00|2002-01-01 00:00:00|400|400|400|400|0|0|0|384000
                 res_line = res.split("|", 1)[1]
                 self.assertLooksLike(ref_line,  res_line)
 
+    def test_nprocs(self):
+
+        t_rast_univar = SimpleModule("t.rast.univar", input="A", nprocs=3,
+                                                      where="start_time >= '2001-03-01'",
+                                                      overwrite=True, verbose=True)
+        self.runModule("g.region", res=1)
+        self.assertModule(t_rast_univar)
+
+        univar_text=u"""id|start|end|mean|min|max|mean_of_abs|stddev|variance|coeff_var|sum|null_cells|cells|non_null_cells
+a_2@testing|2001-04-01 00:00:00|2001-07-01 00:00:00|200|200|200|200|0|0|0|1920000|0|9600|9600
+a_3@testing|2001-07-01 00:00:00|2001-10-01 00:00:00|300|300|300|300|0|0|0|2880000|0|9600|9600
+a_4@testing|2001-10-01 00:00:00|2002-01-01 00:00:00|400|400|400|400|0|0|0|3840000|0|9600|9600
+"""
+        for ref, res in zip(univar_text.split("\n"), t_rast_univar.outputs.stdout.split("\n")):
+            if ref and res:
+                ref_line = ref.split("|", 1)[1]
+                res_line = res.split("|", 1)[1]
+                self.assertLooksLike(ref_line,  res_line)
+
+    def test_in_process(self):
+
+        t_rast_univar = SimpleModule("t.rast.univar", input="A", flags="p",
+                                                      nprocs=2,
+                                                      where="start_time >= '2001-03-01'",
+                                                      overwrite=True, verbose=True)
+        self.runModule("g.region", res=1)
+        self.assertModule(t_rast_univar)
+
+        univar_text=u"""id|start|end|mean|min|max|mean_of_abs|stddev|variance|coeff_var|sum|null_cells|cells|non_null_cells
+a_2@testing|2001-04-01 00:00:00|2001-07-01 00:00:00|200|200|200|200|0|0|0|1920000|0|9600|9600
+a_3@testing|2001-07-01 00:00:00|2001-10-01 00:00:00|300|300|300|300|0|0|0|2880000|0|9600|9600
+a_4@testing|2001-10-01 00:00:00|2002-01-01 00:00:00|400|400|400|400|0|0|0|3840000|0|9600|9600
+"""
+        for ref, res in zip(univar_text.split("\n"), t_rast_univar.outputs.stdout.split("\n")):
+            if ref and res:
+                ref_line = ref.split("|", 1)[1]
+                res_line = res.split("|", 1)[1]
+                self.assertLooksLike(ref_line,  res_line)
+
+    def test_zones(self):
+
+        for flags in ("", "p"):
+            t_rast_univar = SimpleModule("t.rast.univar", input="A", zones="zones",
+                                                          flags=flags,
+                                                          where="start_time >= '2001-07-01'",
+                                                          overwrite=True, verbose=True)
+            self.runModule("g.region", res=1)
+            self.assertModule(t_rast_univar)
+
+            univar_text=u"""id|start|end|zone|mean|min|max|mean_of_abs|stddev|variance|coeff_var|sum|null_cells|cells|non_null_cells
+a_3@testing|2001-07-01 00:00:00|2001-10-01 00:00:00|1|300|300|300|300|0|0|0|1440000|0|4800|4800
+a_3@testing|2001-07-01 00:00:00|2001-10-01 00:00:00|2|300|300|300|300|0|0|0|1440000|0|4800|4800
+a_4@testing|2001-10-01 00:00:00|2002-01-01 00:00:00|1|400|400|400|400|0|0|0|1920000|0|4800|4800
+a_4@testing|2001-10-01 00:00:00|2002-01-01 00:00:00|2|400|400|400|400|0|0|0|1920000|0|4800|4800
+"""
+            for ref, res in zip(univar_text.split("\n"), t_rast_univar.outputs.stdout.split("\n")):
+                if ref and res:
+                    ref_line = ref.split("|", 1)[1]
+                    res_line = res.split("|", 1)[1]
+                    self.assertLooksLike(ref_line,  res_line)
+
     def test_6_error_handling_empty_strds(self):
         # Empty strds
         self.assertModuleFail("t.rast.univar", input="A",
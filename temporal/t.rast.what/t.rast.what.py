@@ -231,7 +231,7 @@ def main(options, flags):
         nprocs = len(maps)
 
     # The module queue for parallel execution
-    process_queue = pymod.ParallelModuleQueue(int(nprocs))
+    process_queue = pymod.ParallelModuleQueue(int(nprocs), pool=True)
     num_maps = len(maps)
 
     # 400 Maps is the absolute maximum in r.what
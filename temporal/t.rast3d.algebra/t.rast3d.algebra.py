@@ -55,6 +55,16 @@
 #% answer: 1
 #%end
 
+#%option
+#% key: batch
+#% type: integer
+#% label: Number of time steps computed in a single r3.mapcalc run
+#% description: The expressions of several time steps are fused into one r3.mapcalc call, which reads input maps shared by these time steps only once
+#% required: no
+#% multiple: no
+#% answer: 1
+#%end
+
 #%flag
 #% key: s
 #% description: Check the spatial topology of temporally related maps and process only spatially related maps
@@ -82,6 +92,7 @@ def main():
     expression = options['expression']
     basename = options['basename']
     nprocs = options["nprocs"]
+    batch = options["batch"]
     spatial = flags["s"]
     register_null = flags["n"]
     granularity = flags["g"]
@@ -96,7 +107,7 @@ def main():
                              "t.rast3d.mapcalc2 without PLY requirement."))
 
     tgis.init(True)
-    p = tgis.TemporalRaster3DAlgebraParser(run = True, debug=False, spatial = spatial, nprocs = nprocs, register_null = register_null)
+    p = tgis.TemporalRaster3DAlgebraParser(run = True, debug=False, spatial = spatial, nprocs = nprocs, register_null = register_null, batch = batch)
 
     if granularity:
         if not p.setup_common_granularity(expression=expression,  stdstype = 'str3ds',  lexer = tgis.TemporalRasterAlgebraLexer()):
@@ -41,6 +41,22 @@
 #% guisection: Selection
 #%end
 
+#%option G_OPT_R3_MAP
+#% key: zones
+#% description: 3D raster map used for zoning, must be of type CELL
+#% required: no
+#% guisection: Selection
+#%end
+
+#%option
+#% key: nprocs
+#% type: integer
+#% description: Number of r3.univar processes to run in parallel
+#% required: no
+#% multiple: no
+#% answer: 1
+#%end
+
 #%option G_OPT_F_SEP
 #% label: Field separator character between the output columns
 #% guisection: Formatting
@@ -73,6 +89,8 @@ def main():
     where = options["where"]
     extended = flags["e"]
     no_header = flags["s"]
+    zones = options["zones"]
+    nprocs = int(options["nprocs"])
     separator = grass.separator(options["separator"])
 
     # Make sure the temporal database exists
@@ -82,9 +100,12 @@ def main():
         output = None
     if output == "-":
         output = None
+    if not zones:
+        zones = None
 
     tgis.print_gridded_dataset_univar_statistics(
-        "str3ds", input, output, where, extended, no_header, separator)
+        "str3ds", input, output, where, extended, no_header, separator,
+        zones=zones, nprocs=nprocs)
 
 if __name__ == "__main__":
     options, flags = grass.parser()